@@ -45,12 +45,16 @@ setup(
     extras_require={
         ':sys_platform=="win32"': ['colorama>=0.2.5'],
         'columns': ['urwid >= 1.3.0', WATCHDOG],
+        'daemon': [WATCHDOG],
         'ical': [ICALENDAR],
         'prompt': ['prompt_toolkit >= 0.53', WATCHDOG],
         'test': ['coverage>=4.3', 'freezegun', 'green', ICALENDAR, 'pylint>=1.7.1'],
     },
     entry_points={
-        'console_scripts': ['topydo=topydo.ui.UILoader:main'],
+        'console_scripts': [
+            'topydo=topydo.ui.UILoader:main',
+            'topydo-client=topydo.ui.daemon.Client:main',
+        ],
     },
     classifiers=[
         "Development Status :: 5 - Production/Stable",
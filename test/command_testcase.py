@@ -15,6 +15,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
+from types import GeneratorType
 
 from topydo.lib.Utils import escape_ansi
 
@@ -28,6 +29,9 @@ class CommandTest(TopydoTest):
         self.errors = ""
 
     def out(self, p_output):
+        if isinstance(p_output, GeneratorType):
+            p_output = list(p_output)
+
         if isinstance(p_output, list) and p_output:
             self.output += escape_ansi(
                 os.linesep.join([str(s) for s in p_output]) + os.linesep)
@@ -370,6 +370,24 @@ class AddCommandTest(CommandTest):
         self.assertEqual(self.output, u"|  1| {tod} Fo\u00f3 due:{tod} id:1\n|  2| {tod} B\u0105r p:1\n".format(tod=self.today))
         self.assertEqual(self.errors, "")
 
+    @mock.patch("topydo.commands.AddCommand.stdin",
+                StringIO(u"Foo partof:3\n\nBar\nBaz"))
+    def test_add_from_stdin2(self):
+        """
+        Empty lines are skipped, dependencies may refer to items further on.
+        """
+        command = AddCommand.AddCommand(["-f", "-"], self.todolist, self.out,
+                                        self.error)
+        command.execute()
+
+        self.assertEqual(self.output, "|  1| {tod} Foo p:1\n"
+                                      "|  2| {tod} Bar\n"
+                                      "|  3| {tod} Baz id:1\n"
+                         .format(tod=self.today))
+        self.assertEqual(self.todolist.children(self.todolist.todo(3)),
+                         [self.todolist.todo(1)])
+        self.assertEqual(self.errors, "")
+
     def test_add_from_file(self):
         command = AddCommand.AddCommand(["-f", "test/data/AddCommandTest-from_file.txt"], self.todolist, self.out, self.error)
         command.execute()
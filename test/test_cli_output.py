@@ -0,0 +1,54 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Tests for writing the output of commands in the CLI. """
+
+import unittest
+from io import StringIO
+
+from topydo.lib.TopydoString import TopydoString
+from topydo.ui.CLIApplicationBase import write_lines
+
+from .topydo_testcase import TopydoTest
+
+
+class WriteLinesTest(TopydoTest):
+    def _write_lines(self, p_lines):
+        output = StringIO()
+        write_lines(output, iter(p_lines))
+        return output.getvalue()
+
+    def test_write_lines1(self):
+        self.assertEqual(self._write_lines(["Foo", TopydoString("Bar")]),
+                         "Foo\nBar\n")
+
+    def test_write_lines2(self):
+        """ Empty output is skipped. """
+        self.assertEqual(self._write_lines([""]), "")
+        self.assertEqual(self._write_lines([None]), "")
+        self.assertEqual(self._write_lines(["Foo", "", None]), "Foo\n")
+
+    def test_write_lines3(self):
+        """ Empty lines between other lines are kept. """
+        self.assertEqual(self._write_lines(["Foo", TopydoString(""), "Bar"]),
+                         "Foo\n\nBar\n")
+
+    def test_write_lines4(self):
+        """ ANSI codes are removed when the file is not a TTY. """
+        self.assertEqual(self._write_lines(["\033[31mFoo\033[0m"]), "Foo\n")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,7 +20,9 @@ import unittest
 
 from topydo.lib.Color import Color
 from topydo.lib.Config import config
+from topydo.lib.prettyprinters.Colors import PrettyPrinterColorFilter
 from topydo.lib.Todo import Todo
+from topydo.ui.CLIApplicationBase import insert_ansi
 
 from .topydo_testcase import TopydoTest
 
@@ -213,5 +215,16 @@ class ColorsTest(TopydoTest):
 
         self.assertEqual(color.as_ansi(), NEUTRAL_COLOR)
 
+    def test_insert_ansi(self):
+        config(p_overrides={('topydo', 'colors'): '1'})
+        todo = Todo('(C) Foo @Bar +Baz')
+
+        for _ in range(2):
+            todo_str = PrettyPrinterColorFilter().filter(todo.source(), todo)
+
+            self.assertEqual(insert_ansi(todo_str),
+                             '\033[0;34m(C) Foo \033[0;35m@Bar\033[0;34m '
+                             '\033[0;31m+Baz' + NEUTRAL_COLOR)
+
 if __name__ == '__main__':
     unittest.main()
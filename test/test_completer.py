@@ -0,0 +1,199 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Tests for the ranking of completions. """
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from topydo.lib.Config import config
+from topydo.lib.TodoFileVocabulary import TodoFileVocabulary
+from topydo.lib.TodoList import TodoList
+from topydo.ui import CompleterBase as completer_base
+from topydo.ui.CompleterBase import CompleterBase
+
+from .topydo_testcase import TopydoTest
+
+
+def _days_ago(p_days):
+    return (date.today() - timedelta(p_days)).isoformat()
+
+
+class CompleterTest(TopydoTest):
+    def setUp(self):
+        super().setUp()
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.archive = os.path.join(self.tmpdir, 'done.txt')
+        config(p_overrides={('topydo', 'archive_filename'): self.archive})
+
+        self.todolist = TodoList([
+            "{} Buy bread +Groceries @Store".format(_days_ago(1)),
+            "{} Buy milk +Groceries @Store".format(_days_ago(2)),
+            "{} Paint the door +Garden @Home".format(_days_ago(100)),
+            "{} Mow the lawn +Garden @Home".format(_days_ago(100)),
+            "{} Mow the lawn again +Garden @Home".format(_days_ago(100)),
+            "Call the plumber +House @Phone",
+        ])
+        self.todolist.enable_search_index()
+        self.completer = CompleterBase(self.todolist)
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.tmpdir)
+
+    def _archive(self, p_content):
+        with open(self.archive, 'a', encoding='utf-8') as archive:
+            archive.write(p_content)
+
+    def test_frequency(self):
+        """ More frequently used projects come first. """
+        self.assertEqual(self.completer.get_completions('+G'),
+                         ['+Groceries', '+Garden'])
+
+    def test_recency(self):
+        """
+        Uses long ago count less than recent uses, undated uses count as
+        recent.
+        """
+        self.todolist.add("{} Buy cheese +Groceries".format(_days_ago(0)))
+        self.todolist.add("{} Weed +Garden".format(_days_ago(100)))
+
+        self.assertEqual(self.completer.get_completions('+G'),
+                         ['+Groceries', '+Garden'])
+        self.assertEqual(self.completer.get_completions('@'),
+                         ['@Store', '@Phone', '@Home'])
+
+    def test_archive(self):
+        """ Completed items in the archive count as uses. """
+        self._archive("x {} Call mom @Phone\n".format(_days_ago(0)) * 3)
+
+        self.assertEqual(self.completer.get_completions('@'),
+                         ['@Phone', '@Store', '@Home'])
+
+        self._archive("x {0} Buy beer +House\nx {0} Fix tap +House\n"
+                      .format(_days_ago(0)))
+        self.assertEqual(self.completer.get_completions('+'),
+                         ['+House', '+Groceries', '+Garden'])
+
+    def test_archive_only(self):
+        """ Projects and contexts only used in the archive are offered. """
+        self._archive("x {} Feed the lions +Zoo @Zoo\n".format(_days_ago(0)))
+
+        self.assertEqual(self.completer.get_completions('+Z'), ['+Zoo'])
+        self.assertEqual(self.completer.get_completions('@'),
+                         ['@Store', '@Phone', '@Zoo', '@Home'])
+        self.assertEqual(self.completer.common_prefix('+Z'), '+Zoo')
+
+    def test_cap(self):
+        """ Only the best ranked completions are returned. """
+        self.todolist.add_list(["Item +Project{}".format(i)
+                                for i in range(completer_base.MAX_COMPLETIONS
+                                               + 10)])
+        self.todolist.add("Item +Project0")
+
+        completions = self.completer.get_completions('+Pro')
+
+        self.assertEqual(len(completions), completer_base.MAX_COMPLETIONS)
+        self.assertEqual(completions[0], '+Project0')
+
+    def test_common_prefix(self):
+        """ The common prefix includes completions beyond the cap. """
+        self.todolist.add_list(["Item +Project{}".format(i)
+                                for i in range(completer_base.MAX_COMPLETIONS)])
+        self.todolist.add("Item +Prune")
+
+        self.assertEqual(self.completer.common_prefix('+Pro'), '+Project')
+        self.assertEqual(self.completer.common_prefix('+Pr'), '+Pr')
+        self.assertEqual(self.completer.common_prefix('+Gr'), '+Groceries')
+        self.assertEqual(self.completer.common_prefix('+Foo'), '')
+
+
+class TodoFileVocabularyTest(TopydoTest):
+    def setUp(self):
+        super().setUp()
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'done.txt')
+        self._write("x 2015-01-01 Buy milk +Groceries @Store\n"
+                    "x 2015-01-03 Buy bread +Groceries\n")
+        self.vocabulary = TodoFileVocabulary(self.path)
+        self.vocabulary.update()
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, p_content, p_mode='w'):
+        with open(self.path, p_mode, encoding='utf-8') as todofile:
+            todofile.write(p_content)
+
+    def test_usage1(self):
+        self.assertEqual(self.vocabulary.usage('+Groceries'),
+                         (2, date(2015, 1, 3)))
+        self.assertEqual(self.vocabulary.usage('@Store'),
+                         (1, date(2015, 1, 1)))
+        self.assertEqual(self.vocabulary.usage('+Store'), (0, None))
+
+    def test_usage2(self):
+        """ Appended lines are counted. """
+        self._write("x 2015-02-01 2014-12-01 Buy eggs +Groceries\n"
+                    "x 2015-02-02 Unterminated +Groceries", 'a')
+        self.vocabulary.update()
+
+        self.assertEqual(self.vocabulary.usage('+Groceries'),
+                         (3, date(2015, 2, 1)))
+
+    def test_usage3(self):
+        """ A rewritten file is read again. """
+        self._write("x 2015-02-01 Call mom @Phone\n")
+        self.vocabulary.update()
+
+        self.assertEqual(self.vocabulary.usage('+Groceries'), (0, None))
+        self.assertEqual(self.vocabulary.usage('@Phone'),
+                         (1, date(2015, 2, 1)))
+
+    def test_usage4(self):
+        """ An edit before the end of a large file causes a reread. """
+        self._write("x 2015-01-04 Task\n" * 1000, 'a')
+        self.vocabulary.update()
+
+        with open(self.path, encoding='utf-8') as todofile:
+            content = todofile.read().replace('+Groceries @Store',
+                                              '+Groceries @Shop ')
+
+        self._write(content + "x 2015-02-01 Buy eggs +Groceries\n")
+        self.vocabulary.update()
+
+        self.assertEqual(self.vocabulary.usage('@Store'), (0, None))
+        self.assertEqual(self.vocabulary.usage('@Shop'),
+                         (1, date(2015, 1, 1)))
+        self.assertEqual(self.vocabulary.usage('+Groceries'),
+                         (3, date(2015, 2, 1)))
+        self.assertEqual(self.vocabulary.words_with_prefix('@', 'S'),
+                         ['Shop'])
+
+    def test_usage5(self):
+        os.remove(self.path)
+        self.vocabulary.update()
+
+        self.assertEqual(self.vocabulary.usage('+Groceries'), (0, None))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Tests for the daemon mode and its client. """
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from io import StringIO
+from unittest import mock
+
+from topydo.ui.daemon.Client import connect, request
+
+from .topydo_testcase import TopydoTest
+
+try:
+    from topydo.ui.daemon.Daemon import DaemonApplication
+except ImportError:  # watchdog is not installed
+    DaemonApplication = None
+
+
+@unittest.skipIf(DaemonApplication is None, "watchdog is not installed")
+class DaemonTest(TopydoTest):
+    def setUp(self):
+        super().setUp()
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        self.todotxt = os.path.join(self.tmpdir, 'todo.txt')
+        self.donetxt = os.path.join(self.tmpdir, 'done.txt')
+        self.socket = os.path.join(self.tmpdir, 'topydo.sock')
+
+        with open(self.todotxt, 'w') as todofile:
+            todofile.write("(A) Call mom\nBuy milk\n")
+
+        argv = ['topydo', '-t', self.todotxt, '-d', self.donetxt, 'daemon']
+        with mock.patch('sys.argv', argv):
+            self.daemon = DaemonApplication(self.socket)
+
+        self.daemon._load_file()
+        self.daemon.server = self.daemon._bind()
+        self.thread = threading.Thread(target=self.daemon.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.daemon.server.shutdown()
+        self.daemon.server.server_close()
+        self.thread.join()
+        self.daemon.todofile.close()
+        shutil.rmtree(self.tmpdir)
+        super().tearDown()
+
+    def _request(self, p_argv, p_input='', p_cwd=None):
+        self.output = StringIO()
+        self.errors = StringIO()
+
+        return request(connect(self.socket), p_argv, StringIO(p_input),
+                       self.output, self.errors, p_cwd or self.tmpdir)
+
+    def test_ls(self):
+        self.assertEqual(self._request(['ls']), 0)
+        self.assertEqual(self.output.getvalue(),
+                         "|1| (A) Call mom\n|2| Buy milk\n")
+        self.assertEqual(self.errors.getvalue(), "")
+
+    def test_add(self):
+        self.assertEqual(self._request(['add', 'Feed the cat']), 0)
+        self.assertEqual(self._request(['ls', '-s', 'text']), 0)
+
+        self.assertRegex(self.output.getvalue(),
+                         r"^\|2\| Buy milk\n\|1\| \(A\) Call mom\n"
+                         r"\|3\| [\d-]+ Feed the cat\n$")
+
+        with open(self.todotxt) as todofile:
+            self.assertIn("Feed the cat", todofile.read())
+
+    def test_input(self):
+        """ Commands can ask the client for input. """
+        with open(self.todotxt, 'w') as todofile:
+            todofile.write("Call mom id:1\nBuy phone p:1\n")
+        self.daemon._file_changed()
+
+        self.assertEqual(self._request(['del', '1'], "y\n"), 0)
+        self.assertIn("Also remove subtasks? [y/N] ", self.output.getvalue())
+        self.assertTrue(self.output.getvalue().endswith(
+            "Removed: Buy phone\nRemoved: Call mom\n"))
+        self.assertEqual(self.daemon.todolist.count(), 0)
+
+    def test_local(self):
+        """ Commands needing the terminal are left to the client. """
+        self.assertIsNone(self._request(['edit']))
+        self.assertIsNone(self._request(['add', '-f', '-']))
+        self.assertEqual(self.output.getvalue(), "")
+        self.assertEqual(self.errors.getvalue(), "")
+
+    def test_error(self):
+        self._request(['do', '5'])
+        self.assertEqual(self.errors.getvalue(), "Invalid todo number given.\n")
+
+    def test_external_change(self):
+        with open(self.todotxt, 'w') as todofile:
+            todofile.write("Walk the dog\n")
+        self.daemon._file_changed()
+
+        self._request(['ls'])
+        self.assertEqual(self.output.getvalue(), "|1| Walk the dog\n")
+
+    def test_unsupported_option(self):
+        self.assertEqual(self._request(['-C', '16', 'ls']), 1)
+        self.assertEqual(self.errors.getvalue(),
+                         "Option -C should be given when starting the daemon.\n")
+
+    def test_file_option(self):
+        """ Relative paths are relative to the directory of the client. """
+        self.assertEqual(self._request(['-t', 'todo.txt', 'ls']), 0)
+        self.assertEqual(self.output.getvalue(),
+                         "|1| (A) Call mom\n|2| Buy milk\n")
+
+    def test_other_file(self):
+        self.assertEqual(self._request(['-t', 'other.txt', 'ls']), 1)
+        self.assertTrue(self.errors.getvalue().startswith(
+            "The daemon only serves " + self.todotxt))
+
+    def test_other_directory(self):
+        """
+        The configured todo.txt of a client in another directory is not the
+        file loaded by the daemon.
+        """
+        otherdir = os.path.join(self.tmpdir, 'other')
+        os.mkdir(otherdir)
+
+        self.assertEqual(self._request(['ls'], p_cwd=otherdir), 1)
+        self.assertEqual(self.output.getvalue(), "")
+        self.assertEqual(os.getcwd(), self.cwd)
+
+    def test_no_daemon(self):
+        self.assertIsNone(connect(os.path.join(self.tmpdir, 'none.sock')))
+
+if __name__ == '__main__':
+    unittest.main()
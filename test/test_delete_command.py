@@ -55,6 +55,17 @@ class DeleteCommandTest(CommandTest):
         self.assertEqual(self.output, "|  2| Bar p:1\nRemoved: Foo id:1\n")
         self.assertEqual(self.errors, "")
 
+    def test_activated_todos(self):
+        command = DeleteCommand(["2"], self.todolist, self.out, self.error,
+                                _no_prompt)
+        command.execute()
+        command.execute_post_archive_actions()
+
+        self.assertEqual(self.output, "Removed: Bar p:1\n"
+                         "The following todo item(s) became active:\n"
+                         "|  1| Foo\n")
+        self.assertEqual(self.errors, "")
+
     def test_del1_regex(self):
         command = DeleteCommand(["Foo"], self.todolist, self.out, self.error,
                                 _no_prompt)
@@ -233,6 +233,47 @@ The following todo item(s) became active:
         self.assertEqual(self.output, "Completed: x {} Subtodo of inactive p:2\n".format(self.today))
         self.assertEqual(self.errors, "")
 
+    def test_activated_todos3(self):
+        """ Todo items become active when all their descendants are done. """
+        todolist = TodoList([
+            "Top id:1",
+            "Middle p:1 id:2",
+            "Bottom p:2",
+            "Other parent id:3",
+            "Shared p:3 p:2",
+            "Unrelated",
+        ])
+
+        command = DoCommand(["3", "5"], todolist, self.out, self.error)
+        command.execute()
+        command.execute_post_archive_actions()
+
+        self.assertEqual(self.output, "Completed: x {today} Bottom p:2\n"
+                         "Completed: x {today} Shared p:3 p:2\n"
+                         "The following todo item(s) became active:\n"
+                         "|  2| Middle p:1 id:2\n"
+                         "|  4| Other parent id:3\n".format(today=self.today))
+        self.assertEqual(self.errors, "")
+
+    def test_activated_todos4(self):
+        """ Completed subtasks also activate their other parents. """
+        todolist = TodoList([
+            "Parent id:1",
+            "Subtask p:1",
+            "Other parent id:2",
+            "Shared p:1 p:2",
+        ])
+
+        command = DoCommand(["1"], todolist, self.out, self.error,
+                            _yes_prompt)
+        command.execute()
+        command.execute_post_archive_actions()
+
+        self.assertTrue(self.output.endswith(
+            "The following todo item(s) became active:\n"
+            "|  3| Other parent id:2\n"))
+        self.assertEqual(self.errors, "")
+
     def test_already_complete(self):
         command = DoCommand(["5"], self.todolist, self.out, self.error)
         command.execute()
@@ -19,6 +19,13 @@
 import unittest
 from datetime import date, timedelta
 
+# We're searching for 'mock'
+# pylint: disable=no-name-in-module
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
 from topydo.lib import Filter
 from topydo.lib.Todo import Todo
 
@@ -392,6 +399,27 @@ class OrdinalTagFilterTest(TopydoTest):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].source(), self.todo5)
 
+    @mock.patch('topydo.lib.Filter.relative_date_to_date',
+                wraps=Filter.relative_date_to_date)
+    def test_filter9(self, mock_relative_date):
+        """ The operand is resolved once, not for every todo item. """
+        otf = Filter.OrdinalTagFilter('due:<=tomorrow')
+
+        result = otf.filter(self.todos * 10)
+
+        self.assertEqual(len(result), 20)
+        self.assertEqual(mock_relative_date.call_count, 1)
+
+    def test_filter10(self):
+        """ Numerical comparisons. """
+        todos = [Todo("Foo est:5"), Todo("Bar est:15"), Todo("Baz est:x")]
+        otf = Filter.OrdinalTagFilter('est:>10')
+
+        result = otf.filter(todos)
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].source(), "Bar est:15")
+
 
 class CreationFilterTest(TopydoTest):
     def setUp(self):
@@ -570,5 +598,77 @@ class PriorityFilterTest(TopydoTest):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].source(), self.todo5)
 
+
+class CompiledFilterTest(TopydoTest):
+    def setUp(self):
+        super().setUp()
+
+        self.todos = load_file('test/data/FilterTest1.txt')
+
+    def _sequential(self, p_filters):
+        """ Applies the filters one by one, without compiling them. """
+        result = self.todos
+
+        for _filter in sorted(p_filters, key=lambda f: f.order):
+            result = _filter.filter(result)
+
+        return result
+
+    def test_compiled1(self):
+        filters = Filter.get_filter_list(['+project', '-@test', '(<=C)'])
+        compiled = Filter.compile_filters(filters)
+
+        self.assertEqual(todolist_to_string(compiled(self.todos)),
+                         todolist_to_string(self._sequential(filters)))
+
+    def test_compiled2(self):
+        """ The limit is applied after all other filters. """
+        filters = [
+            Filter.LimitFilter(1),
+            Filter.NegationFilter(Filter.GrepFilter('+project')),
+        ]
+        compiled = Filter.compile_filters(filters)
+
+        self.assertEqual(todolist_to_string(compiled(self.todos)),
+                         todolist_to_string(self._sequential(filters)))
+        self.assertEqual(len(compiled(self.todos)), 1)
+
+    def test_compiled3(self):
+        filters = [
+            Filter.OrFilter(Filter.GrepFilter('+project'),
+                            Filter.PriorityFilter('(C)')),
+            Filter.AndFilter(Filter.GrepFilter('@test'),
+                             Filter.NegationFilter(Filter.GrepFilter('ebb'))),
+        ]
+        compiled = Filter.compile_filters(filters)
+
+        self.assertEqual(todolist_to_string(compiled(self.todos)),
+                         todolist_to_string(self._sequential(filters)))
+
+    def test_compiled4(self):
+        """ Expensive filters are not evaluated when a cheap one fails. """
+        calls = []
+
+        class ExpensiveFilter(Filter.Filter):
+            def match(self, p_todo):
+                calls.append(p_todo)
+                return True
+
+            @property
+            def cost(self):
+                return 100
+
+        compiled = Filter.compile_filters(
+            [ExpensiveFilter(), Filter.PriorityFilter('(A)')])
+        result = compiled([Todo('(A) Foo'), Todo('(B) Bar'), Todo('Baz')])
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(calls, result)
+
+    def test_compiled5(self):
+        compiled = Filter.compile_filters([])
+
+        self.assertEqual(compiled(self.todos), self.todos)
+
 if __name__ == '__main__':
     unittest.main()
@@ -175,5 +175,13 @@ class GraphTest(TopydoTest):
         out = 'digraph g {\n  1\n  1 -> 2\n  1 -> 3\n  2\n  2 -> 4\n  3\n  3 -> 5\n  4\n  4 -> 3\n  4 -> 6\n  5\n  6\n  6 -> 2\n}\n'
         self.assertEqual(self.graph.dot(False), out)
 
+    def test_incoming_after_removal(self):
+        self.graph.remove_edge(4, 3)
+        self.graph.remove_node(6)
+
+        self.assertEqual(self.graph.incoming_neighbors(3), set([1]))
+        self.assertEqual(self.graph.incoming_neighbors(2), set([1]))
+        self.assertEqual(self.graph.incoming_neighbors(5, True), set([1, 3]))
+
 if __name__ == '__main__':
     unittest.main()
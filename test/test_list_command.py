@@ -15,11 +15,16 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import codecs
+import json
 import os
 import re
+import shutil
+import sqlite3
 import sys
+import tempfile
 import unittest
 from collections import namedtuple
+from contextlib import closing
 
 import arrow
 from freezegun import freeze_time
@@ -479,6 +484,22 @@ class ListCommandTest(CommandTest):
         self.assertEqual(self.output, 't5c\n')
         self.assertEqual(self.errors, '')
 
+    def test_list_stream(self):
+        """ Rows are produced one by one while the output is written. """
+        lines = []
+
+        def out(p_output):
+            self.assertNotIsInstance(p_output, list)
+            for line in p_output:
+                lines.append(str(line))
+
+        command = ListCommand(["-F", "%I %p", "Project1"], self.todolist,
+                              out, self.error)
+        command.execute()
+
+        self.assertEqual(lines, ["1 C"])
+        self.assertEqual(self.errors, '')
+
     def test_list_name(self):
         name = ListCommand.name()
 
@@ -544,6 +565,22 @@ class ListCommandJsonTest(CommandTest):
         self.assertEqual(self.output, jsontext)
         self.assertEqual(self.errors, "")
 
+    def test_ndjson(self):
+        todolist = load_file_to_todolist("test/data/ListCommandTest.txt")
+
+        command = ListCommand(["-f", "ndjson"], todolist, self.out,
+                              self.error)
+        command.execute()
+
+        with codecs.open('test/data/ListCommandTest.json', 'r',
+                         encoding='utf-8') as json_file:
+            expected = json.load(json_file)
+
+        lines = self.output.splitlines()
+        self.assertEqual(len(lines), len(expected))
+        self.assertEqual([json.loads(line) for line in lines], expected)
+        self.assertEqual(self.errors, "")
+
 
 def replace_ical_tags(p_text):
     # replace identifiers with dots, since they're random.
@@ -602,6 +639,114 @@ class ListCommandIcalTest(CommandTest):
                          replace_ical_tags(icaltext))
         self.assertEqual(self.errors, "")
 
+    def test_ical_export(self):
+        try:
+            import icalendar
+        except ImportError:
+            raise unittest.SkipTest("The icalendar module is not available")
+
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        config(p_overrides={('topydo', 'filename'):
+                            os.path.join(tmpdir, 'todo.txt')})
+
+        todolist = load_file_to_todolist("test/data/ListCommandIcalTest.txt")
+
+        command = ListCommand(["-x", "-f", "ical-export"], todolist, self.out,
+                              self.error)
+        command.execute()
+
+        self.assertFalse(todolist.dirty)
+        self.assertEqual(os.listdir(tmpdir), ['.todo.ical.sqlite'])
+
+        with codecs.open('test/data/ListCommandTest.ics', 'r',
+                         encoding='utf-8') as ical:
+            icaltext = ical.read()
+
+        def strip_uids(p_text):
+            p_text = re.sub(r' ical:\w+', '', p_text)
+            return re.sub(r'UID:\S+\r?\n', '', p_text)
+
+        self.assertEqual(strip_uids(self.output), strip_uids(icaltext))
+        self.assertEqual(self.errors, "")
+
+        # a second export reuses the cache and yields the same UIDs
+        first_output = self.output
+        self.output = ""
+
+        with mock.patch('topydo.lib.printers.Ical.IcalPrinter._convert_todo') \
+                as convert_todo:
+            command = ListCommand(["-x", "-f", "ical-export"], todolist,
+                                  self.out, self.error)
+            command.execute()
+
+        self.assertFalse(convert_todo.called)
+        self.assertEqual(self.output, first_output)
+
+    def test_ical_export_cache(self):
+        """ Components of items that changed are removed from the cache. """
+        try:
+            import icalendar
+        except ImportError:
+            raise unittest.SkipTest("The icalendar module is not available")
+
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        config(p_overrides={('topydo', 'filename'):
+                            os.path.join(tmpdir, 'todo.txt')})
+
+        todolist = TodoList(["Foo", "Bar"])
+
+        def cached():
+            path = os.path.join(tmpdir, '.todo.ical.sqlite')
+            with closing(sqlite3.connect(path)) as db:
+                return db.execute("SELECT COUNT(*) FROM components"
+                                  ).fetchone()[0]
+
+        for priority in 'ABC':
+            for todo in todolist.todos():
+                todolist.set_priority(todo, priority)
+
+            command = ListCommand(["-f", "ical-export"], todolist, self.out,
+                                  self.error)
+            command.execute()
+
+            self.assertLessEqual(cached(), 4)
+
+        self.assertEqual(self.errors, "")
+
+    def test_ical_export_uids(self):
+        """
+        The UIDs of items with the same creation date and text don't depend
+        on the filter or sort order.
+        """
+        try:
+            import icalendar
+        except ImportError:
+            raise unittest.SkipTest("The icalendar module is not available")
+
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        config(p_overrides={('topydo', 'filename'):
+                            os.path.join(tmpdir, 'todo.txt')})
+
+        todolist = TodoList(["2015-01-01 Buy milk",
+                             "2015-01-01 Buy milk due:2015-02-01"])
+
+        def uids(p_args):
+            self.output = ""
+            command = ListCommand(["-f", "ical-export"] + p_args, todolist,
+                                  self.out, self.error)
+            command.execute()
+            return re.findall(r'UID:(\S+)', self.output)
+
+        first, second = uids(["-s", "asc:text"])
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(uids(["-s", "asc:due"]), [second, first])
+        self.assertEqual(uids(["due:2015-02-01"]), [second])
+        self.assertEqual(uids(["-s", "asc:due", "-n", "1"]), [second])
+
 
 @freeze_time('2016, 11, 17')
 class ListCommandDotTest(CommandTest):
@@ -858,5 +1003,57 @@ Project: None
 """)
         self.assertEqual(self.errors, "")
 
+class ListCommandArchiveTest(CommandTest):
+    def setUp(self):
+        super().setUp()
+
+        self.tmpdir = tempfile.mkdtemp()
+        archive = os.path.join(self.tmpdir, 'done.txt')
+        with open(archive, 'w') as archive_file:
+            archive_file.write("x 2015-01-01 Buy milk +Groceries\n"
+                               "x 2015-01-02 Call mom\n"
+                               "x 2015-01-03 Buy bread +Groceries\n")
+
+        config(p_overrides={('topydo', 'archive_filename'): archive})
+        self.todolist = TodoList(["Buy cheese +Groceries"])
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.tmpdir)
+
+    def test_archive1(self):
+        command = ListCommand(["-A", "-s", "text", "+groceries"],
+                              self.todolist, self.out, self.error)
+        command.execute()
+
+        self.assertEqual(self.output, "|3| x 2015-01-03 Buy bread +Groceries\n"
+                                      "|1| x 2015-01-01 Buy milk +Groceries\n")
+        self.assertEqual(self.errors, "")
+
+    def test_archive2(self):
+        command = ListCommand(["-A", "-f", "json", "mom"], self.todolist,
+                              self.out, self.error)
+        command.execute()
+
+        self.assertIn('"text": "Call mom"', self.output)
+        self.assertNotIn('Groceries', self.output)
+
+    def test_archive3(self):
+        command = ListCommand(["-A", "+Groceries", "-bread"], self.todolist,
+                              self.out, self.error)
+        command.execute()
+
+        self.assertEqual(self.output,
+                         "|1| x 2015-01-01 Buy milk +Groceries\n")
+
+    def test_archive4(self):
+        config(p_overrides={('topydo', 'archive_filename'): ''})
+        command = ListCommand(["-A", "mom"], self.todolist, self.out,
+                              self.error)
+        command.execute()
+
+        self.assertEqual(self.output, "")
+        self.assertEqual(self.errors, "No archive file configured.\n")
+
 if __name__ == '__main__':
     unittest.main()
@@ -22,6 +22,8 @@ from freezegun import freeze_time
 
 from topydo.commands.ListCommand import ListCommand
 from topydo.lib.Config import config
+from topydo.lib.ListFormat import ListFormatParser
+from topydo.lib.TodoList import TodoList
 from topydo.lib.TodoListBase import TodoListBase
 
 from .command_testcase import CommandTest
@@ -800,5 +802,24 @@ x 2014-12-12 Completed but with date:2014-12-12
         todolist = TodoListBase([str(i) for i in range(0, 100 * 16 * 10)])
         self.assertEqual(4, todolist.max_id_length())
 
+    def test_list_format53(self):
+        """ Backslashes in the todo text are printed as is. """
+        todolist = TodoList([r"Match \d+ in regex"])
+        command = ListCommand(["-F", "%{(}p{)}%s"], todolist, self.out,
+                              self.error)
+        command.execute()
+
+        self.assertEqual(self.output, "Match \\d+ in regex\n")
+        self.assertEqual(self.errors, "")
+
+    def test_list_format54(self):
+        """ Compiled format strings are shared between parsers. """
+        parser1 = ListFormatParser(self.todolist, '%{(}p{)} %s')
+        parser2 = ListFormatParser(None, '%{(}p{)} %s')
+
+        self.assertIs(parser1.format_list, parser2.format_list)
+        self.assertEqual(parser2.parse(self.todolist.todo(1)),
+                         "(D) Bar @Context1 +Project2")
+
 if __name__ == '__main__':
     unittest.main()
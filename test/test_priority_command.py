@@ -264,6 +264,20 @@ class PriorityCommandTest(CommandTest):
         self.assertEqual(self.output, "")
         self.assertEqual(self.errors, "Invalid priority given.\n")
 
+    def test_given_todos(self):
+        """ Todo items given by the caller are not looked up again. """
+        command = PriorityCommand(["1", "3", "C"], self.todolist, self.out,
+                                  self.error)
+        command.set_todos([self.todolist.todo(2), self.todolist.todo(3)])
+        command.execute()
+
+        self.assertTrue(self.todolist.dirty)
+        self.assertEqual(self.output, "Priority set to C.\n|  2| (C) Bar\n"
+                         "Priority changed from B to C\n"
+                         "|  3| (C) a @test with due:2015-06-03\n")
+        self.assertEqual(self.todolist.todo(1).priority(), 'A')
+        self.assertEqual(self.errors, "")
+
     def test_empty(self):
         command = PriorityCommand([], self.todolist, self.out, self.error)
         command.execute()
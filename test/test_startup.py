@@ -0,0 +1,144 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Tests for the startup time of the CLI, based on the import times reported by
+python -X importtime.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from .topydo_testcase import TopydoTest
+
+# modules that are slow to import and not needed for simple commands
+_HEAVY_MODULES = [
+    'arrow',
+    'icalendar',
+    'topydo.lib.printers.Dot',
+    'topydo.lib.printers.Ical',
+    'topydo.lib.printers.Json',
+]
+
+# a coarse upper bound of the time to import the CLI in microseconds, about
+# ten times what a plain ls takes. Importing the heavy modules above or a UI
+# library eagerly would come close to it.
+_IMPORT_TIME_BOUND = 250000
+
+
+class StartupTest(TopydoTest):
+    def setUp(self):
+        super().setUp()
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.config = os.path.join(self.tmpdir, 'topydo.conf')
+        self.todotxt = os.path.join(self.tmpdir, 'todo.txt')
+
+        with open(self.config, 'w') as config_file:
+            config_file.write("[topydo]\nidentifiers = linenumber\n")
+
+        with open(self.todotxt, 'w') as todo_file:
+            todo_file.write("(A) Call mom due:2015-06-01\n")
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.tmpdir)
+
+    def _import_times(self, *p_args):
+        """
+        Runs topydo with the given arguments and returns a dictionary of the
+        imported modules and their cumulative import time in microseconds.
+        """
+        return self._python_import_times(
+            '-m', 'topydo', '-c', self.config, '-t', self.todotxt, *p_args)
+
+    def _python_import_times(self, *p_args):
+        """
+        Runs Python with the given arguments and returns a dictionary like
+        _import_times.
+        """
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=root)
+
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime'] + list(p_args),
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=env,
+            cwd=self.tmpdir, universal_newlines=True, check=True)
+
+        result = {}
+        for line in process.stderr.splitlines():
+            if line.startswith('import time:') and '|' in line:
+                _, cumulative, module = line.split('|')
+
+                try:
+                    result[module.strip()] = int(cumulative)
+                except ValueError:
+                    pass  # the header
+
+        return result
+
+    def _assert_light(self, p_times):
+        for module in _HEAVY_MODULES:
+            self.assertNotIn(module, p_times)
+
+    def test_add(self):
+        times = self._import_times('add', 'Buy milk due:tomorrow')
+
+        self.assertIn('topydo.commands.AddCommand', times)
+        self.assertNotIn('topydo.lib.Graph', times)
+        self._assert_light(times)
+
+    def test_ls(self):
+        times = self._import_times('ls', '-F', '%I %p %s')
+
+        self.assertIn('topydo.commands.ListCommand', times)
+        self._assert_light(times)
+
+    def test_import_time(self):
+        """ Importing everything needed for ls is reasonably fast. """
+        times = self._import_times('ls')
+
+        self.assertLess(times['topydo.ui.UILoader'], _IMPORT_TIME_BOUND)
+
+    def test_revert(self):
+        times = self._import_times('revert')
+
+        self.assertIn('topydo.commands.RevertCommand', times)
+        self._assert_light(times)
+
+    def test_cli_application_base(self):
+        """ The todo list and files are only imported when needed. """
+        times = self._python_import_times(
+            '-c', 'import topydo.ui.CLIApplicationBase')
+
+        self.assertIn('topydo.ui.CLIApplicationBase', times)
+        self.assertNotIn('topydo.lib.TodoList', times)
+        self.assertNotIn('topydo.lib.TodoFile', times)
+        self._assert_light(times)
+
+    def test_ls_dot(self):
+        """ Sanity check: modules that are needed are still imported. """
+        times = self._import_times('ls', '-f', 'dot')
+
+        self.assertIn('topydo.lib.printers.Dot', times)
+        self.assertIn('topydo.lib.Graph', times)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -393,5 +393,37 @@ class TodoBaseTester(TopydoTest):
         self.assertEqual(todo.tag_value('009'), '00')
         self.assertEqual(todo.text(), '')
 
+    def test_lowercase_source1(self):
+        todo = TodoBase("(C) Foo +Project")
+        self.assertEqual(todo.lowercase_source(), "(c) foo +project")
+
+    def test_lowercase_source2(self):
+        """ The cached lowercase source is invalidated on changes. """
+        todo = TodoBase("(C) Foo")
+        todo.lowercase_source()
+        todo.set_tag('Due', 'Tomorrow')
+
+        self.assertEqual(todo.lowercase_source(), "(c) foo due:tomorrow")
+
+    def test_change_listener1(self):
+        changed = []
+        todo = TodoBase("(C) Foo")
+        todo.add_change_listener(changed.append)
+
+        todo.set_priority('A')
+        todo.set_source_text("Bar")
+
+        self.assertEqual(changed, [todo, todo])
+
+    def test_change_listener2(self):
+        changed = []
+        todo = TodoBase("(C) Foo")
+        todo.add_change_listener(changed.append)
+        todo.remove_change_listener(changed.append)
+
+        todo.set_priority('A')
+
+        self.assertEqual(changed, [])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,140 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Tests for the on-disk cache of parsed todo files. """
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from topydo.lib.TodoFile import TodoFile
+from topydo.lib.TodoFileCache import TodoFileCache
+from topydo.lib.TodoList import TodoList
+
+from .topydo_testcase import TopydoTest
+
+
+class TodoFileCacheTest(TopydoTest):
+    def setUp(self):
+        super().setUp()
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'todo.txt')
+        self._write("(A) Buy milk +Groceries due:2015-01-01\n"
+                    "\n"
+                    "Call mom @Phone id:1\n")
+        self.cache = TodoFileCache(self.path,
+                                   os.path.join(self.tmpdir, 'cache'))
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, p_content):
+        with open(self.path, 'w', encoding='utf-8') as todofile:
+            todofile.write(p_content)
+
+    def _read(self):
+        return [todo.source() for todo in self.cache.read()]
+
+    def test_read1(self):
+        """ The result is the same as parsing the todo file. """
+        todos = self.cache.read()
+        expected = TodoList(TodoFile(self.path).read())
+
+        self.assertEqual(TodoList(todos).print_todos(),
+                         expected.print_todos())
+        self.assertEqual(len(todos), 3)
+        self.assertTrue(os.path.exists(self.cache.cache_path))
+
+    def test_read2(self):
+        """ An unchanged file is not parsed again. """
+        self.cache.read()
+
+        with mock.patch('topydo.lib.TodoFileCache.Todo') as todo_mock:
+            todos = self.cache.read()
+
+        self.assertFalse(todo_mock.called)
+        self.assertEqual(todos[0].priority(), 'A')
+        self.assertEqual(todos[0].projects(), {'Groceries'})
+        self.assertEqual(todos[2].tag_value('id'), '1')
+
+    def test_read3(self):
+        """ The cache is refreshed when the file changed. """
+        self.cache.read()
+        self._write("Visit mom\n")
+
+        self.assertEqual(self._read(), ["Visit mom"])
+
+    def test_read4(self):
+        """ A corrupt cache is ignored and replaced. """
+        self.cache.read()
+
+        with open(self.cache.cache_path, 'wb') as cache:
+            cache.write(b'garbage')
+
+        self.assertEqual(len(self._read()), 3)
+        self.assertEqual(len(self._read()), 3)
+
+    def test_read5(self):
+        """ Todo items from the cache can be modified in a todo list. """
+        self.cache.read()
+        todolist = TodoList(self.cache.read())
+        todo = todolist.todo(1)
+
+        todolist.append(todo, "+Shopping")
+
+        self.assertEqual(todolist.count(), 2)
+        self.assertEqual(todo.projects(), {'Groceries', 'Shopping'})
+        self.assertTrue(todolist.dirty)
+
+    def test_store1(self):
+        """ Written todo items are stored, the file isn't parsed again. """
+        todolist = TodoList(self.cache.read())
+        todolist.append(todolist.todo(1), "+Shopping")
+        TodoFile(self.path).write(todolist.print_todos())
+
+        self.cache.store(todolist.todos())
+
+        with mock.patch('topydo.lib.TodoFileCache.Todo') as todo_mock:
+            todos = self.cache.read()
+
+        self.assertFalse(todo_mock.called)
+        self.assertEqual(TodoList(todos).print_todos(), todolist.print_todos())
+        self.assertEqual(todos[0].projects(), {'Groceries', 'Shopping'})
+
+    def test_store2(self):
+        """ Todo items that don't match the file are not stored. """
+        todolist = TodoList(self.cache.read())
+        TodoFile(self.path).write(todolist.print_todos())
+        todolist.add("Feed the cat")
+
+        self.cache.store(todolist.todos())
+
+        with mock.patch('topydo.lib.TodoFileCache.Todo') as todo_mock:
+            self.cache.read()
+
+        self.assertTrue(todo_mock.called)
+
+    def test_missing_file(self):
+        os.remove(self.path)
+
+        self.assertEqual(self.cache.read(), [])
+
+if __name__ == '__main__':
+    unittest.main()
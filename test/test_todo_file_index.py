@@ -0,0 +1,139 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Tests for the on-disk search index of todo files. """
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from topydo.lib.TodoFileIndex import TodoFileIndex, TodoListExcerpt
+
+from .topydo_testcase import TopydoTest
+
+
+class TodoFileIndexTest(TopydoTest):
+    def setUp(self):
+        super().setUp()
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'done.txt')
+        self._write("x 2015-01-01 Buy milk +Groceries\n"
+                    "x 2015-01-02 Call mom\n"
+                    "x 2015-01-03 Buy bread +Groceries\n")
+        self.index = TodoFileIndex(self.path)
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, p_content, p_mode='w'):
+        with open(self.path, p_mode, encoding='utf-8') as todofile:
+            todofile.write(p_content)
+
+    def _search(self, *p_texts):
+        return [(n, line.strip()) for n, line in self.index.search(p_texts)]
+
+    def test_search1(self):
+        self.assertEqual(self._search('+groceries'), [
+            (1, "x 2015-01-01 Buy milk +Groceries"),
+            (3, "x 2015-01-03 Buy bread +Groceries"),
+        ])
+        self.assertTrue(self.index.exists())
+
+    def test_search2(self):
+        self.assertEqual(self._search('buy', 'bread'),
+                         [(3, "x 2015-01-03 Buy bread +Groceries")])
+        self.assertEqual(self._search('dentist'), [])
+
+    def test_search3(self):
+        """ Short texts do not narrow down the lines. """
+        self.assertEqual(len(self._search('mo')), 3)
+        self.assertEqual(len(self._search()), 3)
+
+    def test_append(self):
+        self._search('mom')
+        self._write("x 2015-01-04 Call mom again\n", 'a')
+
+        self.assertEqual(self._search('mom'), [
+            (2, "x 2015-01-02 Call mom"),
+            (4, "x 2015-01-04 Call mom again"),
+        ])
+
+    def test_rewrite(self):
+        self._search('mom')
+        self._write("x 2015-01-05 Visit mom\n")
+
+        self.assertEqual(self._search('mom'), [(1, "x 2015-01-05 Visit mom")])
+
+    def test_edit(self):
+        """ An edit before the end of a large file causes a rebuild. """
+        self._write("".join("x 2015-01-01 Task {}\n".format(i)
+                            for i in range(4, 1001)), 'a')
+        self._search('milk')
+
+        with open(self.path, encoding='utf-8') as todofile:
+            content = todofile.read().replace('milk', 'soda')
+
+        self._write(content + "x 2015-01-04 Buy more soda\n")
+
+        self.assertEqual(self._search('milk'), [])
+        self.assertEqual(self._search('soda'), [
+            (1, "x 2015-01-01 Buy soda +Groceries"),
+            (1001, "x 2015-01-04 Buy more soda"),
+        ])
+
+    def test_unterminated_line(self):
+        self._write("x 2015-01-04 Call dad", 'a')
+        self.assertEqual(self._search('dad'), [(4, "x 2015-01-04 Call dad")])
+
+        self._write(" and mom\n", 'a')
+        self.assertEqual(self._search('mom'), [
+            (2, "x 2015-01-02 Call mom"),
+            (4, "x 2015-01-04 Call dad and mom"),
+        ])
+
+    def test_many_lines(self):
+        self._write("".join("x 2015-01-01 Task {} +Project{}\n".format(
+            i, i % 7) for i in range(4, 5001)), 'a')
+        self.assertEqual(len(self._search('+project3')), 713)
+
+        for batch in range(20):
+            self._write("".join("x 2015-02-01 Batch {} item {}\n".format(
+                batch, i) for i in range(50)), 'a')
+            self._search('batch')
+
+        self.assertEqual(self._search('task 4321'),
+                         [(4321, "x 2015-01-01 Task 4321 +Project2")])
+        self.assertEqual(self._search('batch 12 item 34'),
+                         [(5635, "x 2015-02-01 Batch 12 item 34")])
+        self.assertEqual(len(self._search('batch 1')), 550)
+        self.assertEqual(len(self._search('+project')), 4997)
+
+    def test_missing_file(self):
+        index = TodoFileIndex(os.path.join(self.tmpdir, 'missing.txt'))
+        self.assertEqual(index.search(['foo']), [])
+
+    def test_excerpt(self):
+        todolist = TodoListExcerpt(self.index.search(['bread']))
+
+        self.assertEqual(todolist.count(), 1)
+        self.assertEqual(todolist.linenumber(todolist.todos()[0]), 3)
+        self.assertFalse(todolist.dirty)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,9 +17,14 @@
 """ Tests for the TodoList class. """
 
 import re
+import threading
 import unittest
+from copy import deepcopy
+from datetime import date
 
+from topydo.lib import Filter
 from topydo.lib.Config import config
+from topydo.lib.Sorter import Sorter
 from topydo.lib.Todo import Todo
 from topydo.lib.TodoFile import TodoFile
 from topydo.lib.TodoList import TodoList
@@ -164,6 +169,22 @@ class TodoListTester(TopydoTest):
         todo = Todo("Non-existent")
         self.assertRaises(InvalidTodoException, self.todolist.number, todo)
 
+    def test_todo_number3(self):
+        """ Line numbers follow deletions and additions. """
+        todo = self.todolist.todo(3)
+        self.assertEqual(self.todolist.linenumber(todo), 3)
+
+        self.todolist.delete(self.todolist.todo(1))
+        self.assertEqual(self.todolist.linenumber(todo), 2)
+
+        new_todo = Todo("New")
+        self.todolist.add_todo(new_todo)
+        self.assertEqual(self.todolist.linenumber(new_todo), 5)
+
+        self.todolist.erase()
+        self.assertRaises(InvalidTodoException, self.todolist.linenumber,
+                          todo)
+
     def test_todo_complete(self):
         todo = self.todolist.todo(1)
         self.todolist.set_todo_completed(todo)
@@ -435,6 +456,52 @@ class TodoListDependencyTester(TopydoTest):
         self.assertTrue(self.todolist.dirty)
         self.assertTrue(self.todolist.todo_by_dep_id('99'))
 
+    def test_add_after_dependencies2(self):
+        """
+        Test that added items are connected to existing and added items, in
+        both directions, after the dependency graph was built.
+        """
+        self.todolist.parents(self.todolist.todo(1))
+        self.todolist.add_list(["Parent of orphan id:4", "Child of Baz p:2",
+                                "Child p:5", "New parent id:5"])
+
+        parents = self.todolist.parents(self.todolist.todo(10))
+        self.assertEqual([todo.source() for todo in parents],
+                         ['Parent of orphan id:4'])
+
+        children = self.todolist.children(self.todolist.todo(3))
+        self.assertEqual(sorted([todo.source() for todo in children]),
+                         ['Buzz p:2', 'Child of Baz p:2'])
+
+        children = self.todolist.children(self.todolist.todo(14))
+        self.assertEqual([todo.source() for todo in children], ['Child p:5'])
+
+        parents = self.todolist.parents(self.todolist.todo(12), True)
+        self.assertEqual([todo.source() for todo in parents], ['Baz p:1 id:2'])
+
+    def test_add_after_dependencies3(self):
+        """
+        Added items are connected to all parents with a duplicate ID, like
+        when the graph is built for the whole list.
+        """
+        self.todolist.parents(self.todolist.todo(1))
+        self.todolist.add_list(["Duplicate id:1", "Child of both p:1"])
+
+        todolist = TodoList([todo.source() for todo in self.todolist])
+
+        def relatives(p_todolist, p_number):
+            todo = p_todolist.todo(p_number)
+            return (sorted(t.source() for t in p_todolist.parents(todo)),
+                    sorted(t.source() for t in p_todolist.children(todo)))
+
+        for number in range(1, self.todolist.count() + 1):
+            self.assertEqual(relatives(self.todolist, number),
+                             relatives(todolist, number))
+
+        parents = self.todolist.parents(self.todolist.todo(12))
+        self.assertEqual(sorted([todo.source() for todo in parents]),
+                         ['Duplicate id:1', 'Foo id:1'])
+
     def test_delete01(self):
         """ Check that dependency tags are cleaned up. """
         todo = self.todolist.todo(4)
@@ -509,6 +576,364 @@ class TodoListCleanDependencyTester(TopydoTest):
         self.assertFalse(self.todolist.todo_by_dep_id('1'))
 
 
+class TodoListSearchIndexTester(TopydoTest):
+    def setUp(self):
+        super().setUp()
+
+        self.todolist = TodoList([
+            "(A) Buy groceries +Home",
+            "Call the plumber @Phone +Home",
+            "Write report +Work",
+        ])
+        self.todolist.enable_search_index()
+
+    def _candidates(self, *p_expressions):
+        return [t.source() for t in self.todolist.candidates(
+            [Filter.GrepFilter(e) for e in p_expressions])]
+
+    def test_search_index1(self):
+        self.assertEqual(self._candidates('+home'), [
+            "(A) Buy groceries +Home",
+            "Call the plumber @Phone +Home",
+        ])
+
+    def test_search_index2(self):
+        """ Multiple texts narrow down the candidates. """
+        self.assertEqual(self._candidates('+home', 'plumb'),
+                         ["Call the plumber @Phone +Home"])
+        self.assertEqual(self._candidates('+home', 'report'), [])
+
+    def test_search_index3(self):
+        """ Case sensitive and short expressions do not narrow down. """
+        self.assertEqual(len(self._candidates('+Home')), 3)
+        self.assertEqual(len(self._candidates('ho')), 3)
+
+    def test_search_index4(self):
+        """ Changes to todo items are reflected in the index. """
+        self._candidates('+work')
+        todo = self.todolist.todo(1)
+        todo.set_tag('ctx', 'work')
+        self.todolist.append(self.todolist.todo(2), '+Work')
+
+        self.assertEqual(self._candidates('work'), [
+            "(A) Buy groceries +Home ctx:work",
+            "Call the plumber @Phone +Home +Work",
+            "Write report +Work",
+        ])
+
+    def test_search_index5(self):
+        self._candidates('+home')
+        self.todolist.delete(self.todolist.todo(1))
+        self.todolist.add("Repaint the +Home")
+
+        self.assertEqual(self._candidates('+home'), [
+            "Call the plumber @Phone +Home",
+            "Repaint the +Home",
+        ])
+
+    def test_search_index6(self):
+        self.todolist.erase()
+        self.todolist.add_list(["Water the plants +Home"])
+
+        self.assertEqual(self._candidates('+home'),
+                         ["Water the plants +Home"])
+
+    def test_search_index7(self):
+        self.assertEqual(self.todolist.todo('report').source(),
+                         "Write report +Work")
+        self.assertRaises(InvalidTodoException, self.todolist.todo, '+home')
+
+    def test_search_index8(self):
+        """ Views only consider the candidates from the index. """
+        view = self.todolist.view(Sorter('desc:text'),
+                                  [Filter.GrepFilter('+home')])
+
+        self.assertEqual([t.source() for t in view.todos], [
+            "Call the plumber @Phone +Home",
+            "(A) Buy groceries +Home",
+        ])
+
+
+class TodoListDateIndexTester(TopydoTest):
+    def setUp(self):
+        super().setUp()
+
+        self.todolist = TodoList([
+            "2015-01-01 Renew passport due:2015-06-01",
+            "Pay rent due:2015-05-01",
+            "x 2015-04-01 Book flights due:2015-04-01",
+            "Water the plants due:monday",
+            "Call mom due:2015-05-01 due:2015-07-01",
+            "Clean the garage",
+        ])
+        self.todolist.enable_search_index()
+
+    def _candidates(self, *p_expressions):
+        return [t.source() for t in self.todolist.candidates(
+            Filter.get_filter_list(p_expressions))]
+
+    def test_date_index1(self):
+        """ Tags with a date are looked up, others are always candidates. """
+        self.assertEqual(self._candidates('due:<2015-05-15'), [
+            "Pay rent due:2015-05-01",
+            "x 2015-04-01 Book flights due:2015-04-01",
+            "Water the plants due:monday",
+            "Call mom due:2015-05-01 due:2015-07-01",
+        ])
+
+    def test_date_index2(self):
+        self.assertEqual(self._candidates('due:2015-05-01'), [
+            "Pay rent due:2015-05-01",
+            "Water the plants due:monday",
+            "Call mom due:2015-05-01 due:2015-07-01",
+        ])
+        self.assertEqual(len(self._candidates('due:!2015-05-01')), 4)
+
+    def test_date_index3(self):
+        self.assertEqual(self._candidates('created:<2015-02-01'),
+                         ["2015-01-01 Renew passport due:2015-06-01"])
+        self.assertEqual(self._candidates('completed:2015-04-01'),
+                         ["x 2015-04-01 Book flights due:2015-04-01"])
+        self.assertEqual(self._candidates('completed:>2015-04-01'), [])
+
+    def test_date_index4(self):
+        """ Candidates of multiple filters are intersected. """
+        self.assertEqual(self._candidates('due:>2015-04-15', 'rent'),
+                         ["Pay rent due:2015-05-01"])
+
+    def test_date_index5(self):
+        """ Changes to todo items are reflected in the index. """
+        self._candidates('due:>2015-05-15')
+        self.todolist.todo(2).set_tag('due', '2015-06-15')
+        self.todolist.add("Buy a present due:2015-08-01")
+
+        self.assertEqual(self._candidates('due:>2015-05-15'), [
+            "2015-01-01 Renew passport due:2015-06-01",
+            "Pay rent due:2015-06-15",
+            "Water the plants due:monday",
+            "Call mom due:2015-05-01 due:2015-07-01",
+            "Buy a present due:2015-08-01",
+        ])
+
+    def test_date_index6(self):
+        """ Views give the same results with and without index. """
+        filters = Filter.get_filter_list(['due:<=2015-05-01'])
+        sorter = Sorter('text')
+        expected = [t.source() for t in
+                    TodoList(self.todolist.print_todos().splitlines()).view(sorter, filters).todos]
+
+        self.assertEqual(
+            [t.source() for t in self.todolist.view(sorter, filters).todos],
+            expected)
+        self.assertEqual(len(expected), 2)
+
+
+class TodoListVocabularyTester(TopydoTest):
+    def setUp(self):
+        super().setUp()
+
+        self.todolist = TodoList([
+            "Buy groceries +Home @Store",
+            "Call the plumber @Phone +Home +House",
+            "Write report +Work @Phone",
+        ])
+
+    def _test_prefix(self):
+        self.assertEqual(self.todolist.projects_with_prefix('Ho'),
+                         ['Home', 'House'])
+        self.assertEqual(self.todolist.projects_with_prefix('Hom'), ['Home'])
+        self.assertEqual(self.todolist.projects_with_prefix('ho'), [])
+        self.assertEqual(self.todolist.contexts_with_prefix(''),
+                         ['Phone', 'Store'])
+
+    def test_vocabulary1(self):
+        self._test_prefix()
+
+    def test_vocabulary2(self):
+        self.todolist.enable_search_index()
+        self._test_prefix()
+
+    def test_vocabulary3(self):
+        """ Words are removed with the last todo item containing them. """
+        self.todolist.enable_search_index()
+        self.assertEqual(self.todolist.projects(), {'Home', 'House', 'Work'})
+
+        self.todolist.delete(self.todolist.todo(1))
+        self.assertEqual(self.todolist.projects(), {'Home', 'House', 'Work'})
+
+        self.todolist.delete(self.todolist.todo(1))
+        self.assertEqual(self.todolist.projects(), {'Work'})
+
+    def test_vocabulary4(self):
+        """ Changes to todo items are reflected in the vocabulary. """
+        self.todolist.enable_search_index()
+        self.assertEqual(self.todolist.contexts(), {'Phone', 'Store'})
+
+        todo = self.todolist.todo(1)
+        self.todolist.modify_todo(todo, "Buy groceries +Home @Car")
+        self.todolist.append(self.todolist.todo(3), "@Office")
+
+        self.assertEqual(self.todolist.contexts(),
+                         {'Car', 'Office', 'Phone'})
+
+    def _test_usage(self):
+        self.todolist.add("2015-03-01 Fix the roof +House")
+        self.todolist.add("x 2015-03-10 2015-02-01 Paint the door +House")
+
+        self.assertEqual(self.todolist.project_usage('House'),
+                         (3, date(2015, 3, 10)))
+        self.assertEqual(self.todolist.project_usage('Home'), (2, None))
+        self.assertEqual(self.todolist.context_usage('Car'), (0, None))
+
+    def test_usage1(self):
+        self._test_usage()
+
+    def test_usage2(self):
+        self.todolist.enable_search_index()
+        self._test_usage()
+
+
+class TodoListChangesTester(TopydoTest):
+    def setUp(self):
+        super().setUp()
+
+        self.todolist = TodoList([
+            "Foo id:1",
+            "Bar p:1",
+            "Baz p:1 id:2",
+            "Buzz p:2",
+            "Fnord",
+        ])
+
+        # the dependency graph is built on demand
+        self.todolist.children(self.todolist.todo(1))
+
+    def test_not_recording(self):
+        self.assertIsNone(self.todolist.stop_recording())
+
+    def test_add(self):
+        self.todolist.start_recording()
+        todo = self.todolist.add("New")
+        changes = self.todolist.stop_recording()
+
+        self.assertEqual(changes.added, {todo})
+        self.assertEqual(changes.removed, set())
+        self.assertEqual(changes.changed, set())
+
+    def test_delete(self):
+        todo = self.todolist.todo(5)
+
+        self.todolist.start_recording()
+        self.todolist.delete(todo)
+        changes = self.todolist.stop_recording()
+
+        self.assertEqual(changes.affected(), {todo})
+
+    def test_add_delete(self):
+        """ Items added and removed in the same transaction are ignored. """
+        self.todolist.start_recording()
+        todo = self.todolist.add("New")
+        self.todolist.delete(todo)
+
+        self.assertFalse(self.todolist.stop_recording())
+
+    def test_modify(self):
+        todo = self.todolist.todo(5)
+
+        self.todolist.start_recording()
+        self.todolist.set_priority(todo, 'A')
+        changes = self.todolist.stop_recording()
+
+        self.assertEqual(changes.changed, {todo})
+
+    def test_related(self):
+        """ Parents and children of a changed item are marked changed too. """
+        self.todolist.start_recording()
+        self.todolist.set_todo_completed(self.todolist.todo(3))
+        changes = self.todolist.stop_recording()
+
+        self.assertEqual({t.text() for t in changes.changed},
+                         {"Foo", "Baz", "Buzz"})
+
+    def test_remove_dependency(self):
+        self.todolist.start_recording()
+        self.todolist.remove_dependency(self.todolist.todo(1),
+                                        self.todolist.todo(2), True)
+        changes = self.todolist.stop_recording()
+
+        self.assertEqual({t.text() for t in changes.changed},
+                         {"Foo", "Bar", "Baz", "Buzz"})
+
+    def test_erase(self):
+        self.todolist.start_recording()
+        self.todolist.replace([Todo("New")])
+
+        self.assertTrue(self.todolist.stop_recording().reset)
+
+    def test_replace(self):
+        """ Restored todo items no longer notify the list they came from. """
+        backup = deepcopy(self.todolist)
+        self.todolist.replace(backup.todos())
+        revision = backup.revision
+
+        self.todolist.start_recording()
+        self.todolist.todo(1).set_priority('A')
+        changes = self.todolist.stop_recording()
+
+        self.assertEqual(backup.revision, revision)
+        self.assertEqual([t.source() for t in changes.changed],
+                         ["(A) Foo id:1"])
+
+    def test_lock(self):
+        """ A copy has its own lock. """
+        backup = deepcopy(self.todolist)
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            with backup._lock:
+                locked.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        locked.wait()
+
+        try:
+            self.assertTrue(self.todolist._lock.acquire(timeout=1))
+            self.todolist._lock.release()
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertEqual(backup.print_todos(), self.todolist.print_todos())
+
+    def test_merge(self):
+        self.todolist.start_recording()
+        todo = self.todolist.add("New")
+        changes = self.todolist.stop_recording()
+
+        self.todolist.start_recording()
+        self.todolist.set_priority(todo, 'A')
+        self.todolist.delete(self.todolist.todo(5))
+        changes.merge(self.todolist.stop_recording())
+
+        self.assertEqual(changes.added, {todo})
+        self.assertEqual({t.text() for t in changes.removed}, {"Fnord"})
+        self.assertEqual(changes.changed, set())
+
+    def test_erase_dependencies(self):
+        """ Dependencies are built again after the list was erased. """
+        self.todolist.erase()
+        self.todolist.add_list(["Qux id:3", "Quux p:3"])
+
+        self.assertEqual([t.text() for t in
+                          self.todolist.children(self.todolist.todo(1))],
+                         ["Quux"])
+        self.assertEqual(self.todolist.parents(self.todolist.todo(2)),
+                         [self.todolist.todo(1)])
+
+
 class TodoLoadTester(TopydoTest):
     """Test the auto_delete_whitespace configuration parameter"""
     def setUp(self):
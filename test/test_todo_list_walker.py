@@ -0,0 +1,136 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Tests for the list walker of the columns in column mode. """
+
+import unittest
+
+from topydo.lib.Todo import Todo
+
+from .topydo_testcase import TopydoTest
+
+try:
+    from topydo.ui.columns.TodoListWalker import TodoListWalker
+except ImportError:  # urwid is not installed
+    TodoListWalker = None
+
+
+@unittest.skipIf(TodoListWalker is None, "urwid is not installed")
+class TodoListWalkerTest(TopydoTest):
+    def setUp(self):
+        super().setUp()
+
+        self.todos = [Todo("Foo"), Todo("Bar"), Todo("Baz")]
+        self.rows = ["Group 1", self.todos[0], self.todos[1],
+                     "Group 2", self.todos[2]]
+        self.created = []
+
+        self.walker = TodoListWalker()
+        self.walker.set_rows(self.rows, self._todo_widget)
+
+    def _todo_widget(self, p_todo):
+        self.created.append(p_todo)
+        return ('widget', p_todo)
+
+    def test_rows(self):
+        """ Row i is at position 2i, followed by a divider. """
+        self.assertEqual(len(self.walker), 10)
+
+        for i, row in enumerate(self.rows):
+            self.assertIs(self.walker.row(2 * i), row)
+            self.assertIs(self.walker.row(2 * i + 1), row)
+
+        self.assertEqual(self.walker[2], ('widget', self.todos[0]))
+        self.assertEqual(self.walker[0].text, "Group 1")
+
+    def test_divider(self):
+        """ All rows share the same divider. """
+        divider = self.walker[1]
+
+        for position in range(1, 10, 2):
+            self.assertIs(self.walker[position], divider)
+
+        self.assertRaises(IndexError, lambda: self.walker[10])
+        self.assertRaises(IndexError, lambda: self.walker[11])
+        self.assertRaises(IndexError, lambda: self.walker[-1])
+
+    def test_lazy_widgets(self):
+        """ Widgets are created when they are asked for, only once. """
+        self.assertEqual(self.created, [])
+        self.assertEqual(self.walker.shown_todos(), [])
+
+        widget = self.walker[4]
+        self.assertIs(self.walker[4], widget)
+
+        self.assertEqual(self.created, [self.todos[1]])
+        self.assertEqual(self.walker.shown_todos(), [(self.todos[1], widget)])
+
+    def test_next_prev_position(self):
+        self.assertEqual(self.walker.next_position(0), 1)
+        self.assertEqual(self.walker.next_position(8), 9)
+        self.assertRaises(IndexError, self.walker.next_position, 9)
+
+        self.assertEqual(self.walker.prev_position(9), 8)
+        self.assertEqual(self.walker.prev_position(1), 0)
+        self.assertRaises(IndexError, self.walker.prev_position, 0)
+
+        self.assertEqual(list(self.walker.positions()), list(range(10)))
+        self.assertEqual(list(self.walker.positions(reverse=True)),
+                         list(range(9, -1, -1)))
+
+    def test_position(self):
+        self.assertEqual(self.walker.position(self.todos[0]), 2)
+        self.assertEqual(self.walker.position(self.todos[2]), 8)
+        self.assertEqual(self.walker.position("Group 2"), 6)
+        self.assertIsNone(self.walker.position(Todo("Foo")))
+        self.assertEqual(self.walker.todos(), self.todos)
+
+    def test_position_equal_labels(self):
+        """ Equal group labels map to the first of them. """
+        self.walker.set_rows(["Group", self.todos[0], "Group"],
+                             self._todo_widget)
+
+        self.assertEqual(self.walker.position("Group"), 0)
+
+    def test_set_focus(self):
+        self.walker.set_focus(8)
+        self.assertEqual(self.walker.focus, 8)
+        self.assertRaises(IndexError, self.walker.set_focus, 10)
+
+        # the focus moves up when the list gets shorter
+        self.walker.set_rows(self.rows[:2], self._todo_widget)
+        self.assertEqual(self.walker.focus, 3)
+
+        self.walker.set_rows([], self._todo_widget)
+        self.assertEqual(self.walker.focus, 0)
+
+    def test_changed_rows(self):
+        """ Only the widgets of changed rows are created again. """
+        widget0 = self.walker[2]
+        widget1 = self.walker[4]
+
+        self.walker.set_rows(self.rows, self._todo_widget, {self.todos[1]})
+
+        self.assertIs(self.walker[2], widget0)
+        self.assertIsNot(self.walker[4], widget1)
+        self.assertEqual(self.created,
+                         [self.todos[0], self.todos[1], self.todos[1]])
+
+        self.walker.set_rows(self.rows, self._todo_widget)
+        self.assertIsNot(self.walker[2], widget0)
+
+if __name__ == '__main__':
+    unittest.main()
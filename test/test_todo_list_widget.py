@@ -0,0 +1,117 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Tests for the columns of todo items in column mode. """
+
+import unittest
+
+from topydo.lib.Config import config
+from topydo.lib.Sorter import Sorter
+from topydo.lib.TodoList import TodoList
+from topydo.lib.View import View
+
+from .topydo_testcase import TopydoTest
+
+try:
+    import urwid
+    from topydo.ui.columns.TodoListWidget import TodoListWidget
+    from topydo.ui.columns.TodoWidget import TodoWidget
+except ImportError:  # urwid is not installed
+    TodoListWidget = None
+
+
+@unittest.skipIf(TodoListWidget is None, "urwid is not installed")
+class TodoListWidgetTest(TopydoTest):
+    def setUp(self):
+        super().setUp()
+        config(p_overrides={('columns', 'widget_cache_size'): '2'})
+        TodoWidget.wipe_cache()
+
+        self.todolist = TodoList(["Foo {}".format(i) for i in range(10)])
+        self.widget = TodoListWidget(View(Sorter(), [], self.todolist),
+                                     'Title', {})
+        self.widget.update()
+
+        self.marked = []
+        urwid.connect_signal(self.widget, 'toggle_mark',
+                             lambda p_id, p_mode: self.marked.append(p_id))
+
+    def _shown_widgets(self):
+        walker = self.widget.todolist
+        return [walker[walker.position(todo)] for todo in walker.todos()]
+
+    def _update(self, p_change):
+        """ Updates the widget with the changes made by p_change. """
+        self.todolist.start_recording()
+        p_change()
+        self.widget.update(self.todolist.stop_recording())
+
+    def _focus(self):
+        walker = self.widget.todolist
+        return walker.row(walker.focus)
+
+    def test_focus_insert(self):
+        """ The focus stays on the same item when rows are inserted. """
+        todo = self.todolist.todo(6)
+        self.widget.todolist.set_focus(10)
+
+        self._update(lambda: self.todolist.add("(A) Urgent"))
+
+        self.assertIs(self._focus(), todo)
+        self.assertEqual(self.widget.todolist.focus, 12)
+
+    def test_focus_remove(self):
+        """ The focus stays on the same item when rows are removed. """
+        todo = self.todolist.todo(6)
+        self.widget.todolist.set_focus(10)
+        self.widget.render((40, 30))
+
+        self._update(lambda: self.todolist.delete(self.todolist.todo(1)))
+
+        self.assertIs(self._focus(), todo)
+        self.assertEqual(self.widget.todolist.focus, 8)
+
+        # the shown items were renumbered
+        self.assertEqual(self.widget.todolist[8].id_widget.text, '5')
+
+    def test_focus_removed_item(self):
+        """ The focus moves to the last row when the last item is removed. """
+        self.widget.todolist.set_focus(18)
+
+        self._update(lambda: self.todolist.delete(self.todolist.todo(10)))
+
+        self.assertIs(self._focus(), self.todolist.todo(9))
+        self.assertEqual(self.widget.todolist.focus, 16)
+
+    def test_todo_id(self):
+        """ Removed items have no ID. """
+        todo = self.todolist.todo(3)
+        self.assertEqual(self.widget._todo_id(todo), '3')
+
+        self.todolist.delete(todo)
+        self.assertEqual(self.widget._todo_id(todo), '')
+
+    def test_mark_all(self):
+        """ All shown widgets are marked, also beyond the widget cache. """
+        self.widget.render((40, 5))
+        self.widget._mark_all()
+
+        self.assertEqual(self.marked, [str(i) for i in range(1, 11)])
+        self.assertTrue(all(widget.marked
+                            for widget in self._shown_widgets()))
+
+if __name__ == '__main__':
+    unittest.main()
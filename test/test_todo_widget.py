@@ -0,0 +1,90 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Tests for the cache of todo widgets in column mode. """
+
+import unittest
+
+from topydo.lib.Config import config
+from topydo.lib.Todo import Todo
+
+from .topydo_testcase import TopydoTest
+
+try:
+    from topydo.ui.columns.TodoWidget import TodoWidget
+except ImportError:  # urwid is not installed
+    TodoWidget = None
+
+
+@unittest.skipIf(TodoWidget is None, "urwid is not installed")
+class TodoWidgetCacheTest(TopydoTest):
+    def setUp(self):
+        super().setUp()
+        config(p_overrides={('columns', 'widget_cache_size'): '2'})
+
+        TodoWidget.wipe_cache()
+        TodoWidget.cache_hits = 0
+        TodoWidget.cache_misses = 0
+
+        self.todos = [Todo("Foo"), Todo("Bar"), Todo("Baz")]
+
+    def test_reuse(self):
+        widget = TodoWidget.create(self.todos[0])
+
+        self.assertIs(TodoWidget.create(self.todos[0]), widget)
+        self.assertEqual(TodoWidget.cache_hits, 1)
+        self.assertEqual(TodoWidget.cache_misses, 1)
+
+    def test_changed_todo(self):
+        """ A todo item that changed gets a new widget. """
+        widget = TodoWidget.create(self.todos[0])
+        self.todos[0].set_priority('A')
+
+        self.assertIsNot(TodoWidget.create(self.todos[0]), widget)
+        self.assertEqual(TodoWidget.cache_misses, 2)
+
+    def test_same_text(self):
+        """ Different todo items with the same text get their own widget. """
+        widget = TodoWidget.create(Todo("Foo"))
+        self.assertIsNot(TodoWidget.create(self.todos[0]), widget)
+
+    def test_id_width(self):
+        widget = TodoWidget.create(self.todos[0], 3)
+        self.assertIsNot(TodoWidget.create(self.todos[0], 4), widget)
+
+    def test_evict(self):
+        """ The least recently used widget is evicted. """
+        widget1 = TodoWidget.create(self.todos[0])
+        widget2 = TodoWidget.create(self.todos[1])
+        TodoWidget.create(self.todos[0])
+        TodoWidget.create(self.todos[2])
+
+        self.assertEqual(len(TodoWidget.cache), 2)
+        self.assertIs(TodoWidget.create(self.todos[0]), widget1)
+        self.assertIsNot(TodoWidget.create(self.todos[1]), widget2)
+
+    def test_evict_marked(self):
+        """ Marked widgets are not evicted. """
+        widget1 = TodoWidget.create(self.todos[0])
+        widget1.mark()
+        TodoWidget.create(self.todos[1])
+        TodoWidget.create(self.todos[2])
+
+        self.assertIs(TodoWidget.create(self.todos[0]), widget1)
+        self.assertEqual(len(TodoWidget.cache), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,8 +15,11 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import unittest
+from datetime import date
 
-from topydo.lib.Utils import translate_key_to_config
+from freezegun import freeze_time
+
+from topydo.lib.Utils import humanize_date, translate_key_to_config
 
 from .topydo_testcase import TopydoTest
 
@@ -33,5 +36,18 @@ class UtilsTest(TopydoTest):
         self.assertEqual(esc, '<Esc>')
         self.assertEqual(f4, '<F4>')
 
+    def test_humanize_date1(self):
+        with freeze_time('2015, 11, 06'):
+            self.assertEqual(humanize_date(date(2015, 11, 6)), 'today')
+            self.assertEqual(humanize_date(date(2015, 11, 8)), 'in 2 days')
+
+    def test_humanize_date2(self):
+        """ Cached results are not reused on another day. """
+        with freeze_time('2015, 11, 06'):
+            self.assertEqual(humanize_date(date(2015, 11, 7)), 'in a day')
+
+        with freeze_time('2015, 11, 07'):
+            self.assertEqual(humanize_date(date(2015, 11, 7)), 'today')
+
 if __name__ == '__main__':
     unittest.main()
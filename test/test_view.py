@@ -15,11 +15,15 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import unittest
+from unittest import mock
 
 from topydo.lib import Filter
+from topydo.lib.SharedEvaluation import SharedEvaluation
 from topydo.lib.Sorter import Sorter
+from topydo.lib.TodoBase import TodoBase
 from topydo.lib.TodoFile import TodoFile
 from topydo.lib.TodoList import TodoList
+from topydo.lib.View import View
 
 from .facilities import load_file, print_view, todolist_to_string
 from .topydo_testcase import TopydoTest
@@ -38,5 +42,100 @@ class ViewTest(TopydoTest):
 
         self.assertEqual(print_view(view), todolist_to_string(ref))
 
+    def _shared_views(self):
+        self.todolist = TodoList(["(A) Foo +Project", "Bar",
+                                  "(B) Baz +Project"])
+        self.evaluation = SharedEvaluation(self.todolist)
+        self.todofilter = Filter.GrepFilter('+Project')
+
+        self.match = mock.Mock(wraps=self.todofilter.match)
+        self.todofilter.match = self.match
+
+        return [View(Sorter(p_sorting), [self.todofilter], self.todolist,
+                     self.evaluation) for p_sorting in ('desc:text', 'text')]
+
+    def test_shared_evaluation1(self):
+        """ Views sharing an evaluation match each todo only once. """
+        view1, view2 = self._shared_views()
+
+        self.assertEqual([t.text() for t in view1.todos], ["Foo +Project",
+                                                           "Baz +Project"])
+        self.assertEqual([t.text() for t in view2.todos], ["Baz +Project",
+                                                           "Foo +Project"])
+        self.assertEqual(self.match.call_count, 3)
+
+    def test_shared_evaluation2(self):
+        """ Results are reused while the todo list doesn't change. """
+        view1, _ = self._shared_views()
+
+        todos = view1.todos
+        self.assertIs(view1.todos, todos)
+        self.assertEqual(self.match.call_count, 3)
+
+    def test_shared_evaluation3(self):
+        """ Modifications of the todo list are seen by the views. """
+        view1, view2 = self._shared_views()
+        view1.todos
+        view2.todos
+
+        self.todolist.todo(2).set_source_text("Qux +Project")
+        self.todolist.add("Quux")
+
+        self.assertEqual(len(view1.todos), 3)
+        self.assertEqual(len(view2.todos), 3)
+        self.assertEqual(self.match.call_count, 7)
+
+    def test_shared_evaluation4(self):
+        """ Clearing the evaluation computes everything again. """
+        view1, _ = self._shared_views()
+        view1.todos
+
+        self.evaluation.clear()
+        view1.todos
+        self.assertEqual(self.match.call_count, 6)
+
+    def test_shared_evaluation5(self):
+        """ Only values of changed todo items are computed again. """
+        view1, view2 = self._shared_views()
+        view1.todos
+        view2.todos
+
+        self.todolist.start_recording()
+        self.todolist.todo(2).set_source_text("Qux +Project")
+        self.evaluation.apply_changes(self.todolist.stop_recording())
+
+        self.assertEqual(len(view1.todos), 3)
+        self.assertEqual(len(view2.todos), 3)
+        self.assertEqual(self.match.call_count, 4)
+
+    def test_shared_evaluation6(self):
+        """ Unrecorded changes still invalidate all values. """
+        view1, _ = self._shared_views()
+        view1.todos
+
+        self.todolist.add("Quux +Project")
+        self.todolist.start_recording()
+        self.todolist.todo(2).set_source_text("Qux +Project")
+        self.evaluation.apply_changes(self.todolist.stop_recording())
+
+        self.assertEqual(len(view1.todos), 4)
+        self.assertEqual(self.match.call_count, 7)
+
+    def test_shared_evaluation7(self):
+        """ Separate sorters on the same tag share their sort keys. """
+        self._shared_views()
+        view1, view2 = [View(Sorter(p_sorting), [], self.todolist,
+                             self.evaluation)
+                        for p_sorting in ('asc:due', 'desc:due')]
+
+        with mock.patch.object(TodoBase, 'has_tag', autospec=True,
+                               side_effect=TodoBase.has_tag) as has_tag:
+            view1.todos
+            view2.todos
+
+        due_calls = [call for call in has_tag.call_args_list
+                     if call[0][1] == 'due']
+        self.assertEqual(len(due_calls), 3)
+
 if __name__ == '__main__':
     unittest.main()
@@ -56,7 +56,11 @@ class AddCommand(WriteCommand):
 
         return todos
 
-    def _add_todo(self, p_todo_text):
+    def _add_todos(self, p_todo_texts):
+        """
+        Adds the given todo items to the list at once, such that the list
+        updates its administration (IDs, dependencies, indexes) only once.
+        """
         def _preprocess_input_todo(p_todo_text):
             """
             Pre-processes user input when adding a task.
@@ -68,14 +72,17 @@ class AddCommand(WriteCommand):
 
             return todo_text
 
-        todo_text = _preprocess_input_todo(p_todo_text)
-        todo = self.todolist.add(todo_text)
-        self.postprocess_input_todo(todo)
+        todos = self.todolist.add_list([_preprocess_input_todo(text)
+                                        for text in p_todo_texts])
 
-        if config().auto_creation_date():
-            todo.set_creation_date(date.today())
+        for todo in todos:
+            self.postprocess_input_todo(todo)
 
-        self.out(self.printer.print_todo(todo))
+            if config().auto_creation_date():
+                todo.set_creation_date(date.today())
+
+        for todo in todos:
+            self.out(self.printer.print_todo(todo))
 
     def execute(self):
         """ Adds a todo item to the list. """
@@ -87,15 +94,12 @@ class AddCommand(WriteCommand):
 
         if self.from_file:
             try:
-                new_todos = self.get_todos_from_file()
-
-                for todo in new_todos:
-                    self._add_todo(todo)
+                self._add_todos(self.get_todos_from_file())
             except (IOError, OSError):
                 self.error('File not found: ' + self.from_file)
         else:
             if self.text:
-                self._add_todo(self.text)
+                self._add_todos([self.text])
             else:
                 self.error(self.usage())
 
@@ -124,7 +124,7 @@ class DepCommand(Command):
             sorter = Sorter(config().sort_string())
             instance_filter = Filter.InstanceFilter(todos)
             view = View(sorter, [instance_filter], self.todolist)
-            self.out(self.printer.print_list(view.todos))
+            self.out(self.printer.iter_list(view.todos))
         except InvalidTodoException:
             self.error("Invalid todo number given.")
         except InvalidCommandArgument:
@@ -143,7 +143,7 @@ class DepCommand(Command):
             todos |= set(self.todolist.parents(todo))
             todos = sorted(todos, key=lambda t: t.text())
 
-            self.out(self.printer.print_list(todos))
+            self.out(self.printer.iter_list(todos))
         except InvalidTodoException:
             self.error("Invalid todo number given.")
         except InvalidCommandArgument:
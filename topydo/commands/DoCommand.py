@@ -68,6 +68,7 @@ class DoCommand(DCommand):
                 )
 
                 self.todolist.add_todo(new_todo)
+                self._added.append(new_todo)
 
             except NoRecurrenceException:
                 self.error("Warning: todo item has an invalid recurrence pattern.")
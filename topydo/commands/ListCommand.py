@@ -20,7 +20,8 @@ import sys
 
 from topydo.lib.Config import config
 from topydo.lib.ExpressionCommand import ExpressionCommand
-from topydo.lib.Filter import HiddenTagFilter, InstanceFilter
+from topydo.lib.Filter import (HiddenTagFilter, InstanceFilter,
+                               get_filter_list)
 from topydo.lib.ListFormat import ListFormatError
 from topydo.lib.prettyprinters.Format import PrettyPrinterFormatFilter
 from topydo.lib.printers.PrettyPrinter import pretty_printer_factory
@@ -44,6 +45,7 @@ class ListCommand(ExpressionCommand):
         self.show_all = False
         self.ids = None
         self.format = config().list_format()
+        self.search_archive = False
 
     def _poke_icalendar(self):
         """
@@ -59,10 +61,15 @@ class ListCommand(ExpressionCommand):
         return True
 
     def _process_flags(self):
-        opts, args = self.getopt('f:F:g:i:n:Ns:x')
+        opts, args = self.getopt('Af:F:g:i:n:Ns:x')
+
+        if ('-A', '') in opts:
+            # the printers below may need the todo list, so replace it first
+            self.search_archive = True
+            self.todolist = self._search_archive(args)
 
         for opt, value in opts:
-            if opt == '-x':
+            if opt in ('-x', '-A'):
                 self.show_all = True
             elif opt == '-s':
                 self.sort_expression = value
@@ -70,10 +77,18 @@ class ListCommand(ExpressionCommand):
                 if value == 'json':
                     from topydo.lib.printers.Json import JsonPrinter
                     self.printer = JsonPrinter()
+                elif value == 'ndjson':
+                    from topydo.lib.printers.Json import NdjsonPrinter
+                    self.printer = NdjsonPrinter()
                 elif value == 'ical':
                     if self._poke_icalendar():
                         from topydo.lib.printers.Ical import IcalPrinter
                         self.printer = IcalPrinter(self.todolist)
+                elif value == 'ical-export':
+                    if self._poke_icalendar():
+                        from topydo.lib.printers.Ical import IcalExportPrinter
+                        self.printer = IcalExportPrinter(
+                            self.todolist, ListCommand._ical_cache_path())
                 elif value == 'dot':
                     from topydo.lib.printers.Dot import DotPrinter
                     self.printer = DotPrinter(self.todolist)
@@ -104,6 +119,29 @@ class ListCommand(ExpressionCommand):
 
         self.args = args
 
+    def _search_archive(self, p_args):
+        """
+        Returns a todo list with the items of the archive that may match the
+        expression, looked up with a search index.
+        """
+        from topydo.lib.TodoFileIndex import TodoListExcerpt, search_todo_file
+
+        if not config().archive():
+            self.error("No archive file configured.")
+            return TodoListExcerpt([])
+
+        return search_todo_file(config().archive(), get_filter_list(p_args))
+
+    @staticmethod
+    def _ical_cache_path():
+        """
+        Returns the path of the cache for iCalendar exports, a hidden file next
+        to the todo file.
+        """
+        dirname, filename = os.path.split(config().todotxt())
+        return os.path.join(dirname, '.' + os.path.splitext(filename)[0]
+                            + '.ical.sqlite')
+
     def _filters(self):
         """
         Additional filters to:
@@ -151,9 +189,9 @@ class ListCommand(ExpressionCommand):
 
         try:
             if self.group_expression:
-                self.out(self.printer.print_groups(self._view().groups))
+                self.out(self.printer.iter_groups(self._view().groups))
             else:
-                self.out(self.printer.print_list(self._view().todos))
+                self.out(self.printer.iter_list(self._view().todos))
         except ListFormatError:
             self.error('Error while parsing format string (list_format config'
                        ' option or -F)')
@@ -210,7 +248,7 @@ class ListCommand(ExpressionCommand):
         return True
 
     def usage(self):
-        return """Synopsis: ls [-x] [-s <SORT EXPRESSION>]
+        return """Synopsis: ls [-x] [-A] [-s <SORT EXPRESSION>]
 [-g <GROUP EXPRESSION>] [-f <OUTPUT FORMAT>] [-F <FORMAT STRING>]
 [-i <NUMBER 1>[,<NUMBER 2> ...]] [-N | -n <INTEGER>] [EXPRESSION]"""
 
@@ -224,8 +262,11 @@ Lists all relevant todos. A todo is relevant when:
 
 When an EXPRESSION is given, only the todos matching that EXPRESSION are shown.
 
--f : Specify the OUTPUT format, being 'text' (default), 'dot' or 'ical' or
-     'json'.
+-A : Search the archive (done.txt) instead of the todo list. An index of the
+     archive is maintained next to it, such that large archives can be searched
+     quickly. Implies -x.
+-f : Specify the OUTPUT format, being 'text' (default), 'dot', 'ical',
+     'ical-export', 'json' or 'ndjson'.
 
      * 'text' - Text output with colors and indentation if applicable.
      * 'dot'  - Prints a dependency graph for the selected items in GraphViz
@@ -234,7 +275,14 @@ When an EXPRESSION is given, only the todos matching that EXPRESSION are shown.
                 that this is not a read-only operation, todo items may obtain
                 an 'ical' tag with a unique ID. Completed todo items may be
                 archived.
+     * 'ical-export' - Like 'ical', but todo items are not modified. Todo
+                       items without an 'ical' tag get a UID based on their
+                       creation date and text. Converted items are cached
+                       next to the todo file, such that repeated exports
+                       only convert the items that changed.
      * 'json' - Javascript Object Notation (JSON)
+     * 'ndjson' - Newline delimited JSON, one JSON object per todo item on
+                  each line.
 
 -F : Specify the format of the text ('text' format), which may contain
      placeholders that may be expanded if the todo has such attribute. If such
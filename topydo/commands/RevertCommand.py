@@ -14,8 +14,6 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import arrow
-
 from topydo.lib import TodoFile, TodoList
 from topydo.lib.ChangeSet import ChangeSet
 from topydo.lib.Command import Command, InvalidCommandArgument
@@ -95,6 +93,8 @@ class RevertCommand(Command):
             self.error(self.usage())
 
     def _handle_ls(self):
+        import arrow
+
         num = 1
         for timestamp, change in self._backup:
             label = change[2]
@@ -74,6 +74,7 @@ class _Config:
                 'identifier_alphabet': '0123456789abcdefghijklmnopqrstuvwxyz',
                 'backup_count': '5',
                 'auto_delete_whitespace': '1',
+                'parse_cache': '0',
             },
 
             'add': {
@@ -132,6 +133,7 @@ class _Config:
 
             'columns': {
                 'column_width': '40',
+                'widget_cache_size': '1000',
             },
 
             'column_keymap': {
@@ -268,6 +270,12 @@ class _Config:
         except ValueError:
             return self.defaults['topydo']['auto_delete_whitespace'] == '1'
 
+    def parse_cache(self):
+        try:
+            return self.cp.getboolean('topydo', 'parse_cache')
+        except ValueError:
+            return self.defaults['topydo']['parse_cache'] == '1'
+
     def list_limit(self):
         try:
             return self.cp.getint('ls', 'list_limit')
@@ -444,6 +452,22 @@ class _Config:
         except ValueError:
             return int(self.defaults['columns']['column_width'])
 
+    def widget_cache_size(self):
+        """
+        Returns the maximum number of todo widgets kept around for reuse in
+        column mode.
+        """
+        try:
+            size = self.cp.getint('columns', 'widget_cache_size')
+
+            if size < 1:
+                # read default
+                raise ValueError
+
+            return size
+        except ValueError:
+            return int(self.defaults['columns']['widget_cache_size'])
+
     @lru_cache(maxsize=1)
     def column_keymap(self):
         """ Returns keymap and keystates used in column mode """
@@ -36,6 +36,8 @@ class DCommand(MultiCommand):
 
         self.force = False
         self._delta = []
+        self._processed = set()  # todo items completed or deleted
+        self._added = []  # todo items added by the command (recurrences)
         self.condition = lambda _: True
         self.condition_failed_text = ""
 
@@ -74,6 +76,7 @@ class DCommand(MultiCommand):
             if not self.force and re.match('^y(es)?$', confirmation, re.I):
                 for child in children:
                     self.execute_specific_core(child)
+                    self._processed.add(child)
                     self.out(self.prefix() + self.printer.print_todo(child))
 
     def _print_unlocked_todos(self):
@@ -81,18 +84,30 @@ class DCommand(MultiCommand):
             self.out("The following todo item(s) became active:")
             self._print_list(self._delta)
 
-    def _active_todos(self):
+    def _is_active(self, p_todo):
         """
-        Returns a list of active todos, taking uncompleted subtodos into
-        account.
+        Returns True when the todo item is active and has no uncompleted
+        subtodos.
+        """
+        return p_todo.is_active() and all(
+            child.is_completed() for child in self.todolist.children(p_todo))
 
-        The stored length of the todolist is taken into account, to prevent new
-        todos created by recurrence to pop up as newly activated tasks.
-        Since these todos pop up at the end of the list, we cut off the list
-        just before that point.
+    def _candidates(self):
+        """
+        Returns the todo items that may become active by completing or
+        deleting the todo items to operate on, together with their subtodos:
+        the todo items depending on them.
         """
-        return [todo for todo in self.todolist.todos()
-                if not self._uncompleted_children(todo) and todo.is_active()]
+        candidates = set()
+
+        for todo in self.todos:
+            candidates.update(self.todolist.parents(todo))
+
+            for child in self.todolist.children(todo):
+                if not child.is_completed():
+                    candidates.update(self.todolist.parents(child))
+
+        return candidates
 
     def execute_specific(self, _):
         raise NotImplementedError
@@ -105,18 +120,21 @@ class DCommand(MultiCommand):
         raise NotImplementedError
 
     def _execute_multi_specific(self):
-        old_active = self._active_todos()
+        candidates = self._candidates()
+        old_active = {todo for todo in candidates if self._is_active(todo)}
 
         for todo in self.todos:
             if todo and self.condition(todo):
                 self._process_subtasks(todo)
                 self.execute_specific(todo)
+                self._processed.add(todo)
             else:
                 self.error(self.condition_failed_text)
 
-        current_active = self._active_todos()
-        self._delta = [todo for todo in current_active
-                       if todo not in old_active]
+        candidates = (candidates | set(self._added)) - self._processed
+        self._delta = sorted((todo for todo in candidates - old_active
+                              if self._is_active(todo)),
+                             key=self.todolist.linenumber)
 
     def execute_post_archive_actions(self):
         self._print_unlocked_todos()
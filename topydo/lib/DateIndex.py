@@ -0,0 +1,99 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+An index of todo items sorted by a date, such that date comparisons can be
+answered with a range lookup.
+"""
+
+from bisect import bisect_left, insort
+from math import inf
+
+from topydo.lib.TodoIndex import TodoIndex
+
+
+class DateIndex(TodoIndex):
+    """
+    Keeps todo items sorted on the date returned by a getter function.
+
+    The getter returns None for todo items that should not be indexed (they
+    never match a date comparison). It raises a ValueError for todo items that
+    cannot be compared on a date, but may match otherwise. Those are returned
+    by every lookup.
+    """
+
+    def __init__(self, p_getter):
+        self._getter = p_getter
+        super().__init__()
+
+    def _reset(self):
+        self._keys = []  # sorted list of (date, id(todo))
+        self._todos = {}  # id(todo) => todo
+        self._indexed = {}  # todo => key in self._keys
+        self._irregular = set()
+
+    def _index(self, p_todo):
+        try:
+            date = self._getter(p_todo)
+        except ValueError:
+            self._irregular.add(p_todo)
+            return
+
+        if date:
+            key = (date, id(p_todo))
+            insort(self._keys, key)
+            self._todos[id(p_todo)] = p_todo
+            self._indexed[p_todo] = key
+
+    def _unindex(self, p_todo):
+        self._irregular.discard(p_todo)
+
+        try:
+            key = self._indexed.pop(p_todo)
+        except KeyError:
+            return
+
+        del self._keys[bisect_left(self._keys, key)]
+        del self._todos[id(p_todo)]
+
+    def todos_by_date(self, p_todos, p_operator, p_date):
+        """
+        Returns the set of todo items whose date compares to p_date according
+        to p_operator (one of <, <=, =, >=, > and !).
+
+        p_todos should be the complete list of todo items that is indexed.
+        """
+        self._refresh(p_todos)
+
+        keys = self._keys
+        low = bisect_left(keys, (p_date, ))
+        high = bisect_left(keys, (p_date, inf))
+
+        ranges = {
+            '<': [(0, low)],
+            '<=': [(0, high)],
+            '=': [(low, high)],
+            '>=': [(low, len(keys))],
+            '>': [(high, len(keys))],
+            '!': [(0, low), (high, len(keys))],
+        }
+
+        result = set(self._irregular)
+
+        for start, end in ranges.get(p_operator, []):
+            result.update(self._todos[key[1]] for key in keys[start:end])
+
+        return result
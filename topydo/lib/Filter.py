@@ -14,6 +14,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import operator
 import re
 
 from topydo.lib.Config import config
@@ -32,10 +33,34 @@ class Filter(object):
     def match(self, _):
         raise NotImplementedError
 
+    def compile(self):
+        """
+        Returns a function that matches a single todo item. Used by
+        compile_filters to evaluate a chain of filters in a single pass.
+        """
+        return self.match
+
+    def candidates(self, _):
+        """
+        Returns the set of todo items of the given todo list that may match
+        this filter, as far as the indexes of the todo list can tell. Returns
+        None when the indexes can't narrow down the todo items for this filter.
+        """
+        return None
+
     @property
     def order(self):
         return 50
 
+    @property
+    def cost(self):
+        """
+        A rough estimate of the cost of a single match. Cheap filters are
+        evaluated first, such that expensive filters only see the todo items
+        that passed the cheap ones.
+        """
+        return 50
+
 
 class NegationFilter(Filter):
     def __init__(self, p_filter):
@@ -44,6 +69,20 @@ class NegationFilter(Filter):
     def match(self, p_todo):
         return not self._filter.match(p_todo)
 
+    def compile(self):
+        match = self._filter.compile()
+        return lambda t: not match(t)
+
+    @property
+    def cost(self):
+        return self._filter.cost
+
+
+def _by_cost(p_filter1, p_filter2):
+    """ Returns the compiled versions of both filters, cheapest first. """
+    first, second = sorted((p_filter1, p_filter2), key=lambda f: f.cost)
+    return first.compile(), second.compile()
+
 
 class AndFilter(Filter):
     def __init__(self, p_filter1, p_filter2):
@@ -53,6 +92,25 @@ class AndFilter(Filter):
     def match(self, p_todo):
         return self._filter1.match(p_todo) and self._filter2.match(p_todo)
 
+    def compile(self):
+        match1, match2 = _by_cost(self._filter1, self._filter2)
+        return lambda t: match1(t) and match2(t)
+
+    def candidates(self, p_todolist):
+        todos1 = self._filter1.candidates(p_todolist)
+        todos2 = self._filter2.candidates(p_todolist)
+
+        if todos1 is None:
+            return todos2
+        elif todos2 is None:
+            return todos1
+
+        return todos1 & todos2
+
+    @property
+    def cost(self):
+        return self._filter1.cost + self._filter2.cost
+
 
 class OrFilter(Filter):
     def __init__(self, p_filter1, p_filter2):
@@ -62,6 +120,23 @@ class OrFilter(Filter):
     def match(self, p_todo):
         return self._filter1.match(p_todo) or self._filter2.match(p_todo)
 
+    def compile(self):
+        match1, match2 = _by_cost(self._filter1, self._filter2)
+        return lambda t: match1(t) or match2(t)
+
+    def candidates(self, p_todolist):
+        todos1 = self._filter1.candidates(p_todolist)
+        todos2 = self._filter2.candidates(p_todolist)
+
+        if todos1 is None or todos2 is None:
+            return None
+
+        return todos1 | todos2
+
+    @property
+    def cost(self):
+        return self._filter1.cost + self._filter2.cost
+
 
 class GrepFilter(Filter):
     """ Matches when the todo text contains a text. """
@@ -80,14 +155,37 @@ class GrepFilter(Filter):
             self.case_sensitive = \
                 len([c for c in self.expression if c.isupper()]) > 0
 
+        self._expression = self.expression if self.case_sensitive \
+            else self.expression.lower()
+
     def match(self, p_todo):
-        expr = self.expression
-        string = p_todo.source()
-        if not self.case_sensitive:
-            expr = expr.lower()
-            string = string.lower()
+        if self.case_sensitive:
+            string = p_todo.source()
+        else:
+            string = p_todo.lowercase_source()
+
+        return self._expression in string
+
+    def candidates(self, p_todolist):
+        if self.case_sensitive:
+            return None
+
+        return p_todolist.todos_containing(self._expression)
+
+    @property
+    def cost(self):
+        return 60
 
-        return string.find(expr) != -1
+
+def grep_texts(p_filters):
+    """
+    Returns the lowercase expressions of the case insensitive GrepFilters in
+    the given list of filters. A todo item passing all filters must contain
+    each of these texts in its lowercase source, which search indexes use to
+    narrow down the candidates.
+    """
+    return [f.expression.lower() for f in p_filters
+            if isinstance(f, GrepFilter) and not f.case_sensitive]
 
 
 class RelevanceFilter(Filter):
@@ -118,6 +216,10 @@ class RelevanceFilter(Filter):
         """
         return 20
 
+    @property
+    def cost(self):
+        return 30
+
 
 class DependencyFilter(Filter):
     """ Matches when a todo has no unfinished child tasks.  """
@@ -149,6 +251,11 @@ class DependencyFilter(Filter):
         """
         return 10
 
+    @property
+    def cost(self):
+        """ Looking up the children requires a traversal of the graph. """
+        return 90
+
 
 class InstanceFilter(Filter):
     def __init__(self, p_todos):
@@ -173,6 +280,10 @@ class InstanceFilter(Filter):
         except ValueError:
             return False
 
+    @property
+    def cost(self):
+        return 70
+
 
 class HiddenTagFilter(Filter):
     def __init__(self):
@@ -195,6 +306,10 @@ class HiddenTagFilter(Filter):
 
         return True
 
+    @property
+    def cost(self):
+        return 30
+
 
 class LimitFilter(Filter):
     def __init__(self, p_limit):
@@ -212,6 +327,16 @@ class LimitFilter(Filter):
 _OPERATOR_MATCH = r"(?P<operator><=?|=|>=?|!)?"
 
 
+_OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '=': operator.eq,
+    '>=': operator.ge,
+    '>': operator.gt,
+    '!': operator.ne,
+}
+
+
 class OrdinalFilter(Filter):
     """ Base class for ordinal filters. """
 
@@ -219,6 +344,9 @@ class OrdinalFilter(Filter):
         super().__init__()
 
         self.expression = p_expression
+        self.key = None
+        self.operator = '='
+        self.value = ''
 
         match = re.match(p_pattern, self.expression)
         if match:
@@ -229,25 +357,40 @@ class OrdinalFilter(Filter):
             self.operator = match.group('operator') or '='
             self.value = match.group('value')
 
+        self._compare = _OPERATORS.get(self.operator)
+
     def compare_operands(self, p_operand1, p_operand2):
         """
         Returns True if conditional constructed from both operands and
         self.operator is valid. Returns False otherwise.
         """
-        if self.operator == '<':
-            return p_operand1 < p_operand2
-        elif self.operator == '<=':
-            return p_operand1 <= p_operand2
-        elif self.operator == '=':
-            return p_operand1 == p_operand2
-        elif self.operator == '>=':
-            return p_operand1 >= p_operand2
-        elif self.operator == '>':
-            return p_operand1 > p_operand2
-        elif self.operator == '!':
-            return p_operand1 != p_operand2
-
-        return False
+        return bool(self._compare and self._compare(p_operand1, p_operand2))
+
+
+def _resolve_date(p_value):
+    """
+    Converts a relative or absolute date in a filter expression to a date
+    object. Raises a ValueError when the value is not a date.
+    """
+    return relative_date_to_date(p_value) or date_string_to_date(p_value)
+
+
+def _tag_date_getter(p_key):
+    """
+    Returns a getter for a DateIndex on the date in the tag with the given key.
+    Todo items where the tag appears more than once or doesn't contain a date
+    may still match an OrdinalTagFilter, by falling back to a numerical
+    comparison or a grep.
+    """
+    def getter(p_todo):
+        values = p_todo.tag_values(p_key)
+
+        if len(values) > 1:
+            raise ValueError
+
+        return date_string_to_date(values[0]) if values else None
+
+    return getter
 
 _VALUE_MATCH = r"(?P<value>\S+)"
 _ORDINAL_TAG_MATCH = r"(?P<key>[^:]*):" + _OPERATOR_MATCH + _VALUE_MATCH
@@ -257,6 +400,18 @@ class OrdinalTagFilter(OrdinalFilter):
     def __init__(self, p_expression):
         super().__init__(p_expression, _ORDINAL_TAG_MATCH)
 
+        self._grep = GrepFilter(p_expression)
+
+        try:
+            self._date = _resolve_date(self.value)
+        except ValueError:
+            self._date = None
+
+        try:
+            self._number = int(self.value)
+        except ValueError:
+            self._number = None
+
     def match(self, p_todo):
         """
         Performs a match on a key:value tag in the todo.
@@ -271,8 +426,7 @@ class OrdinalTagFilter(OrdinalFilter):
         user given expression is contained in the todo text.
         """
         def resort_to_grep_filter():
-            grep = GrepFilter(self.expression)
-            return grep.match(p_todo)
+            return self._grep.match(p_todo)
 
         if not self.key or not p_todo.has_tag(self.key):
             return False
@@ -282,43 +436,67 @@ class OrdinalTagFilter(OrdinalFilter):
             # in this todo item, therefore use a simple value match
             return resort_to_grep_filter()
 
-        try:
-            operand1 = date_string_to_date(p_todo.tag_value(self.key))
-            operand2 = relative_date_to_date(self.value)
-
-            if not operand2:
-                operand2 = date_string_to_date(self.value)
+        value = p_todo.tag_value(self.key)
 
+        try:
+            operand1 = date_string_to_date(value)
         except ValueError:
-            operand1 = p_todo.tag_value(self.key)
-            operand2 = self.value
+            operand1 = None
 
+        if operand1 and self._date:
+            return self.compare_operands(operand1, self._date)
+
+        if self._number is not None:
             try:
-                operand1 = int(operand1)
-                operand2 = int(operand2)
+                return self.compare_operands(int(value), self._number)
             except ValueError:
-                return resort_to_grep_filter()
+                pass
 
-        return self.compare_operands(operand1, operand2)
+        return resort_to_grep_filter()
+
+    def candidates(self, p_todolist):
+        if not self.key or not self._date:
+            return None
+
+        return p_todolist.todos_by_date(('tag', self.key),
+                                        _tag_date_getter(self.key),
+                                        self.operator, self._date)
+
+    @property
+    def cost(self):
+        return 40
 
 
 class _DateAttributeFilter(OrdinalFilter):
-    def __init__(self, p_expression, p_match, p_getter):
+    def __init__(self, p_expression, p_match, p_key, p_getter):
         super().__init__(p_expression, p_match)
+        self.key = p_key
         self.getter = p_getter
 
+        try:
+            self._date = _resolve_date(self.value)
+        except ValueError:
+            self._date = None
+
     def match(self, p_todo):
         operand1 = self.getter(p_todo)
-        operand2 = relative_date_to_date(self.value)
-
-        if not operand2:
-            operand2 = date_string_to_date(self.value)
 
-        if operand1 and operand2:
-            return self.compare_operands(operand1, operand2)
+        if operand1 and self._date:
+            return self.compare_operands(operand1, self._date)
         else:
             return False
 
+    def candidates(self, p_todolist):
+        if not self._date:
+            return set()
+
+        return p_todolist.todos_by_date(self.key, self.getter, self.operator,
+                                        self._date)
+
+    @property
+    def cost(self):
+        return 20
+
 
 _CREATED_MATCH = r'creat(ion|ed?):' + _OPERATOR_MATCH + _VALUE_MATCH
 
@@ -328,6 +506,7 @@ class CreationFilter(_DateAttributeFilter):
         super().__init__(
             p_expression,
             _CREATED_MATCH,
+            'creation',
             lambda t: t.creation_date()  # pragma: no branch
         )
 
@@ -340,6 +519,7 @@ class CompletionFilter(_DateAttributeFilter):
         super().__init__(
             p_expression,
             _COMPLETED_MATCH,
+            'completion',
             lambda t: t.completion_date()  # pragma: no branch
         )
 
@@ -367,6 +547,10 @@ class PriorityFilter(OrdinalFilter):
 
         return self.compare_operands(operand1, operand2)
 
+    @property
+    def cost(self):
+        return 10
+
 MATCHES = [
     (_CREATED_MATCH, CreationFilter),
     (_COMPLETED_MATCH, CompletionFilter),
@@ -402,3 +586,70 @@ def get_filter_list(p_expression):
         result.append(argfilter)
 
     return result
+
+
+def _conjunction(p_filters, p_evaluation=None):
+    """
+    Returns a function that matches a todo item when all given filters match,
+    evaluating the cheapest filters first.
+    """
+    filters = sorted(p_filters, key=lambda f: f.cost)
+
+    if p_evaluation:
+        predicates = [p_evaluation.memoize(f, f.compile()) for f in filters]
+    else:
+        predicates = [f.compile() for f in filters]
+
+    if len(predicates) == 1:
+        return predicates[0]
+
+    def match_all(p_todo):
+        for predicate in predicates:
+            if not predicate(p_todo):
+                return False
+
+        return True
+
+    return match_all
+
+
+def compile_filters(p_filters, p_evaluation=None):
+    """
+    Compiles a list of filters to a single function that filters a list of
+    todo items.
+
+    Consecutive filters (in the order of their 'order' property) that match
+    individual todo items are combined into a single predicate, such that the
+    list is traversed only once. Filters that operate on the list as a whole
+    (e.g. the LimitFilter) are applied in between, in their original order.
+
+    When a SharedEvaluation is given, matches of individual todo items are
+    taken from it.
+    """
+    stages = []
+    pending = []
+
+    def add_predicate_stage():
+        if pending:
+            predicate = _conjunction(pending, p_evaluation)
+            stages.append(lambda todos: [t for t in todos if predicate(t)])
+            pending.clear()
+
+    for _filter in sorted(p_filters, key=lambda f: f.order):
+        if type(_filter).filter is Filter.filter:
+            pending.append(_filter)
+        else:
+            add_predicate_stage()
+            stages.append(_filter.filter)
+
+    add_predicate_stage()
+
+    def apply_filters(p_todos):
+        result = p_todos
+
+        for stage in stages:
+            result = stage(result)
+
+        return result
+
+    return apply_filters
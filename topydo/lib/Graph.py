@@ -25,12 +25,14 @@ class DirectedGraph(object):
 
     def __init__(self):
         self._edges = {}
+        self._incoming = {}  # node => set of nodes with an edge to it
         self._edge_numbers = {}
 
     def add_node(self, p_id):
         """ Adds a node to the graph. """
         if not self.has_node(p_id):
             self._edges[p_id] = set()
+            self._incoming[p_id] = set()
 
     def has_node(self, p_id):
         """ Returns true iff the graph has the given node. """
@@ -50,6 +52,7 @@ class DirectedGraph(object):
                 self.add_node(p_to)
 
             self._edges[p_from].add(p_to)
+            self._incoming[p_to].add(p_from)
             self._edge_numbers[(p_from, p_to)] = p_id
 
     def has_path(self, p_from, p_to):
@@ -90,15 +93,11 @@ class DirectedGraph(object):
 
             visited.add(current)
 
-            if p_reverse:
-                parents = [node for node, neighbors in self._edges.items()
-                           if current in neighbors]
+            neighbors = self._incoming[current] if p_reverse \
+                else self._edges[current]
 
-                stack = stack + parents
-                result = result.union(parents)
-            else:
-                stack = stack + list(self._edges[current])
-                result = result.union(self._edges[current])
+            stack.extend(neighbors)
+            result.update(neighbors)
 
             if not p_recursive:
                 break
@@ -115,11 +114,15 @@ class DirectedGraph(object):
             for neighbor in self.incoming_neighbors(p_id):
                 self._edges[neighbor].remove(p_id)
 
+            for neighbor in self._edges[p_id]:
+                self._incoming[neighbor].remove(p_id)
+
             neighbors = set()
             if remove_unconnected_nodes:
                 neighbors = self.outgoing_neighbors(p_id)
 
             del self._edges[p_id]
+            del self._incoming[p_id]
 
             for neighbor in neighbors:
                 if self.is_isolated(neighbor):
@@ -162,6 +165,7 @@ class DirectedGraph(object):
         """
         if self.has_edge(p_from, p_to):
             self._edges[p_from].remove(p_to)
+            self._incoming[p_to].remove(p_from)
 
         try:
             del self._edge_numbers[(p_from, p_to)]
@@ -17,8 +17,8 @@
 """ Utilities for formatting output with "list_format" option."""
 
 import re
-
-import arrow
+from datetime import date
+from functools import lru_cache
 
 from topydo.lib.Config import config
 from topydo.lib.ProgressColor import progress_color
@@ -54,7 +54,7 @@ def humanize_dates(p_due=None, p_start=None, p_creation=None):
     if p_due:
         dates_list.append('due ' + humanize_date(p_due))
     if p_start:
-        now = arrow.now().date()
+        now = date.today()
         dates_list.append('{} {}'.format(
             'started' if p_start <= now else 'starts',
             humanize_date(p_start)
@@ -62,28 +62,6 @@ def humanize_dates(p_due=None, p_start=None, p_creation=None):
 
     return ', '.join(dates_list)
 
-def _strip_placeholder_braces(p_matchobj):
-    """
-    Returns string with conditional braces around placeholder stripped and
-    percent sign glued into placeholder character.
-
-    Returned string is composed from 'start', 'before', 'placeholder', 'after',
-    'whitespace', and 'end' match-groups of p_matchobj. Conditional braces are
-    stripped from 'before' and 'after' groups. 'whitespace', 'start', and 'end'
-    groups are preserved without any change.
-
-    Using this function as an 'repl' argument in re.sub it is possible to turn:
-        %{(}B{)}
-    into:
-        (%B)
-    """
-    before = p_matchobj.group('before') or ''
-    placeholder = p_matchobj.group('placeholder')
-    after = p_matchobj.group('after') or ''
-    whitespace = p_matchobj.group('whitespace') or ''
-
-    return before + '%' + placeholder + after + whitespace
-
 def _unescape_percent_sign(p_str):
     """ Strips backslashes from escaped percent signs in p_str. """
     unescaped_str = re.sub(r'\\%', '%', p_str)
@@ -124,6 +102,64 @@ def _right_align(p_str):
 
     return p_str
 
+@lru_cache(maxsize=32)
+def _compile_format(p_format_string, p_placeholders):
+    """
+    Compiles a format string into a list of tuples, one for each placeholder,
+    and returns it together with a flag whether the output should fit on a
+    single line (the %S placeholder is used).
+
+    The format string is split on each placeholder, each tuple contains the
+    placeholder name, the substring to use when the placeholder is empty, and
+    the substrings to put before and after the content of the placeholder
+    otherwise. The first tuple never contains a real placeholder (read re.split
+    documentation for further information). Placeholders which are not in
+    p_placeholders are removed. When a placeholder can't be parsed, the empty
+    substring is None.
+
+    The result is cached per format string, such that the format string is
+    only parsed once.
+    """
+    format_split = re.split(r'(?<!\\)%', p_format_string)
+    compiled_format = []
+    one_line = False
+
+    for idx, substr in enumerate(format_split):
+        placeholder = None
+
+        if idx > 0:
+            pattern = MAIN_PATTERN.format(ph=r'\S')
+            try:
+                placeholder = re.match(pattern, substr).group('placeholder').strip('[]')
+            except AttributeError:
+                pass
+
+            if placeholder == 'S':
+                one_line = True
+
+            if placeholder not in p_placeholders:
+                substr = re.sub(pattern, '', substr)
+
+        try:
+            pattern = re.compile(MAIN_PATTERN.format(ph=placeholder))
+        except re.error:
+            compiled_format.append((placeholder, None, None, None))
+            continue
+
+        empty = pattern.sub('', substr)
+        before = after = ''
+
+        match = pattern.match(substr)
+        if match:
+            before = match.group('before') or ''
+            after = (match.group('after') or '') + match.group('whitespace') + \
+                substr[match.end():]
+
+        compiled_format.append((placeholder, empty, before, after))
+
+    return compiled_format, one_line
+
+
 def color_block(p_todo):
     return '{} {}'.format(
         progress_color(p_todo).as_ansi(p_background=True),
@@ -220,88 +256,47 @@ class ListFormatParser(object):
 
             'z': lambda t: color_block(t) if config().colors() else ' ',
         }
-        self.format_list = self._preprocess_format()
-
-    def _preprocess_format(self):
-        """
-        Preprocess the format_string attribute.
-
-        Splits the format string on each placeholder and returns a list of
-        tuples containing substring, placeholder name, and function
-        retrieving content for placeholder (getter).
-
-        Relevant placeholder functions (getters) are taken from
-        'placeholders' attribute which is a dict. If no matching placeholder
-        is found in 'placeholders' getter is set to None. Getter and
-        placeholder are also always set to None in first element of the
-        returned list, because it never contain a real placeholder (read
-        re.split documentation for further information).
-        """
-        format_split = re.split(r'(?<!\\)%', self.format_string)
-        preprocessed_format = []
-
-        for idx, substr in enumerate(format_split):
-            if idx == 0:
-                getter = None
-                placeholder = None
-            else:
-                pattern = MAIN_PATTERN.format(ph=r'\S')
-                try:
-                    placeholder = re.match(pattern, substr).group('placeholder').strip('[]')
-                except AttributeError:
-                    placeholder = None
-
-                if placeholder == 'S':
-                    self.one_line = True
-
-                try:
-                    getter = self.placeholders[placeholder]
-                except KeyError:
-                    getter = None
-                    substr = re.sub(pattern, '', substr)
-
-            format_elem = (substr, placeholder, getter)
-            preprocessed_format.append(format_elem)
-
-        return preprocessed_format
+        self.format_list, self.one_line = _compile_format(
+            self.format_string, frozenset(self.placeholders))
 
     def parse(self, p_todo):
         """
         Returns fully parsed string from 'format_string' attribute with all
         placeholders properly substituted by content obtained from p_todo.
 
-        It uses preprocessed form of 'format_string' (result of
-        ListFormatParser._preprocess_format) stored in 'format_list'
-        attribute.
+        It uses the compiled form of 'format_string' (see _compile_format)
+        stored in 'format_list' attribute.
         """
         parsed_list = []
         repl_trunc = None
 
-        for substr, placeholder, getter in self.format_list:
+        for placeholder, empty, before, after in self.format_list:
+            if empty is None:
+                raise ListFormatError
+
+            getter = self.placeholders.get(placeholder)
             repl = getter(p_todo) if getter else ''
-            pattern = MAIN_PATTERN.format(ph=placeholder)
 
             if placeholder == 'S':
                 repl_trunc = repl
 
-            try:
-                if repl == '':
-                    substr = re.sub(pattern, '', substr)
-                else:
-                    substr = re.sub(pattern, _strip_placeholder_braces, substr)
-                    substr = re.sub(r'(?<!\\)%({ph}|\[{ph}\])'.format(ph=placeholder), repl, substr)
-            except re.error:
-                raise ListFormatError
+            if repl == '':
+                parsed_list.append(empty)
+            else:
+                parsed_list += [before, repl, after]
+
+        parsed_str = ''.join(parsed_list)
 
-            parsed_list.append(substr)
+        if '\\%' in parsed_str:
+            parsed_str = _unescape_percent_sign(parsed_str)
 
-        parsed_str = _unescape_percent_sign(''.join(parsed_list))
-        parsed_str = _remove_redundant_spaces(parsed_str)
+        if '\t' in parsed_str:
+            parsed_str = _remove_redundant_spaces(parsed_str)
 
         if self.one_line and len(escape_ansi(parsed_str)) >= _columns():
             parsed_str = _truncate(parsed_str, repl_trunc)
 
-        if re.search('.*\t', parsed_str):
+        if '\t' in parsed_str:
             parsed_str = _right_align(parsed_str)
 
         return parsed_str.rstrip()
@@ -31,6 +31,7 @@ class MultiCommand(ExpressionCommand):
             p_args, p_todolist, p_out, p_err, p_prompt)
 
         self.todos = []
+        self._given_todos = None
         self.invalid_numbers = []
         self.is_expression = False
         self.multi_mode = True
@@ -61,9 +62,19 @@ class MultiCommand(ExpressionCommand):
     def get_todos_from_expr(self):
         self.todos = self._view().todos
 
+    def set_todos(self, p_todos):
+        """
+        Lets the command operate on the given todo items, which the caller
+        already looked up (e.g. the marked items in the column UI). The todo
+        IDs in the arguments are not resolved again.
+        """
+        self._given_todos = list(p_todos)
+
     def get_todos(self):
         """ Gets todo objects from supplied todo IDs. """
-        if self.is_expression:
+        if self._given_todos is not None:
+            self.todos = self._given_todos
+        elif self.is_expression:
             self.get_todos_from_expr()
         else:
             if self.last_argument:
@@ -103,6 +103,23 @@ def _convert_weekday_pattern(p_weekday):
     return date.today() + timedelta(shift)
 
 
+_RELATIVE_MATCH = re.compile('(?P<length>-?[0-9]+)(?P<period>[dwmyb])$', re.I)
+
+_WEEKDAY_MATCH = re.compile('|'.join([
+    'mo(n(day)?)?$',
+    'tu(e(sday)?)?$',
+    'we(d(nesday)?)?$',
+    'th(u(rsday)?)?$',
+    'fr(i(day)?)?$',
+    'sa(t(urday)?)?$',
+    'su(n(day)?)?$',
+]))
+
+_TODAY_MATCH = re.compile('tod(ay)?$')
+_TOMORROW_MATCH = re.compile('tom(orrow)?$')
+_YESTERDAY_MATCH = re.compile('yes(terday)?$')
+
+
 def relative_date_to_date(p_date, p_offset=None):
     """
     Transforms a relative date into a date object.
@@ -117,20 +134,8 @@ def relative_date_to_date(p_date, p_offset=None):
     p_date = p_date.lower()
     p_offset = p_offset or date.today()
 
-    relative = re.match('(?P<length>-?[0-9]+)(?P<period>[dwmyb])$',
-                        p_date, re.I)
-
-    monday = 'mo(n(day)?)?$'
-    tuesday = 'tu(e(sday)?)?$'
-    wednesday = 'we(d(nesday)?)?$'
-    thursday = 'th(u(rsday)?)?$'
-    friday = 'fr(i(day)?)?$'
-    saturday = 'sa(t(urday)?)?$'
-    sunday = 'su(n(day)?)?$'
-
-    weekday = re.match('|'.join(
-        [monday, tuesday, wednesday, thursday, friday, saturday, sunday]),
-        p_date)
+    relative = _RELATIVE_MATCH.match(p_date)
+    weekday = _WEEKDAY_MATCH.match(p_date)
 
     if relative:
         length = relative.group('length')
@@ -140,13 +145,13 @@ def relative_date_to_date(p_date, p_offset=None):
     elif weekday:
         result = _convert_weekday_pattern(weekday.group(0))
 
-    elif re.match('tod(ay)?$', p_date):
+    elif _TODAY_MATCH.match(p_date):
         result = _convert_pattern('0', 'd')
 
-    elif re.match('tom(orrow)?$', p_date):
+    elif _TOMORROW_MATCH.match(p_date):
         result = _convert_pattern('1', 'd')
 
-    elif re.match('yes(terday)?$', p_date):
+    elif _YESTERDAY_MATCH.match(p_date):
         result = _convert_pattern('-1', 'd')
 
     return result
@@ -0,0 +1,99 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Values derived from todo items, shared by multiple views on the same todo list.
+"""
+
+
+class SharedEvaluation(object):
+    """
+    Remembers the values that views compute for each todo item, such as
+    filter matches and sort keys (importance, dates, etc.). Views sharing an
+    instance compute each value only once per todo item, until the todo list
+    changes.
+
+    Values are identified by a key, usually the filter or the sort function
+    computing them. Views only share values when they use the same filter
+    instances or sort functions.
+    """
+
+    def __init__(self, p_todolist):
+        self.todolist = p_todolist
+        self._generation = 0
+        self._state = None
+        self._values = {}  # key => {todo => value}
+
+    def state(self):
+        """
+        Returns a value that changes whenever the values computed before may
+        have become invalid.
+        """
+        return (self._generation, self.todolist.revision)
+
+    def clear(self):
+        """
+        Discards all values, for changes that the todo list doesn't know
+        about (e.g. relative dates at midnight).
+        """
+        self._generation += 1
+
+    def apply_changes(self, p_changes):
+        """
+        Only discards the values of the todo items in the given
+        TodoListChanges, the values of the other items remain valid. When
+        values were computed before the changes started, or when the todo
+        list changed otherwise, all values are discarded on the next
+        evaluation.
+        """
+        generation, revision = self.state()
+
+        if p_changes.reset or self._state is None:
+            return
+
+        if self._state[0] == generation and \
+                self._state[1] >= p_changes.revision:
+            for todo in p_changes.affected():
+                for values in self._values.values():
+                    values.pop(todo, None)
+
+            self._state = (generation, revision)
+
+    def memoize(self, p_key, p_function):
+        """
+        Returns a function that returns the value of p_function for a todo
+        item, which is only computed when it isn't known for p_key yet.
+
+        The returned function should only be used while the todo list doesn't
+        change, i.e. during the evaluation of a view.
+        """
+        state = self.state()
+
+        if state != self._state:
+            self._values = {}
+            self._state = state
+
+        values = self._values.setdefault(p_key, {})
+
+        def memoized(p_todo):
+            try:
+                return values[p_todo]
+            except KeyError:
+                value = p_function(p_todo)
+                values[p_todo] = value
+                return value
+
+        return memoized
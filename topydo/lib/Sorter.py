@@ -111,10 +111,17 @@ FIELD_MAP = {
     'text': 'text',
 }
 
-def _apply_sort_functions(p_todos, p_functions):
+# tag name => Field, such that sorters on the same tag share their functions
+# (and thereby their values in a SharedEvaluation)
+_TAG_FIELDS = {}
+
+def _apply_sort_functions(p_todos, p_functions, p_evaluation=None):
     sorted_todos = p_todos
 
     for function, order in reversed(p_functions):
+        if p_evaluation:
+            function = p_evaluation.memoize(function, function)
+
         sorted_todos = sorted(sorted_todos, key=function,
                               reverse=(order == 'desc'))
 
@@ -186,11 +193,14 @@ class Sorter(object):
                     return compose(FIELDS[FIELD_MAP[p_field]])
                 else:
                     # treat it as a tag value
-                    return compose(Field(
-                        sort=lambda t: '0' + t.tag_value(p_field) if t.has_tag(p_field) else '1',
-                        group=group_value,
-                        label=p_field,
-                    ))
+                    if p_field not in _TAG_FIELDS:
+                        _TAG_FIELDS[p_field] = Field(
+                            sort=lambda t: '0' + t.tag_value(p_field) if t.has_tag(p_field) else '1',
+                            group=group_value,
+                            label=p_field,
+                        )
+
+                    return compose(_TAG_FIELDS[p_field])
 
             result = []
             fields = p_string.lower().split(',')
@@ -223,7 +233,7 @@ class Sorter(object):
         self.pregroupfunctions = parse(p_groupstring, p_group=False) if p_groupstring else []
         self.sortfunctions = parse(p_sortstring, p_group=False)
 
-    def sort(self, p_todos):
+    def sort(self, p_todos, p_evaluation=None):
         """
         Sorts the list of todos given as a parameter, returns a new sorted
         list.
@@ -231,20 +241,26 @@ class Sorter(object):
         The list is traversed in reverse order, such that the most specific
         sort operation is done first, relying on the stability of the sorted()
         function.
+
+        When a SharedEvaluation is given, the sort keys are taken from it.
         """
-        return _apply_sort_functions(p_todos, self.sortfunctions)
+        return _apply_sort_functions(p_todos, self.sortfunctions, p_evaluation)
 
-    def group(self, p_todos):
+    def group(self, p_todos, p_evaluation=None):
         """
         Groups the todos according to the given group string.
         """
         # preorder todos for the group sort
-        p_todos = _apply_sort_functions(p_todos, self.pregroupfunctions)
+        p_todos = _apply_sort_functions(p_todos, self.pregroupfunctions,
+                                        p_evaluation)
 
         # initialize result with a single group
         result = OrderedDict([((), p_todos)])
 
         for (function, label), _ in self.groupfunctions:
+            if p_evaluation:
+                function = p_evaluation.memoize(function, function)
+
             oldresult = result
             result = OrderedDict()
             for oldkey, oldgroup in oldresult.items():
@@ -265,6 +281,6 @@ class Sorter(object):
 
         # sort all groups
         for key, _group in result.items():
-            result[key] = self.sort(_group)
+            result[key] = self.sort(_group, p_evaluation)
 
         return result
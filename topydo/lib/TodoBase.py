@@ -38,11 +38,46 @@ class TodoBase(object):
     """
 
     def __init__(self, p_src):
-        self.src = ""
+        self._src = ""
+        self._lowercase_src = None
+        self._change_listeners = []
         self.fields = {}
 
         self.set_source_text(p_src)
 
+    @property
+    def src(self):
+        return self._src
+
+    @src.setter
+    def src(self, p_src):
+        self._src = p_src
+        self._lowercase_src = None
+
+        for listener in self._change_listeners:
+            listener(self)
+
+    def add_change_listener(self, p_listener):
+        """
+        Registers a function that is called with this todo item whenever its
+        source text changes.
+
+        The listener may be called before the parsed fields are updated, so it
+        should only take note of the change and inspect the todo item later.
+        """
+        self._change_listeners.append(p_listener)
+
+    def remove_change_listener(self, p_listener):
+        """ Unregisters a function registered with add_change_listener. """
+        try:
+            self._change_listeners.remove(p_listener)
+        except ValueError:
+            pass
+
+    def clear_change_listeners(self):
+        """ Unregisters all functions registered with add_change_listener. """
+        self._change_listeners = []
+
     def tag_value(self, p_key, p_default=None):
         """
         Returns a tag value associated with p_key. Returns p_default if p_key
@@ -174,10 +209,21 @@ class TodoBase(object):
         """
         return self.text(True)
 
+    def lowercase_source(self):
+        """
+        Returns the source text in lowercase, for case insensitive searches.
+        The result is cached until the source text changes.
+        """
+        if self._lowercase_src is None:
+            self._lowercase_src = self._src.lower()
+
+        return self._lowercase_src
+
     def set_source_text(self, p_text):
         """ Sets the todo source text. The text will be parsed again. """
-        self.src = p_text.strip()
-        self.fields = parse_line(self.src)
+        src = p_text.strip()
+        self.fields = parse_line(src)
+        self.src = src
 
     def projects(self):
         """ Returns a set of projects associated with this todo item. """
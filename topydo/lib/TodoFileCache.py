@@ -0,0 +1,156 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+An on-disk cache of parsed todo files, such that an unchanged todo file
+doesn't have to be parsed again on every invocation.
+"""
+
+import gc
+import os
+import pickle
+from copy import copy
+from hashlib import sha1
+
+from topydo.lib.Todo import Todo
+
+_VERSION = 1
+
+
+def cache_dir():
+    """
+    Returns the directory to store caches in, following the XDG Base
+    Directory specification.
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or \
+        os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'topydo')
+
+
+class TodoFileCache(object):
+    """
+    Stores the parsed todo items of a todo file in a pickle, keyed by the path,
+    size, modification time and content hash of the todo file.
+    """
+
+    def __init__(self, p_path, p_cache_dir=None):
+        self.path = os.path.abspath(p_path)
+
+        name = sha1(self.path.encode('utf-8')).hexdigest() + '.pickle'
+        self.cache_path = os.path.join(p_cache_dir or cache_dir(), name)
+
+    def _load(self, p_key):
+        """ Returns the cached todo items for the given key, if any. """
+        # unpickling creates many objects without any garbage, the collector
+        # would only slow it down
+        gc_enabled = gc.isenabled()
+        gc.disable()
+
+        try:
+            with open(self.cache_path, 'rb') as cache:
+                key, todos = pickle.load(cache)
+        except Exception:  # missing, unreadable or incompatible cache
+            return None
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        return todos if key == p_key else None
+
+    def _store(self, p_key, p_todos):
+        """
+        Writes the todo items to the cache. The cache is replaced atomically,
+        such that concurrent invocations never read a partial cache. Failures
+        are ignored, the cache is merely an optimization.
+        """
+        tmp_path = '{}.{}.tmp'.format(self.cache_path, os.getpid())
+
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+
+            with open(tmp_path, 'wb') as cache:
+                pickle.dump((p_key, p_todos), cache, pickle.HIGHEST_PROTOCOL)
+
+            os.replace(tmp_path, self.cache_path)
+        except (OSError, pickle.PicklingError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _read_file(self):
+        """
+        Returns a tuple with the content of the todo file and the key of the
+        cache for that content, or None when the file can't be read.
+        """
+        try:
+            with open(self.path, 'rb') as todofile:
+                stat = os.fstat(todofile.fileno())
+                content = todofile.read()
+        except IOError:
+            return None
+
+        key = (_VERSION, self.path, stat.st_size, stat.st_mtime_ns,
+               sha1(content).hexdigest())
+
+        return content, key
+
+    def read(self):
+        """
+        Returns a list of parsed todo items, one for each line in the todo
+        file. The lines are only parsed when the file changed since it was
+        read last time.
+        """
+        result = self._read_file()
+
+        if result is None:
+            return []
+
+        content, key = result
+        todos = self._load(key)
+
+        if todos is None:
+            todos = [Todo(src) for src in
+                     content.decode('utf-8').splitlines(True)]
+            self._store(key, todos)
+
+        return todos
+
+    def store(self, p_todos):
+        """
+        Stores the given todo items in the cache after they were written to
+        the todo file, such that the next read doesn't parse the file again.
+        Nothing is stored when the file doesn't contain exactly their sources.
+        """
+        result = self._read_file()
+
+        if result is None:
+            return
+
+        content, key = result
+        lines = content.decode('utf-8').splitlines()
+        if lines != [todo.source() for todo in p_todos]:
+            return
+
+        todos = []
+        for todo in p_todos:
+            # don't pickle the todo list the items belong to
+            todo = copy(todo)
+            todo.clear_change_listeners()
+            vars(todo).pop('parents', None)
+            todos.append(todo)
+
+        self._store(key, todos)
@@ -0,0 +1,343 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+An on-disk search index for todo files, to search large files such as the
+archive (done.txt) without parsing all of their lines.
+"""
+
+import json
+import os
+import sqlite3
+from array import array
+from contextlib import closing
+from hashlib import sha1
+
+from topydo.lib import Filter
+from topydo.lib.Config import config
+from topydo.lib.Todo import Todo
+from topydo.lib.TodoList import TodoList
+from topydo.lib.TodoListBase import InvalidTodoException
+from topydo.lib.TrigramIndex import trigrams
+
+_VERSION = 3
+
+_CHUNK_SIZE = 1 << 20
+
+
+def _index_path(p_path, p_extension):
+    """ Returns the path of a hidden index file next to the todo file. """
+    dirname, filename = os.path.split(os.path.splitext(p_path)[0])
+    return os.path.join(dirname, '.' + filename + p_extension)
+
+
+def appended_digest(p_file, p_size, p_digest):
+    """
+    Checks that the first p_size bytes of the file still have the hex digest
+    p_digest, i.e. that the file was only appended to since they were read.
+
+    Returns a SHA-1 object over these bytes, to be updated with the bytes
+    that follow, or None when the file was modified otherwise.
+    """
+    digest = sha1()
+    p_file.seek(0)
+    remaining = p_size
+
+    while remaining > 0:
+        chunk = p_file.read(min(remaining, _CHUNK_SIZE))
+        if not chunk:
+            return None
+
+        digest.update(chunk)
+        remaining -= len(chunk)
+
+    return digest if digest.hexdigest() == p_digest else None
+
+
+class TodoFileIndex(object):
+    """
+    Maps trigrams of the (lowercase) lines of a todo file to line numbers.
+
+    The postings and the byte offsets of each line are stored in an SQLite
+    database, such that only the lines matching a search are read. When the
+    todo file was only appended to since the last update (which is the case
+    after archiving), only the new lines are indexed. Their postings are
+    inserted as new rows (one per trigram), the existing rows are never
+    rewritten.
+    """
+
+    def __init__(self, p_path):
+        self.path = os.path.abspath(p_path)
+        self._db_path = _index_path(self.path, '.idx.sqlite')
+
+    def exists(self):
+        """ Returns True when an index was created for this file before. """
+        return os.path.exists(self._db_path)
+
+    def _connect(self):
+        """
+        Opens the database, creating its tables when necessary. Transactions
+        are started explicitly.
+        """
+        db = sqlite3.connect(self._db_path, isolation_level=None)
+        db.execute("CREATE TABLE IF NOT EXISTS meta (value TEXT)")
+        db.execute("CREATE TABLE IF NOT EXISTS postings "
+                   "(trigram TEXT, lines BLOB)")
+        db.execute("CREATE INDEX IF NOT EXISTS postings_trigram "
+                   "ON postings (trigram)")
+        db.execute("CREATE TABLE IF NOT EXISTS offsets "
+                   "(line INTEGER PRIMARY KEY, offset INTEGER)")
+        return db
+
+    def _read_meta(self, p_db):
+        row = p_db.execute("SELECT value FROM meta").fetchone()
+
+        if row is None:
+            return None
+
+        meta = json.loads(row[0])
+        return meta if meta.get('version') == _VERSION else None
+
+    def _write_meta(self, p_db, p_meta):
+        p_db.execute("DELETE FROM meta")
+        p_db.execute("INSERT INTO meta VALUES (?)", (json.dumps(p_meta),))
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_size, stat.st_mtime_ns
+        except OSError:
+            return 0, 0
+
+    def _is_current(self, p_meta, p_stat):
+        return p_meta and (p_meta['file_size'], p_meta['mtime']) == p_stat
+
+    def update(self):
+        """ Brings the index up to date with the todo file. """
+        with closing(self._connect()) as db:
+            self._update(db)
+
+    def _update(self, p_db):
+        stat = self._stat()
+
+        if self._is_current(self._read_meta(p_db), stat):
+            return
+
+        # the write lock is taken before the meta data is read again, such
+        # that concurrent updates are serialized and each one sees the
+        # postings and offsets committed by the previous one
+        p_db.execute("BEGIN IMMEDIATE")
+
+        try:
+            meta = self._read_meta(p_db)
+
+            if not self._is_current(meta, stat):
+                self._index_file(p_db, meta, stat)
+
+            p_db.execute("COMMIT")
+        except BaseException:
+            p_db.execute("ROLLBACK")
+            raise
+
+    def _index_file(self, p_db, p_meta, p_stat):
+        try:
+            todofile = open(self.path, 'rb')
+        except IOError:
+            todofile = None
+
+        try:
+            digest = todofile and p_meta and p_stat[0] >= p_meta['size'] and \
+                appended_digest(todofile, p_meta['size'], p_meta['digest'])
+
+            if not digest:
+                p_db.execute("DELETE FROM postings")
+                p_db.execute("DELETE FROM offsets")
+                p_meta = {'size': 0, 'lines': 0}
+                digest = sha1()
+
+            self._index_lines(p_db, todofile, p_meta, digest)
+        finally:
+            if todofile:
+                todofile.close()
+
+        p_meta.update({
+            'version': _VERSION,
+            'file_size': p_stat[0],
+            'mtime': p_stat[1],
+            'digest': digest.hexdigest(),
+        })
+
+        self._write_meta(p_db, p_meta)
+
+    def _index_lines(self, p_db, p_file, p_meta, p_digest):
+        """
+        Indexes the complete lines after the content indexed before, and
+        updates p_digest with them. An unterminated last line is left for the
+        next update, since it may still be extended.
+        """
+        postings = {}
+        offsets = []
+        offset = p_meta['size']
+        number = p_meta['lines']
+
+        if p_file:
+            p_file.seek(offset)
+
+            for line in p_file:
+                if not line.endswith(b'\n'):
+                    break
+
+                number += 1
+                offsets.append((number, offset))
+                offset += len(line)
+                p_digest.update(line)
+
+                text = line.decode('utf-8', 'replace').lower()
+                for trigram in trigrams(text.strip()):
+                    postings.setdefault(trigram, array('I')).append(number)
+
+        p_db.executemany("INSERT INTO postings VALUES (?, ?)",
+                         ((trigram, numbers.tobytes())
+                          for trigram, numbers in postings.items()))
+        p_db.executemany("INSERT INTO offsets VALUES (?, ?)", offsets)
+
+        p_meta['size'] = offset
+        p_meta['lines'] = number
+
+    def _lookup(self, p_db, p_texts):
+        """
+        Returns the set of line numbers containing all trigrams of the given
+        texts, or None when the texts are too short to narrow down the lines.
+        """
+        result = None
+
+        for text in p_texts:
+            for trigram in trigrams(text):
+                numbers = array('I')
+
+                for row in p_db.execute(
+                        "SELECT lines FROM postings WHERE trigram = ?",
+                        (trigram,)):
+                    numbers.frombytes(row[0])
+
+                result = set(numbers) if result is None \
+                    else result.intersection(numbers)
+
+                if not result:
+                    return result
+
+        return result
+
+    def _offsets(self, p_db, p_texts):
+        """
+        Returns the meta data and a sorted list of (line number, offset)
+        tuples of the candidate lines, read in a single transaction.
+        """
+        p_db.execute("BEGIN")
+
+        try:
+            meta = self._read_meta(p_db)
+            numbers = self._lookup(p_db, p_texts)
+
+            if numbers is None:
+                offsets = p_db.execute(
+                    "SELECT line, offset FROM offsets ORDER BY line"
+                ).fetchall()
+            else:
+                offsets = [(number, p_db.execute(
+                    "SELECT offset FROM offsets WHERE line = ?",
+                    (number,)).fetchone()[0]) for number in sorted(numbers)]
+        finally:
+            p_db.execute("COMMIT")
+
+        return meta, offsets
+
+    def search(self, p_texts):
+        """
+        Returns a list of (line number, line) tuples for the lines that may
+        contain all given lowercase texts. The lines should still be matched
+        against the actual search expression.
+        """
+        with closing(self._connect()) as db:
+            self._update(db)
+            meta, offsets = self._offsets(db, p_texts)
+
+        result = []
+
+        try:
+            todofile = open(self.path, 'rb')
+        except IOError:
+            return result
+
+        with todofile:
+            for number, offset in offsets:
+                todofile.seek(offset)
+                result.append((number, todofile.readline()))
+
+            # lines that were not indexed yet are always a candidate
+            todofile.seek(meta['size'])
+            number = meta['lines']
+            for line in todofile:
+                number += 1
+                result.append((number, line))
+
+        return [(number, line.decode('utf-8', 'replace'))
+                for number, line in result]
+
+
+class TodoListExcerpt(TodoList):
+    """
+    A todo list containing a selection of the lines of a todo file. Line
+    numbers refer to the lines in the original file.
+    """
+
+    def __init__(self, p_lines):
+        """ Should be given a list of (line number, todo string) tuples. """
+        super().__init__([])
+
+        self._linenumbers = {}
+        todos = []
+
+        for number, src in p_lines:
+            if src.strip():
+                todo = Todo(src)
+                self._linenumbers[todo] = number
+                todos.append(todo)
+
+        self.add_todos(todos)
+        self.dirty = False
+
+    def linenumber(self, p_todo):
+        try:
+            return self._linenumbers[p_todo]
+        except KeyError as ex:
+            raise InvalidTodoException from ex
+
+    def max_id_length(self):
+        if config().identifiers() != "text" and self._linenumbers:
+            return len(str(max(self._linenumbers.values())))
+
+        return super().max_id_length()
+
+
+def search_todo_file(p_path, p_filters):
+    """
+    Returns a TodoListExcerpt with the lines of the given todo file that may
+    match the case insensitive GrepFilters in p_filters, with the help of the
+    on-disk index. The result should still be filtered with p_filters.
+    """
+    texts = Filter.grep_texts(p_filters)
+    return TodoListExcerpt(TodoFileIndex(p_path).search(texts))
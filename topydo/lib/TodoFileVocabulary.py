@@ -0,0 +1,138 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Keeps track of the projects and contexts used in a todo file that isn't loaded
+otherwise, such as the archive (done.txt).
+"""
+
+import os
+from bisect import bisect_left, insort
+from hashlib import sha1
+
+from topydo.lib.Todo import Todo
+from topydo.lib.TodoFileIndex import appended_digest
+
+
+class TodoFileVocabulary(object):
+    """
+    Counts the todo items of a todo file per project and context, and
+    remembers the date each of them was used last (the latest completion or
+    creation date).
+
+    When the file was only appended to since the last update (which is the
+    case after archiving), only the new lines are read.
+    """
+
+    def __init__(self, p_path):
+        self.path = p_path
+        self._reset()
+
+    def _reset(self):
+        self._usage = {}  # '+project' or '@context' => (count, last used)
+        self._words = {'+': [], '@': []}  # sigil => sorted list of words
+        self._size = 0
+        self._digest = sha1().hexdigest()
+        self._stamp = None
+
+    def update(self):
+        """
+        Brings the counts up to date with the todo file. Returns True when
+        the file changed since the last update.
+        """
+        try:
+            stat = os.stat(self.path)
+            stamp = (stat.st_size, stat.st_mtime_ns)
+
+            if stamp == self._stamp:
+                return False
+
+            with open(self.path, 'rb') as todofile:
+                digest = stat.st_size >= self._size and \
+                    appended_digest(todofile, self._size, self._digest)
+
+                if not digest:
+                    self._reset()
+                    digest = sha1()
+
+                self._read_lines(todofile, digest)
+                self._digest = digest.hexdigest()
+        except IOError:
+            changed = self._stamp is not None
+            self._reset()
+            return changed
+
+        self._stamp = stamp
+        return True
+
+    def _read_lines(self, p_file, p_digest):
+        """
+        Counts the complete lines after the content read before, and updates
+        p_digest with them. An unterminated last line is left for the next
+        update, since it may still be extended.
+        """
+        p_file.seek(self._size)
+
+        for line in p_file:
+            if not line.endswith(b'\n'):
+                break
+
+            self._size += len(line)
+            p_digest.update(line)
+            text = line.decode('utf-8', 'replace')
+
+            if text.strip():
+                self._add(Todo(text))
+
+    def _add(self, p_todo):
+        last_used = max(filter(None, (p_todo.creation_date(),
+                                      p_todo.completion_date())),
+                        default=None)
+
+        words = ['+' + project for project in p_todo.projects()] + \
+                ['@' + context for context in p_todo.contexts()]
+
+        for word in words:
+            count, word_last_used = self._usage.get(word, (0, None))
+
+            if not count:
+                insort(self._words[word[0]], word[1:])
+
+            self._usage[word] = (count + 1,
+                                 max(filter(None, (last_used, word_last_used)),
+                                     default=None))
+
+    def usage(self, p_word):
+        """
+        Returns a tuple with the number of todo items with the given project
+        ('+project') or context ('@context') and the date it was used last,
+        as of the last update.
+        """
+        return self._usage.get(p_word, (0, None))
+
+    def words_with_prefix(self, p_sigil, p_prefix):
+        """
+        Returns the sorted list of projects (p_sigil '+') or contexts ('@')
+        that start with the given prefix, as of the last update.
+        """
+        words = self._words[p_sigil]
+        start = bisect_left(words, p_prefix)
+        end = start
+
+        while end < len(words) and words[end].startswith(p_prefix):
+            end += 1
+
+        return words[start:end]
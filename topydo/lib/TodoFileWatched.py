@@ -68,9 +68,14 @@ class TodoFileWatched(TodoFile):
             def on_modified(self, p_event):
                 self._handle(p_event)
 
-        observer = Observer()
-        observer.schedule(EventHandler(self), os.path.dirname(self.path))
-        observer.start()
+        self._observer = Observer()
+        self._observer.schedule(EventHandler(self), os.path.dirname(self.path))
+        self._observer.start()
+
+    def close(self):
+        """ Stops watching the file. """
+        self._observer.stop()
+        self._observer.join()
 
     def write(self, p_todos):
         # make sure not to reread the todo file because this instance is
@@ -0,0 +1,92 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Provides a base class for in-memory indexes over todo items. """
+
+from copy import copy
+
+
+class TodoIndex(object):
+    """
+    Base class for an index over the todo items of a todo list.
+
+    The index is built lazily on the first lookup. Todo items whose source
+    text changed should be reported with invalidate(), they are reindexed on
+    the next lookup.
+
+    Subclasses must implement _reset, _index and _unindex, and call _refresh
+    before each lookup.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def __deepcopy__(self, p_memo):
+        # the copy refers to different todo items, let it rebuild itself
+        result = copy(self)
+        result.clear()
+        return result
+
+    def _reset(self):
+        """ Initializes the data structures of the index. """
+        raise NotImplementedError
+
+    def _index(self, p_todo):
+        """ Adds the todo item to the data structures. """
+        raise NotImplementedError
+
+    def _unindex(self, p_todo):
+        """ Removes the todo item (as it was indexed) from the index. """
+        raise NotImplementedError
+
+    def _refresh(self, p_todos):
+        """
+        Builds the index from p_todos if that didn't happen yet, and reindexes
+        the todo items that changed since the last lookup.
+        """
+        if not self._built:
+            self._built = True
+
+            for todo in p_todos:
+                self._index(todo)
+
+        for todo in self._stale:
+            self._unindex(todo)
+            self._index(todo)
+
+        self._stale.clear()
+
+    def add(self, p_todo):
+        """ Adds a todo item to the index. """
+        if self._built:
+            self._index(p_todo)
+
+    def remove(self, p_todo):
+        """ Removes a todo item from the index. """
+        if self._built:
+            self._unindex(p_todo)
+            self._stale.discard(p_todo)
+
+    def invalidate(self, p_todo):
+        """ Marks a todo item for reindexing, because its source changed. """
+        if self._built:
+            self._stale.add(p_todo)
+
+    def clear(self):
+        """ Empties the index, it will be rebuilt on the next lookup. """
+        self._built = False
+        self._stale = set()
+        self._reset()
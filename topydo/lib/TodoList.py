@@ -31,17 +31,38 @@ def _needs_dependencies(p_function):
     methods of TodoList that require dependency information.
     """
     def build_dependency_information(p_todolist):
+        """
+        Builds the dependency graph for all todo items at once. This gives the
+        same result as registering each todo item, but without scanning all
+        todo items for every parent.
+        """
+        parents = {}  # dependency id => parent todos, in list order
+
         for todo in p_todolist._todos:
-            p_todolist._register_todo(todo)
+            p_todolist._tododict[hash(todo)] = todo
+
+            dep_id = todo.tag_value('id')
+            if dep_id:
+                p_todolist._parentdict[dep_id] = todo
+                p_todolist._depgraph.add_node(hash(todo))
+                parents.setdefault(dep_id, []).append(todo)
+
+        for todo in p_todolist._todos:
+            for dep_id in todo.tag_values('p'):
+                for parent in parents.get(dep_id, []):
+                    p_todolist._add_edge(parent, todo, dep_id)
 
     def inner(self, *args, **kwargs):
         if not self._initialized:
-            self._initialized = True
-
-            from topydo.lib.Graph import DirectedGraph
-            self._depgraph = DirectedGraph()
+            # the column UI evaluates views on a worker thread, while the
+            # main thread may need dependencies to draw todo items
+            with self._lock:
+                if not self._initialized:
+                    from topydo.lib.Graph import DirectedGraph
+                    self._depgraph = DirectedGraph()
 
-            build_dependency_information(self)
+                    build_dependency_information(self)
+                    self._initialized = True
 
         return p_function(self, *args, **kwargs)
 
@@ -83,46 +104,74 @@ class TodoList(TodoListBase):
         except KeyError:
             return None
 
-    def _maintain_dep_graph(self, p_todo):
+    def _discard_dependencies(self):
         """
-        Makes sure that the dependency graph is consistent according to the
-        given todo.
+        Discards the dependency information, it's built again for all todo
+        items in one pass when it's needed.
         """
-        dep_id = p_todo.tag_value('id')
-        # maintain dependency graph
-        if dep_id:
-            self._parentdict[dep_id] = p_todo
-            self._depgraph.add_node(hash(p_todo))
+        with self._lock:
+            self._initialized = False
+            self._tododict = {}
+            self._parentdict = {}
+            self._depgraph = None
 
-            # connect all tasks we have in memory so far that refer to this
-            # task
-            for dep in \
-                    [dep for dep in self._todos if dep.has_tag('p', dep_id)]:
+    def _register_todos(self, p_todos):
+        """
+        Adds the given todo items, which were appended to the list, to the
+        existing dependency graph. When they have id or p tags, the todo items
+        are scanned once for all parents with these IDs, like
+        build_dependency_information does, such that duplicate IDs give the
+        same graph.
+        """
+        new_todos = set(p_todos)
+        new_ids = set()
 
-                self._add_edge(p_todo, dep, dep_id)
+        for todo in p_todos:
+            self._tododict[hash(todo)] = todo
 
-        for dep_id in p_todo.tag_values('p'):
-            try:
-                parent = self._parentdict[dep_id]
-                self._add_edge(parent, p_todo, dep_id)
-            except KeyError:
-                pass
+            dep_id = todo.tag_value('id')
+            if dep_id:
+                self._parentdict[dep_id] = todo
+                self._depgraph.add_node(hash(todo))
+                new_ids.add(dep_id)
 
-    def _register_todo(self, p_todo):
-        self._maintain_dep_graph(p_todo)
-        self._tododict[hash(p_todo)] = p_todo
+        dep_ids = new_ids.union(*(todo.tag_values('p') for todo in p_todos))
 
-    def add_todos(self, p_todos):
-        super().add_todos(p_todos)
+        if not dep_ids:
+            return
+
+        parents = {}  # dependency id => parent todos, in list order
 
         for todo in self._todos:
-            todo.parents = types.MethodType(self.parents, todo)
+            dep_id = todo.tag_value('id')
+            if dep_id in dep_ids:
+                parents.setdefault(dep_id, []).append(todo)
+
+        # only the edges from or to the new todo items are missing
+        for todo in self._todos:
+            for dep_id in todo.tag_values('p'):
+                for parent in parents.get(dep_id, []):
+                    if todo in new_todos or parent in new_todos:
+                        self._add_edge(parent, todo, dep_id)
+
+    def add_todos(self, p_todos):
+        with self._lock:
+            super().add_todos(p_todos)
+
+            for todo in p_todos:
+                todo.parents = types.MethodType(self.parents, todo)
 
             # only do administration when the dependency info is initialized,
             # otherwise we postpone it until it's really needed (through the
             # _needs_dependencies decorator)
             if self._initialized:
-                self._register_todo(todo)
+                self._register_todos(p_todos)
+
+    def erase(self):
+        """ Also discards the dependency information. """
+        with self._lock:
+            super().erase()
+            self._discard_dependencies()
 
     def delete(self, p_todo, p_leave_tags=False):
         """ Deletes a todo item from the list. """
@@ -137,10 +186,12 @@ class TodoList(TodoListBase):
                 for parent in self.parents(p_todo):
                     self.remove_dependency(parent, p_todo, p_leave_tags)
 
-            del self._todos[number]
-            self._update_todo_ids()
+            with self._lock:
+                del self._todos[number]
+                self._unwatch_todo(p_todo)
+                self._update_todo_ids()
 
-            self.dirty = True
+                self.dirty = True
         except ValueError:
             # todo item couldn't be found, ignore
             pass
@@ -216,6 +267,8 @@ class TodoList(TodoListBase):
 
         if dep_id:
             self._depgraph.remove_edge(hash(p_from_todo), hash(p_to_todo))
+            self._record_change(p_from_todo)
+            self._record_change(p_to_todo)
             self.dirty = True
 
         # clean dangling dependency tags
@@ -226,6 +279,26 @@ class TodoList(TodoListBase):
                 p_from_todo.remove_tag('id')
                 del self._parentdict[dep_id]
 
+    def stop_recording(self):
+        """
+        Also marks the (indirect) parents and children of the changed todo
+        items as changed, their dependency related properties (e.g. whether
+        they're blocked, their average importance) may have changed as well.
+        """
+        changes = super().stop_recording()
+
+        if changes and self._initialized:
+            related = set()
+
+            for todo in changes.added | changes.changed:
+                related.update(self.parents(todo))
+                related.update(self.children(todo))
+
+            for todo in related - changes.added:
+                changes.change(todo)
+
+        return changes
+
     @_needs_dependencies
     def parents(self, p_todo, p_only_direct=False):
         """
@@ -20,14 +20,13 @@ A list of todo items.
 
 import math
 import re
+import threading
 from datetime import date
 
 from topydo.lib import Filter
 from topydo.lib.Config import config
-from topydo.lib.HashListValues import hash_list_values, max_id_length
-from topydo.lib.printers.PrettyPrinter import PrettyPrinter
 from topydo.lib.Todo import Todo
-from topydo.lib.View import View
+from topydo.lib.TodoListChanges import TodoListChanges
 
 
 class InvalidTodoException(Exception):
@@ -46,15 +45,39 @@ class TodoListBase(object):
     def __init__(self, p_todostrings):
         """
         Should be given a list of strings, each element a single todo string.
-        The string will be parsed.
+        The string will be parsed. Elements may also be Todo items which were
+        parsed before (e.g. by TodoFileCache).
         """
         self._todos = []
-        self._todo_id_map = {}
-        self._id_todo_map = {}
+        self._revision = 0
+        # tuple of the todo => ID and ID => todo maps, computed on demand by
+        # _todo_ids
+        self._id_maps = None
+        self._linenumber_map = None  # todo => line number, computed on demand
+        self._indexes = None  # key => TodoIndex, when indexes are enabled
+        self._positions = {}  # todo => sequence number, to retain list order
+        self._next_position = 0
+        self._changes = None  # TodoListChanges while recording
+
+        # the column UI evaluates views on a worker thread while the main
+        # thread modifies the list. The lock guards the data derived lazily
+        # from the list (indexes, IDs, line numbers) against the
+        # modifications.
+        self._lock = threading.RLock()
 
         self.add_list(p_todostrings)
         self._dirty = False
 
+    def __getstate__(self):
+        # locks can't be copied, copies (e.g. backups) get their own lock
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, p_state):
+        self.__dict__.update(p_state)
+        self._lock = threading.RLock()
+
     def __iter__(self):
         """
         Allows use of `for my_todo in todolist` constructs.
@@ -81,7 +104,7 @@ class TodoListBase(object):
 
             if config().identifiers() == 'text':
                 try:
-                    result = self._id_todo_map[p_identifier]
+                    result = self._todo_ids()[1][p_identifier]
                 except KeyError:
                     pass  # we'll try something else
 
@@ -117,7 +140,8 @@ class TodoListBase(object):
             """
             result = None
 
-            candidates = Filter.GrepFilter(p_identifier).filter(self._todos)
+            grep = Filter.GrepFilter(p_identifier)
+            candidates = grep.filter(self.candidates([grep]))
 
             if len(candidates) == 1:
                 result = candidates[0]
@@ -146,7 +170,7 @@ class TodoListBase(object):
         return todos[0] if len(todos) else None
 
     def add_list(self, p_srcs):
-        todos = [Todo(src) for src in p_srcs]
+        todos = [src if isinstance(src, Todo) else Todo(src) for src in p_srcs]
         if config().auto_delete_whitespace():
             todos = [todo for todo in todos if re.search(r'\S', todo.source())]
         self.add_todos(todos)
@@ -158,22 +182,65 @@ class TodoListBase(object):
         self.add_todos([p_todo])
 
     def add_todos(self, p_todos):
-        for todo in p_todos:
-            self._todos.append(todo)
+        with self._lock:
+            for todo in p_todos:
+                self._todos.append(todo)
+                self._watch_todo(todo)
 
-        self._update_todo_ids()
-        self.dirty = True
+                if self._changes is not None:
+                    self._changes.add(todo)
 
-    def delete(self, p_todo):
-        """ Deletes a todo item from the list. """
-        try:
-            number = self._todos.index(p_todo)
-            del self._todos[number]
             self._update_todo_ids()
             self.dirty = True
-        except ValueError:
-            # todo item couldn't be found, ignore
-            pass
+
+    def _watch_todo(self, p_todo):
+        """ Keeps track of changes in a todo item that was added. """
+        p_todo.add_change_listener(self._todo_changed)
+
+        if self._indexes is not None:
+            self._positions[p_todo] = self._next_position
+            self._next_position += 1
+
+            for index in self._indexes.values():
+                index.add(p_todo)
+
+    def _unwatch_todo(self, p_todo):
+        """ Stops keeping track of a todo item that was removed. """
+        p_todo.remove_change_listener(self._todo_changed)
+
+        if self._changes is not None:
+            self._changes.remove(p_todo)
+
+        if self._indexes is not None:
+            del self._positions[p_todo]
+
+            for index in self._indexes.values():
+                index.remove(p_todo)
+
+    def _todo_changed(self, p_todo):
+        """ Called when the source text of one of the todo items changed. """
+        with self._lock:
+            self._revision += 1
+
+            if self._changes is not None:
+                self._changes.change(p_todo)
+
+            if self._indexes:
+                for index in self._indexes.values():
+                    index.invalidate(p_todo)
+
+    def delete(self, p_todo):
+        """ Deletes a todo item from the list. """
+        with self._lock:
+            try:
+                number = self._todos.index(p_todo)
+                del self._todos[number]
+                self._unwatch_todo(p_todo)
+                self._update_todo_ids()
+                self.dirty = True
+            except ValueError:
+                # todo item couldn't be found, ignore
+                pass
 
     def modify_todo(self, p_todo, p_new_source):
         """ Modify source of a Todo item from the list. """
@@ -184,15 +251,58 @@ class TodoListBase(object):
 
     def erase(self):
         """ Erases all todos from the list. """
-        self._todos = []
-        self.dirty = True
+        with self._lock:
+            for todo in self._todos:
+                self._unwatch_todo(todo)
+
+            if self._changes is not None:
+                self._changes.reset = True
+
+            self._todos = []
+            self._update_todo_ids()
+            self.dirty = True
 
     def replace(self, p_todos):
-        """ Replaces whole todolist with todo objects supplied as p_todos. """
+        """
+        Replaces whole todolist with todo objects supplied as p_todos.
+
+        The todo items may come from another list, such as a backup copy when
+        rolling back. They stop notifying that list about their changes.
+        """
         self.erase()
+
+        for todo in p_todos:
+            todo.clear_change_listeners()
+
         self.add_todos(p_todos)
         self.dirty = True
 
+    def start_recording(self):
+        """
+        Starts recording the todo items that are added, removed or changed,
+        until stop_recording is called.
+        """
+        self._changes = TodoListChanges(self._revision)
+
+    def _record_change(self, p_todo):
+        """
+        Records a todo item as changed, for changes that don't modify its
+        source text.
+        """
+        if self._changes is not None:
+            self._changes.change(p_todo)
+
+    def stop_recording(self):
+        """
+        Stops recording changes and returns the TodoListChanges since
+        start_recording was called, or None when changes weren't being
+        recorded.
+        """
+        changes = self._changes
+        self._changes = None
+
+        return changes
+
     def count(self):
         """ Returns the number of todos on this list. """
         return len(self._todos)
@@ -211,21 +321,77 @@ class TodoListBase(object):
 
     def projects(self):
         """ Returns a set of all projects in this list. """
-        result = set()
-        for todo in self._todos:
-            projects = todo.projects()
-            result = result.union(projects)
-
-        return result
+        return set(self.projects_with_prefix(''))
 
     def contexts(self):
         """ Returns a set of all contexts in this list. """
-        result = set()
+        return set(self.contexts_with_prefix(''))
+
+    def projects_with_prefix(self, p_prefix):
+        """ Returns a sorted list of the projects starting with p_prefix. """
+        return self._words_with_prefix('projects', Todo.projects, p_prefix)
+
+    def contexts_with_prefix(self, p_prefix):
+        """ Returns a sorted list of the contexts starting with p_prefix. """
+        return self._words_with_prefix('contexts', Todo.contexts, p_prefix)
+
+    def project_usage(self, p_project):
+        """
+        Returns a tuple with the number of todo items with the given project
+        and the date it was used last (see VocabularyIndex.usage).
+        """
+        return self._word_usage('projects', Todo.projects, p_project)
+
+    def context_usage(self, p_context):
+        """
+        Returns a tuple with the number of todo items with the given context
+        and the date it was used last (see VocabularyIndex.usage).
+        """
+        return self._word_usage('contexts', Todo.contexts, p_context)
+
+    def _words_with_prefix(self, p_key, p_getter, p_prefix):
+        """
+        Returns the sorted words obtained with p_getter from all todo items
+        that start with p_prefix. An index over the words is kept when
+        indexes are enabled.
+        """
+        from topydo.lib.VocabularyIndex import VocabularyIndex
+        with self._lock:
+            index = self._search_index(p_key,
+                                       lambda: VocabularyIndex(p_getter))
+
+            if index:
+                return index.words(self._todos, p_prefix)
+
+        words = set()
         for todo in self._todos:
-            contexts = todo.contexts()
-            result = result.union(contexts)
+            words.update(p_getter(todo))
 
-        return result
+        return sorted(word for word in words if word.startswith(p_prefix))
+
+    def _word_usage(self, p_key, p_getter, p_word):
+        """
+        Returns the number of todo items containing p_word according to
+        p_getter, and the latest creation or completion date of those items.
+        """
+        from topydo.lib.VocabularyIndex import VocabularyIndex
+        with self._lock:
+            index = self._search_index(p_key,
+                                       lambda: VocabularyIndex(p_getter))
+
+            if index:
+                return index.usage(self._todos, p_word)
+
+        count = 0
+        last_used = None
+        for todo in self._todos:
+            if p_word in p_getter(todo):
+                count += 1
+                last_used = max(filter(None, (last_used, todo.creation_date(),
+                                              todo.completion_date())),
+                                default=None)
+
+        return (count, last_used)
 
     def view(self, p_sorter, p_filters):
         """
@@ -235,8 +401,91 @@ class TodoListBase(object):
         defined by the end user. Todos is this list should not be modified,
         modifications should occur through this class.
         """
+        from topydo.lib.View import View
         return View(p_sorter, p_filters, self)
 
+    def enable_search_index(self):
+        """
+        Maintains indexes over the todo items, such that filters on large lists
+        don't need to scan all todo items. There is a trigram index over the
+        todo sources for case insensitive greps, and sorted indexes for date
+        comparisons.
+
+        Each index is built on the first search that needs it, which makes
+        them only worthwhile for long running sessions with repeated searches.
+        """
+        if self._indexes is None:
+            self._indexes = {}
+            self._positions = {t: i for i, t in enumerate(self._todos)}
+            self._next_position = len(self._todos)
+
+    def _search_index(self, p_key, p_factory):
+        """
+        Returns the index with the given key, it is created with p_factory if
+        it doesn't exist yet. Returns None when indexes are not enabled.
+        """
+        if self._indexes is None:
+            return None
+
+        try:
+            return self._indexes[p_key]
+        except KeyError:
+            index = p_factory()
+            self._indexes[p_key] = index
+            return index
+
+    def todos_containing(self, p_text):
+        """
+        Returns the set of todo items whose lowercase source may contain the
+        given lowercase text. Returns None when the index cannot tell.
+        """
+        from topydo.lib.TrigramIndex import TrigramIndex
+        with self._lock:
+            index = self._search_index('text', TrigramIndex)
+
+            if index:
+                return index.todos_containing(self._todos, p_text)
+
+        return None
+
+    def todos_by_date(self, p_key, p_getter, p_operator, p_date):
+        """
+        Returns the set of todo items whose date (obtained with p_getter)
+        compares to p_date according to p_operator. The index for p_getter is
+        identified by p_key. Returns None when indexes are not enabled.
+
+        See DateIndex for the contract of p_getter.
+        """
+        from topydo.lib.DateIndex import DateIndex
+        with self._lock:
+            index = self._search_index(p_key, lambda: DateIndex(p_getter))
+
+            if index:
+                return index.todos_by_date(self._todos, p_operator, p_date)
+
+        return None
+
+    def candidates(self, p_filters):
+        """
+        Returns the todo items that may pass all given filters, in list order,
+        as far as the indexes can tell. The result should still be filtered.
+
+        Returns all todo items when indexes are not enabled.
+        """
+        result = None
+
+        if self._indexes is not None:
+            for _filter in p_filters:
+                todos = _filter.candidates(self)
+
+                if todos is not None:
+                    result = todos if result is None else result & todos
+
+        if result is None:
+            return self._todos
+
+        return sorted(result, key=self._positions.__getitem__)
+
     @property
     def dirty(self):
         return self._dirty
@@ -245,6 +494,17 @@ class TodoListBase(object):
     def dirty(self, p_flag):
         self._dirty = p_flag
 
+        if p_flag:
+            self._revision += 1
+
+    @property
+    def revision(self):
+        """
+        A number that increases whenever the list or one of its todo items
+        changes, such that values derived from the list can be cached.
+        """
+        return self._revision
+
     def todos(self):
         return self._todos
 
@@ -261,9 +521,19 @@ class TodoListBase(object):
         """
         Returns the line number of the todo item.
         """
+        linenumbers = self._linenumber_map
+
+        if linenumbers is None:
+            with self._lock:
+                # the map is only assigned when complete, the column UI reads
+                # it while the views are evaluated on the worker thread
+                linenumbers = {todo: number for number, todo
+                               in enumerate(self._todos, 1)}
+                self._linenumber_map = linenumbers
+
         try:
-            return self._todos.index(p_todo) + 1
-        except ValueError as ex:
+            return linenumbers[p_todo]
+        except KeyError as ex:
             raise InvalidTodoException from ex
 
     def uid(self, p_todo):
@@ -271,7 +541,7 @@ class TodoListBase(object):
         Returns the unique text-based ID for a todo item.
         """
         try:
-            return self._todo_id_map[p_todo]
+            return self._todo_ids()[0][p_todo]
         except KeyError as ex:
             raise InvalidTodoException from ex
 
@@ -290,6 +560,7 @@ class TodoListBase(object):
         Returns the maximum length of a todo ID, used for formatting purposes.
         """
         if config().identifiers() == "text":
+            from topydo.lib.HashListValues import max_id_length
             return max_id_length(len(self._todos))
         else:
             try:
@@ -299,30 +570,60 @@ class TodoListBase(object):
 
 
     def _update_todo_ids(self):
-        # the idea is to have a hash that is independent of the position of the
-        # todo. Use the text (without tags) of the todo to keep the id as
-        # stable as possible (not influenced by priorities or due dates, etc.)
-        self._todo_id_map = {}
-        self._id_todo_map = {}
+        """
+        Discards the text-based IDs and line numbers after the list changed,
+        they are computed again when they're needed. Lists using line numbers
+        as identifiers never pay for hashing all todo items.
+        """
+        with self._lock:
+            self._id_maps = None
+            self._linenumber_map = None
+
+    def _todo_ids(self):
+        """
+        Returns a tuple with the maps from todo items to text-based IDs and
+        vice versa.
+
+        Both maps are built before they're assigned, such that a reader in
+        another thread never sees a partially filled map.
+        """
+        id_maps = self._id_maps
+
+        if id_maps is None:
+            # the idea is to have a hash that is independent of the position of
+            # the todo. Use the text (without tags) of the todo to keep the id
+            # as stable as possible (not influenced by priorities or due dates,
+            # etc.)
+            todo_id_map = {}
+            id_todo_map = {}
+
+            from topydo.lib.HashListValues import hash_list_values
+
+            with self._lock:
+                uids = hash_list_values(self._todos, lambda t: t.text())
+
+                for (todo, uid) in uids:
+                    todo_id_map[todo] = uid
+                    id_todo_map[uid] = todo
 
-        uids = hash_list_values(self._todos, lambda t: t.text())
+                id_maps = (todo_id_map, id_todo_map)
+                self._id_maps = id_maps
 
-        for (todo, uid) in uids:
-            self._todo_id_map[todo] = uid
-            self._id_todo_map[uid] = todo
+        return id_maps
 
     def print_todos(self):
         """
         Returns a pretty-printed string (without colors) of the todo items in
         this list.
         """
+        from topydo.lib.printers.PrettyPrinter import PrettyPrinter
         printer = PrettyPrinter()
         return "\n".join([str(s) for s in printer.print_list(self._todos)])
 
     def ids(self):
         """ Returns set with all todo IDs. """
         if config().identifiers() == 'text':
-            ids = self._id_todo_map.keys()
+            ids = self._todo_ids()[1].keys()
         else:
             ids = [str(i + 1) for i in range(self.count())]
         return set(ids)
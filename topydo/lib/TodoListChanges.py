@@ -0,0 +1,76 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+The changes made to a todo list during a transaction.
+"""
+
+
+class TodoListChanges(object):
+    """
+    Records which todo items were added to, removed from or changed in a todo
+    list, such that views and widgets on that list only need to update the
+    affected items.
+
+    Changed items include items whose derived properties may have changed,
+    such as the parents and children of an item whose dependencies changed.
+    """
+
+    def __init__(self, p_revision):
+        # revision of the todo list when recording started
+        self.revision = p_revision
+        self.added = set()
+        self.removed = set()
+        self.changed = set()
+
+        # True when the todo list was erased, all items should be considered
+        # changed
+        self.reset = False
+
+    def add(self, p_todo):
+        self.added.add(p_todo)
+
+    def remove(self, p_todo):
+        if p_todo in self.added:
+            self.added.discard(p_todo)
+        else:
+            self.removed.add(p_todo)
+
+        self.changed.discard(p_todo)
+
+    def change(self, p_todo):
+        if p_todo not in self.added:
+            self.changed.add(p_todo)
+
+    def merge(self, p_changes):
+        """ Adds the changes that were recorded after these. """
+        self.reset = self.reset or p_changes.reset
+
+        for todo in p_changes.added:
+            self.add(todo)
+
+        for todo in p_changes.removed:
+            self.remove(todo)
+
+        for todo in p_changes.changed:
+            self.change(todo)
+
+    def affected(self):
+        """ Returns all todo items that were added, removed or changed. """
+        return self.added | self.removed | self.changed
+
+    def __bool__(self):
+        return self.reset or bool(self.added or self.removed or self.changed)
@@ -0,0 +1,74 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+An inverted index from trigrams to todo items, to quickly narrow down the todo
+items that may contain a given text.
+"""
+
+from topydo.lib.TodoIndex import TodoIndex
+
+
+def trigrams(p_string):
+    """ Returns the set of all substrings of length 3 in p_string. """
+    return {p_string[i:i + 3] for i in range(len(p_string) - 2)}
+
+
+class TrigramIndex(TodoIndex):
+    """
+    Maps trigrams of the lowercase source text to the todo items containing
+    them.
+    """
+
+    def _reset(self):
+        self._trigrams = {}  # trigram => set of todos
+        self._indexed = {}  # todo => trigrams of the indexed source
+
+    def _index(self, p_todo):
+        todo_trigrams = trigrams(p_todo.lowercase_source())
+
+        for trigram in todo_trigrams:
+            self._trigrams.setdefault(trigram, set()).add(p_todo)
+
+        self._indexed[p_todo] = todo_trigrams
+
+    def _unindex(self, p_todo):
+        for trigram in self._indexed.pop(p_todo, ()):
+            todos = self._trigrams[trigram]
+            todos.discard(p_todo)
+
+            if not todos:
+                del self._trigrams[trigram]
+
+    def todos_containing(self, p_todos, p_text):
+        """
+        Returns the set of todo items that may contain the given lowercase
+        text, or None when the text is shorter than three characters.
+
+        p_todos should be the complete list of todo items that is indexed.
+        """
+        self._refresh(p_todos)
+
+        result = None
+
+        for trigram in trigrams(p_text):
+            todos = self._trigrams.get(trigram, set())
+            result = set(todos) if result is None else result & todos
+
+            if not result:
+                break
+
+        return result
@@ -21,8 +21,9 @@ Various utility functions.
 import re
 from collections import namedtuple
 from datetime import date
+from functools import lru_cache
 
-import arrow
+_DATE_MATCH = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
 
 
 def date_string_to_date(p_date):
@@ -33,7 +34,7 @@ def date_string_to_date(p_date):
     result = None
 
     if p_date:
-        parsed_date = re.match(r'(\d{4})-(\d{2})-(\d{2})', p_date)
+        parsed_date = _DATE_MATCH.match(p_date)
         if parsed_date:
             result = date(
                 int(parsed_date.group(1)),  # year
@@ -108,8 +109,19 @@ def translate_key_to_config(p_key):
 
     return key
 
-def humanize_date(p_datetime):
-    """ Returns a relative date string from a datetime object. """
+@lru_cache(maxsize=1024)
+def _humanize_date(p_datetime, p_today):
+    """
+    Returns a relative date string from a datetime object, relative to
+    p_today. The result is cached, it only changes when the day changes.
+    """
+    # arrow takes a while to import, only do so when dates are humanized
+    import arrow
+
     now = arrow.now()
     _date = now.replace(day=p_datetime.day, month=p_datetime.month, year=p_datetime.year)
     return _date.humanize(now).replace('just now', 'today')
+
+def humanize_date(p_datetime):
+    """ Returns a relative date string from a datetime object. """
+    return _humanize_date(p_datetime, date.today())
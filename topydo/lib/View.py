@@ -16,6 +16,8 @@
 
 """ A view is a list of todos, sorted, grouped and filtered. """
 
+from topydo.lib.Filter import compile_filters
+
 
 class View(object):
     """
@@ -24,27 +26,64 @@ class View(object):
     to the list.
     """
 
-    def __init__(self, p_sorter, p_filters, p_todolist):
+    def __init__(self, p_sorter, p_filters, p_todolist, p_evaluation=None):
+        """
+        Views given the same SharedEvaluation share the values they compute
+        for each todo item. Their results are kept until the todo list
+        changes.
+        """
         self.todolist = p_todolist
         self._sorter = p_sorter
         self._filters = p_filters
+        self._evaluation = p_evaluation
+        self._results = {}
+        self._state = None
 
-    def _apply_filters(self, p_todos):
-        """ Applies the filters to the list of todo items. """
-        result = p_todos
+    def _cached(self, p_name, p_compute):
+        """
+        Returns the result of p_compute, or the result computed before when
+        the shared evaluation tells that nothing changed since.
+        """
+        if self._evaluation is None:
+            return p_compute()
+
+        state = self._evaluation.state()
+
+        if state != self._state:
+            self._results = {}
+            self._state = state
 
-        for _filter in sorted(self._filters, key=lambda f: f.order):
-            result = _filter.filter(result)
+        try:
+            return self._results[p_name]
+        except KeyError:
+            result = p_compute()
+            self._results[p_name] = result
+            return result
 
-        return result
+    def _candidates(self):
+        """
+        Returns the todo items that may pass the filters, possibly narrowed
+        down by the search index of the todo list.
+        """
+        return self.todolist.candidates(self._filters)
+
+    def _apply_filters(self, p_todos):
+        """ Applies the filters to the list of todo items. """
+        return compile_filters(self._filters, self._evaluation)(p_todos)
 
     @property
     def todos(self):
         """ Returns a sorted and filtered list of todos in this view. """
-        result = self._sorter.sort(self.todolist.todos())
-        return self._apply_filters(result)
+        def compute():
+            result = self._sorter.sort(self._candidates(), self._evaluation)
+            return self._apply_filters(result)
+
+        return self._cached('todos', compute)
 
     @property
     def groups(self):
-        result = self._apply_filters(self.todolist.todos())
-        return self._sorter.group(result)
+        def compute():
+            result = self._apply_filters(self._candidates())
+            return self._sorter.group(result, self._evaluation)
+
+        return self._cached('groups', compute)
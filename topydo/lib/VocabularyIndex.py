@@ -0,0 +1,104 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+An index of the words (e.g. projects or contexts) that occur in todo items,
+for listing and completing them.
+"""
+
+from bisect import bisect_left, insort
+
+from topydo.lib.TodoIndex import TodoIndex
+
+
+class VocabularyIndex(TodoIndex):
+    """
+    Keeps the words returned by a getter function (e.g. Todo.projects) in a
+    sorted list, with the number of todo items that contain each word and the
+    date it was used last: the latest creation or completion date of the todo
+    items containing it.
+    """
+
+    def __init__(self, p_getter):
+        self._getter = p_getter
+        super().__init__()
+
+    def _reset(self):
+        self._words = []  # sorted list of words
+        self._counts = {}  # word => number of todo items containing it
+        self._last_used = {}  # word => latest date of the todo items
+        self._indexed = {}  # todo => words it had when it was indexed
+
+    def _index(self, p_todo):
+        words = self._getter(p_todo)
+        last_used = max(filter(None, (p_todo.creation_date(),
+                                      p_todo.completion_date())),
+                        default=None)
+
+        for word in words:
+            count = self._counts.get(word, 0)
+
+            if not count:
+                insort(self._words, word)
+
+            self._counts[word] = count + 1
+
+            if last_used:
+                self._last_used[word] = max(last_used,
+                                            self._last_used.get(word,
+                                                                last_used))
+
+        self._indexed[p_todo] = words
+
+    def _unindex(self, p_todo):
+        for word in self._indexed.pop(p_todo, ()):
+            count = self._counts.pop(word) - 1
+
+            if count:
+                self._counts[word] = count
+            else:
+                del self._words[bisect_left(self._words, word)]
+                self._last_used.pop(word, None)
+
+    def words(self, p_todos, p_prefix=''):
+        """
+        Returns the sorted list of words that start with the given prefix.
+
+        p_todos should be the complete list of todo items that is indexed.
+        """
+        self._refresh(p_todos)
+
+        words = self._words
+        start = bisect_left(words, p_prefix)
+        end = start
+
+        while end < len(words) and words[end].startswith(p_prefix):
+            end += 1
+
+        return words[start:end]
+
+    def usage(self, p_todos, p_word):
+        """
+        Returns a tuple with the number of todo items containing the word and
+        the date it was used last (None when the todo items have no dates).
+        The date isn't lowered when the latest todo item is removed, a removed
+        (e.g. archived) item still counts as a use.
+
+        p_todos should be the complete list of todo items that is indexed.
+        """
+        self._refresh(p_todos)
+
+        return (self._counts.get(p_word, 0), self._last_used.get(p_word))
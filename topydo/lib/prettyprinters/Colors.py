@@ -17,12 +17,32 @@
 """ Provides a pretty printer filter that colorizes todo items. """
 
 import re
+from functools import lru_cache
 
 from topydo.lib.Color import AbstractColor
 from topydo.lib.Config import config
 from topydo.lib.PrettyPrinterFilter import PrettyPrinterFilter
 from topydo.lib.TopydoString import TopydoString
 
+_COLORS = [
+    (re.compile(r'\B@(\S*\w)'), AbstractColor.CONTEXT),
+    (re.compile(r'\B\+(\S*\w)'), AbstractColor.PROJECT),
+    (re.compile(r'\b\S+:[^/\s]\S*\b'), AbstractColor.META),
+    (re.compile(r'(^|\s)(\w+:){1}(//\S+)'), AbstractColor.LINK),
+]
+
+
+@lru_cache(maxsize=4096)
+def _color_spans(p_text):
+    """
+    Returns a tuple of (start, end, color) tuples for the contexts, projects,
+    tags and links in the given text. The result is cached, such that
+    unchanged todo items don't need to be scanned again in a next listing.
+    """
+    return tuple((match.start(), match.end(), color)
+                 for pattern, color in _COLORS
+                 for match in pattern.finditer(p_text))
+
 
 class PrettyPrinterColorFilter(PrettyPrinterFilter):
     """
@@ -38,20 +58,12 @@ class PrettyPrinterColorFilter(PrettyPrinterFilter):
 
             priority_color = config().priority_color(p_todo.priority())
 
-            colors = [
-                (r'\B@(\S*\w)', AbstractColor.CONTEXT),
-                (r'\B\+(\S*\w)', AbstractColor.PROJECT),
-                (r'\b\S+:[^/\s]\S*\b', AbstractColor.META),
-                (r'(^|\s)(\w+:){1}(//\S+)', AbstractColor.LINK),
-            ]
-
             # color by priority
             p_todo_str.set_color(0, priority_color)
 
-            for pattern, color in colors:
-                for match in re.finditer(pattern, p_todo_str.data):
-                    p_todo_str.set_color(match.start(), color)
-                    p_todo_str.set_color(match.end(), priority_color)
+            for start, end, color in _color_spans(p_todo_str.data):
+                p_todo_str.set_color(start, color)
+                p_todo_str.set_color(end, priority_color)
 
             p_todo_str.append('', AbstractColor.NEUTRAL)
 
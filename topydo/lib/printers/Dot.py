@@ -36,6 +36,9 @@ class DotPrinter(Printer):
         self.todolist = p_todolist
 
     def print_list(self, p_todos):
+        return '\n'.join(self.iter_list(p_todos))
+
+    def iter_list(self, p_todos):
         def node_label(p_todo):
             """
             Prints an HTML table for a node label with some todo details.
@@ -57,9 +60,9 @@ class DotPrinter(Printer):
 
             node_result += '<TR><TD><B>{}</B></TD><TD BALIGN="LEFT"><B>{}{}{}</B></TD></TR>'.format(
                 self.todolist.number(p_todo),
-                "<S>" if todo.is_completed() else "",
+                "<S>" if p_todo.is_completed() else "",
                 "<BR />".join(map(escape_dot_label, wrap(p_todo.text(), 35))),
-                "</S>" if todo.is_completed() else "",
+                "</S>" if p_todo.is_completed() else "",
             )
 
             priority = p_todo.priority()
@@ -99,39 +102,47 @@ class DotPrinter(Printer):
 
             return '#ffffff' if brightness < 0.5 else '#000000'
 
-        node_name = lambda t: '_' + str(self.todolist.number(t))
+        yield 'digraph topydo {'
+        yield 'node [ shape="none" margin="0" fontsize="9" fontname="Helvetica" ]'
 
-        result = 'digraph topydo {\n'
-        result += 'node [ shape="none" margin="0" fontsize="9" fontname="Helvetica" ]\n';
+        todos = list(p_todos)
+        todo_set = set(todos)
+        node_names = {t: '_' + str(self.todolist.number(t)) for t in todos}
 
         # print todos
-        for todo in p_todos:
+        for todo in todos:
             background_color = progress_color(todo)
 
-            result += '  {} [label={} style=filled fillcolor="{}" fontcolor="{}"]\n'.format(
-                node_name(todo),
+            yield '  {} [label={} style=filled fillcolor="{}" fontcolor="{}"]'.format(
+                node_names[todo],
                 node_label(todo),
                 background_color.as_html(),
                 foreground(background_color),
             )
 
-        # print edges
-        for todo in p_todos:
-            # only print the children that are actually in the list of todos
-            children = set(p_todos) & set(self.todolist.children(todo,
-                p_only_direct=True))
+        # print edges, only to the children that are actually in the list of
+        # todos
+        todos_without_dependencies = []
+
+        for todo in todos:
+            children = self.todolist.children(todo, p_only_direct=True)
+
+            if not children and \
+                    not self.todolist.parents(todo, p_only_direct=True):
+                todos_without_dependencies.append(todo)
+
+            children = [child for child in children if child in todo_set]
 
-            for child in sorted(list(children), key=lambda t: t.text()):
-                result += '  {} -> {}\n'.format(
-                    node_name(todo),
-                    node_name(child)
+            for child in sorted(children, key=lambda t: t.text()):
+                yield '  {} -> {}'.format(
+                    node_names[todo],
+                    node_names[child]
                 )
 
-        todos_without_dependencies = [todo for todo in p_todos if not self.todolist.children(todo) and not self.todolist.parents(todo)]
-        for index in range(0, len(todos_without_dependencies) - 1):
-            this_todo = todos_without_dependencies[index]
-            next_todo = todos_without_dependencies[index + 1]
-            result += '  {} -> {} [style="invis"]\n'.format(node_name(this_todo), node_name(next_todo))
+        for this_todo, next_todo in zip(todos_without_dependencies,
+                                        todos_without_dependencies[1:]):
+            yield '  {} -> {} [style="invis"]'.format(node_names[this_todo],
+                                                      node_names[next_todo])
 
-        result += '}\n'
-        return result
+        # end with an empty line
+        yield '}\n'
@@ -20,8 +20,10 @@ file according to RFC 2445.
 """
 
 import random
+import sqlite3
 import string
 from datetime import datetime, time
+from hashlib import sha1
 
 from topydo.lib.printers.PrettyPrinter import Printer
 
@@ -75,13 +77,19 @@ class IcalPrinter(Printer):
         except ImportError:  # pragma: no cover
             self.icalendar = None
 
+    def _calendar(self):
+        """ Returns an empty icalendar Calendar instance. """
+        cal = self.icalendar.Calendar()
+        cal.add('prodid', '-//bramschoenmakers.nl//topydo//')
+        cal.add('version', '2.0')
+
+        return cal
+
     def print_list(self, p_todos):
         result = ""
 
         if self.icalendar:
-            cal = self.icalendar.Calendar()
-            cal.add('prodid', '-//bramschoenmakers.nl//topydo//')
-            cal.add('version', '2.0')
+            cal = self._calendar()
 
             for todo in p_todos:
                 cal.add_component(self._convert_todo(todo))
@@ -90,37 +98,36 @@ class IcalPrinter(Printer):
 
         return result
 
-    def _convert_todo(self, p_todo):
-        """ Converts a Todo instance (Topydo) to an icalendar Todo instance. """
+    def _get_uid(self, p_todo):
+        """
+        Gets a unique ID from a todo item, stored by the ical tag. If the
+        tag is not present, a random value is assigned to it and returned.
+        """
 
-        def _get_uid(p_todo):
+        def generate_uid(p_length=4):
             """
-            Gets a unique ID from a todo item, stored by the ical tag. If the
-            tag is not present, a random value is assigned to it and returned.
+            Generates a random string of the given length, used as
+            identifier.
             """
+            return ''.join(
+                random.choice(string.ascii_letters + string.digits)
+                for i in range(p_length))
 
-            def generate_uid(p_length=4):
-                """
-                Generates a random string of the given length, used as
-                identifier.
-                """
-                return ''.join(
-                    random.choice(string.ascii_letters + string.digits)
-                    for i in range(p_length))
+        uid = p_todo.tag_value('ical')
+        if not uid:
+            uid = generate_uid()
+            p_todo.set_tag('ical', uid)
+            self.todolist.dirty = True
 
-            uid = p_todo.tag_value('ical')
-            if not uid:
-                uid = generate_uid()
-                p_todo.set_tag('ical', uid)
-                self.todolist.dirty = True
-
-            return uid
+        return uid
 
+    def _convert_todo(self, p_todo):
+        """ Converts a Todo instance (Topydo) to an icalendar Todo instance. """
         result = self.icalendar.Todo()
 
         # this should be called first, it may set the ical: tag and therefore
         # change the source() output.
-        result['uid'] = _get_uid(p_todo)
+        result['uid'] = self._get_uid(p_todo)
 
         result['summary'] = self.icalendar.vText(p_todo.text())
         result['description'] = self.icalendar.vText(p_todo.source())
@@ -144,3 +151,126 @@ class IcalPrinter(Printer):
             result.add('completed', completed)
 
         return result
+
+
+class IcalExportPrinter(IcalPrinter):
+    """
+    A printer that exports todo items in iCalendar format without modifying
+    them, meant for repeated exports of a todo list.
+
+    Todo items without an ical tag get a UID derived from their creation date
+    and text, rather than a random ical tag. The rendered VTODO components are
+    cached by the hash of their UID and source text, such that only todo
+    items that changed since a previous export are converted again. When a
+    cache path is given, the cache is kept in an SQLite database on disk,
+    otherwise in memory for the lifetime of the printer.
+    """
+
+    def __init__(self, p_todolist, p_cache_path=None):
+        super().__init__(p_todolist)
+        self.cache_path = p_cache_path
+        self._db = None
+        self._uids = {}
+
+    def _cache(self):
+        """
+        Returns the connection to the cache database, creating its table when
+        necessary.
+        """
+        if self._db is None:
+            self._db = sqlite3.connect(self.cache_path or ':memory:')
+            self._db.execute("CREATE TABLE IF NOT EXISTS components "
+                             "(key TEXT PRIMARY KEY, component BLOB)")
+
+        return self._db
+
+    def _assign_uids(self, p_todos):
+        """
+        Determines the UID of each todo item. Todo items with the same UID
+        (the same creation date and text) get a sequence number by their
+        position in the todo list, such that the UIDs don't depend on the
+        filter or sort order of the export.
+        """
+        def base_uid(p_todo):
+            uid = p_todo.tag_value('ical')
+
+            if not uid:
+                created = p_todo.creation_date()
+                key = '{} {}'.format(created.isoformat() if created else '',
+                                     p_todo.text())
+                uid = sha1(key.encode('utf-8')).hexdigest()[:16]
+
+            return uid
+
+        uids = {todo: base_uid(todo) for todo in p_todos}
+        exported = set(uids.values())
+        ranks = {}
+        counts = {}
+
+        for todo in self.todolist:
+            uid = uids[todo] if todo in uids else base_uid(todo)
+
+            if uid in exported:
+                counts[uid] = counts.get(uid, 0) + 1
+                ranks[todo] = counts[uid]
+
+        self._uids = {}
+
+        for todo, uid in uids.items():
+            if todo not in ranks:
+                # not in the todo list, number it after the ones that are
+                counts[uid] = counts.get(uid, 0) + 1
+                ranks[todo] = counts[uid]
+
+            rank = ranks[todo]
+            self._uids[todo] = '{}-{}'.format(uid, rank) if rank > 1 else uid
+
+    def _get_uid(self, p_todo):
+        return self._uids[p_todo]
+
+    def print_list(self, p_todos):
+        if not self.icalendar:
+            return ""
+
+        p_todos = list(p_todos)
+        self._assign_uids(p_todos)
+
+        header, footer = self._calendar().to_ical().rsplit(b'END:', 1)
+        components = [header]
+        used = set()
+
+        db = self._cache()
+
+        with db:
+            for todo in p_todos:
+                key = sha1('{}\n{}'.format(self._uids[todo], todo.source())
+                           .encode('utf-8')).hexdigest()
+
+                row = db.execute("SELECT component FROM components "
+                                 "WHERE key = ?", (key,)).fetchone()
+
+                if row:
+                    component = row[0]
+                else:
+                    component = self._convert_todo(todo).to_ical()
+                    db.execute("INSERT OR REPLACE INTO components "
+                               "VALUES (?, ?)", (key, component))
+
+                components.append(component)
+                used.add(key)
+
+            # keep the cache from growing indefinitely with items that changed
+            count = db.execute("SELECT COUNT(*) FROM components").fetchone()[0]
+
+            if count > 2 * len(used):
+                db.execute("CREATE TEMP TABLE used (key TEXT PRIMARY KEY)")
+                db.executemany("INSERT INTO used VALUES (?)",
+                               ((key,) for key in used))
+                db.execute("DELETE FROM components "
+                           "WHERE key NOT IN (SELECT key FROM used)")
+                db.execute("DROP TABLE used")
+
+        components.append(b'END:' + footer)
+
+        return b''.join(components).decode('utf-8')
+
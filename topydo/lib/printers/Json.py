@@ -65,3 +65,18 @@ class JsonPrinter(Printer):
             result.append(_convert_todo(todo))
 
         return json.dumps(result, ensure_ascii=False, sort_keys=True)
+
+
+class NdjsonPrinter(JsonPrinter):
+    """
+    A printer that converts a list of Todo items to newline delimited JSON:
+    one JSON object per line, such that the output can be processed while it
+    is being written.
+    """
+
+    def print_list(self, p_todos):
+        return '\n'.join(self.iter_list(p_todos))
+
+    def iter_list(self, p_todos):
+        for todo in p_todos:
+            yield self.print_todo(todo)
@@ -43,6 +43,18 @@ class Printer(object):
         todos = list(chain.from_iterable(p_groups.values()))
         return self.print_list(todos)
 
+    def iter_list(self, p_todos):
+        """
+        Generates the output of print_list line by line, such that the UI can
+        write each line as soon as it's available. By default, the output is
+        generated at once.
+        """
+        yield self.print_list(p_todos)
+
+    def iter_groups(self, p_groups):
+        """ Generates the output of print_groups line by line. """
+        return self.iter_list(chain.from_iterable(p_groups.values()))
+
 
 class PrettyPrinter(Printer):
     """
@@ -84,31 +96,31 @@ class PrettyPrinter(Printer):
         formatted TopydoStrings. The output function in the UI should convert
         the colors inside properly.
         """
-        return [self.print_todo(todo) for todo in p_todos]
+        return list(self.iter_list(p_todos))
 
     def print_groups(self, p_groups):
-        result = []
-        first = True
+        return list(self.iter_groups(p_groups))
 
-        def print_header(p_key):
-            """ Prints a header for the given key. """
-            if not first:
-                result.append('')
+    def iter_list(self, p_todos):
+        for todo in p_todos:
+            yield self.print_todo(todo)
 
-            key_string = ", ".join(p_key)
-            result.append(key_string)
-            result.append("=" * len(key_string))
+    def iter_groups(self, p_groups):
+        first = True
 
         for key, todos in p_groups.items():
             if key != ():
                 # don't print a header for the case that no valid grouping
                 # could be made (e.g. an invalid group expression)
-                print_header(key)
+                if not first:
+                    yield TopydoString('')
 
-            first = False
-            result += self.print_list(todos)
+                key_string = ", ".join(key)
+                yield TopydoString(key_string)
+                yield TopydoString("=" * len(key_string))
 
-        return [TopydoString(s) for s in result]
+            first = False
+            yield from self.iter_list(todos)
 
 def pretty_printer_factory(p_todolist, p_additional_filters=None):
     """ Returns a pretty printer suitable for the ls and dep subcommands. """
@@ -21,8 +21,8 @@ I/O on the command-line.
 
 import getopt
 import sys
+from types import GeneratorType
 
-from topydo.lib.Color import AbstractColor, Color
 from topydo.lib.TopydoString import TopydoString
 
 MAIN_OPTS = "ac:C:d:ht:v"
@@ -90,6 +90,8 @@ def lookup_color(p_color):
     when a normal color is passed.
     """
     if not lookup_color.colors:
+        from topydo.lib.Color import AbstractColor, Color
+
         lookup_color.colors[AbstractColor.NEUTRAL] = Color('NEUTRAL')
         lookup_color.colors[AbstractColor.PROJECT] = config().project_color()
         lookup_color.colors[AbstractColor.CONTEXT] = config().context_color()
@@ -105,17 +107,50 @@ lookup_color.colors = {}
 
 def insert_ansi(p_string):
     """ Returns a string with color information at the right positions.  """
-    result = p_string.data
+    data = p_string.data
+    segments = []
+    start = 0
+
+    for pos, color in sorted(p_string.colors.items()):
+        segments.append(data[start:pos])
+        segments.append(lookup_color(color).as_ansi())
+        start = pos
+
+    segments.append(data[start:])
 
-    for pos, color in sorted(p_string.colors.items(), reverse=True):
-        color = lookup_color(color)
+    return ''.join(segments)
 
-        result = result[:pos] + color.as_ansi() + result[pos:]
+def write_lines(p_file, p_lines):
+    """
+    Writes each line of the iterable p_lines to file p_file as soon as it is
+    produced, such that long output doesn't need to be kept in memory.
+
+    Like write(), empty output (e.g. of a printer that couldn't print
+    anything) is skipped. Empty lines are only written when another line
+    follows, such as the blank line between groups.
+    """
+    colors = config().colors(p_file.isatty())
+    empty_lines = 0
 
-    return result
+    for line in p_lines:
+        if isinstance(line, TopydoString):
+            line = insert_ansi(line)
+
+        if line and not colors:
+            line = escape_ansi(line)
+
+        if not line:
+            empty_lines += 1
+            continue
+
+        p_file.write("\n" * empty_lines + line + "\n")
+        empty_lines = 0
 
 def output(p_string):
-    if isinstance(p_string, list):
+    if isinstance(p_string, GeneratorType):
+        write_lines(sys.stdout, p_string)
+        return
+    elif isinstance(p_string, list):
         p_string = "\n".join([insert_ansi(s) for s in p_string])
     elif isinstance(p_string, TopydoString):
         # convert color codes to ANSI
@@ -146,9 +181,6 @@ except ConfigError as config_error:
     error(str(config_error))
     sys.exit(1)
 
-from topydo.lib import TodoFile
-from topydo.lib import TodoList
-from topydo.lib import TodoListBase
 from topydo.lib.Utils import escape_ansi
 
 
@@ -157,6 +189,9 @@ def _retrieve_archive():
     Returns a tuple with archive content: the first element is a TodoListBase
     and the second element is a TodoFile.
     """
+    from topydo.lib import TodoFile
+    from topydo.lib import TodoListBase
+
     archive_file = TodoFile.TodoFile(config().archive())
     archive = TodoListBase.TodoListBase(archive_file.read())
 
@@ -172,6 +207,7 @@ class CLIApplicationBase(object):
     """
 
     def __init__(self):
+        from topydo.lib import TodoList
         self.todolist = TodoList.TodoList([])
         self.todofile = None
         self.do_archive = True
@@ -239,6 +275,12 @@ class CLIApplicationBase(object):
             if archive.dirty:
                 archive_file.write(archive.print_todos())
 
+                # keep the search index of the archive up to date, if any
+                from topydo.lib.TodoFileIndex import TodoFileIndex
+                index = TodoFileIndex(config().archive())
+                if index.exists():
+                    index.update()
+
     @staticmethod
     def is_read_only(p_command):
         """ Returns True when the given command class is read-only. """
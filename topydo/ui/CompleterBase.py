@@ -15,10 +15,20 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import datetime
+import heapq
 from functools import lru_cache
+from itertools import groupby
+from os.path import commonprefix
 
 from topydo.Commands import SUBCOMMAND_MAP
 from topydo.lib.Config import config
+from topydo.lib.TodoFileVocabulary import TodoFileVocabulary
+
+# the maximum number of projects or contexts offered for completion
+MAX_COMPLETIONS = 50
+
+# the number of days after which a use of a project or context counts half
+RECENCY_HALF_LIFE = 30
 
 
 @lru_cache(maxsize=1)
@@ -65,16 +75,87 @@ class CompleterBase(object):
     def __init__(self, p_todolist):
         self.todolist = p_todolist
         self._all_subcmds = _get_subcmds()
+        self._archive = TodoFileVocabulary(config().archive()) \
+            if config().archive() else None
+        self._state = None
+        self._scores = {}  # '+' or '@' => {word => score}
+
+    def _score(self, p_sigil, p_word, p_usage, p_today):
+        """
+        Returns the number of todo items containing p_word in the todo file
+        and the archive, which counts less as the word wasn't used for longer
+        (undated uses count as recent).
+        """
+        count, last_used = p_usage(p_word)
+
+        if self._archive:
+            archived, archive_last_used = self._archive.usage(p_sigil + p_word)
+            count += archived
+            last_used = max(filter(None, (last_used, archive_last_used)),
+                            default=None)
+
+        age = max(0, (p_today - last_used).days) if last_used else 0
+        return count * 0.5 ** (age / RECENCY_HALF_LIFE)
+
+    def _ranked(self, p_sigil, p_words, p_usage):
+        """
+        Returns the best scoring words of p_words (prefixed with p_sigil)
+        first, at most MAX_COMPLETIONS of them.
+
+        Scores are kept until the todo list or the archive changes, such that
+        the next keystrokes only look up the scores of the remaining words.
+        """
+        today = datetime.date.today()
+        state = (self.todolist.revision, today)
+
+        if state != self._state:
+            self._scores = {}
+            self._state = state
+
+        scores = self._scores.setdefault(p_sigil, {})
+
+        def rank(p_word):
+            try:
+                score = scores[p_word]
+            except KeyError:
+                score = self._score(p_sigil, p_word, p_usage, today)
+                scores[p_word] = score
+
+            return (-score, p_word)
+
+        return [p_sigil + word for word
+                in heapq.nsmallest(MAX_COMPLETIONS, p_words, key=rank)]
+
+    def _words(self, p_sigil, p_prefix):
+        """
+        Returns the sorted list of projects (p_sigil '+') or contexts ('@')
+        starting with p_prefix, in the todo file or the archive.
+        """
+        if p_sigil == '+':
+            words = self.todolist.projects_with_prefix(p_prefix)
+        else:
+            words = self.todolist.contexts_with_prefix(p_prefix)
+
+        if self._archive:
+            if self._archive.update():
+                # the scores include the uses in the archive
+                self._state = None
+
+            archived = self._archive.words_with_prefix(p_sigil, p_prefix)
+
+            if archived:
+                words = [word for word, _ in
+                         groupby(heapq.merge(words, archived))]
+
+        return words
 
     def _contexts(self, p_word):
-        completions = ['@' + context for context in self.todolist.contexts() if
-                       context.startswith(p_word[1:])]
-        return sorted(completions)
+        return self._ranked('@', self._words('@', p_word[1:]),
+                            self.todolist.context_usage)
 
     def _projects(self, p_word):
-        completions = ['+' + project for project in self.todolist.projects() if
-                       project.startswith(p_word[1:])]
-        return sorted(completions)
+        return self._ranked('+', self._words('+', p_word[1:]),
+                            self.todolist.project_usage)
 
     def _subcmds(self, p_word):
         completions = [cmd for cmd in self._all_subcmds if
@@ -92,3 +173,17 @@ class CompleterBase(object):
             completions = self._subcmds(p_word)
 
         return completions
+
+    def common_prefix(self, p_word, p_is_first_word=False):
+        """
+        Returns the longest text that all completions of p_word start with,
+        including the projects and contexts beyond the best ranked ones.
+        """
+        if p_word.startswith(('+', '@')):
+            words = self._words(p_word[0], p_word[1:])
+        else:
+            return commonprefix(self.get_completions(p_word, p_is_first_word))
+
+        # the words are sorted, the first and last differ the most
+        return p_word[0] + commonprefix([words[0], words[-1]]) if words \
+            else ''
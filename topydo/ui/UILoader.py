@@ -47,6 +47,12 @@ def main():
                 PromptApplication().run()
             except ImportError:
                 error("Some additional dependencies for prompt mode were not installed, please install with 'pip3 install topydo[prompt]'")
+        elif args[0] == 'daemon':
+            try:
+                from topydo.ui.daemon.Daemon import DaemonApplication
+                DaemonApplication().run()
+            except ImportError:
+                error("Some additional dependencies for daemon mode were not installed, please install with 'pip3 install topydo[daemon]'")
         elif args[0] == 'columns':
             try:
                 from topydo.ui.columns.Main import UIApplication
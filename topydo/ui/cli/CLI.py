@@ -47,7 +47,14 @@ class CLIApplication(CLIApplicationBase):
         args = self._process_flags()
 
         self.todofile = TodoFile.TodoFile(config().todotxt())
-        self.todolist = TodoList.TodoList(self.todofile.read())
+
+        if config().parse_cache():
+            from topydo.lib.TodoFileCache import TodoFileCache
+            todos = TodoFileCache(self.todofile.path).read()
+        else:
+            todos = self.todofile.read()
+
+        self.todolist = TodoList.TodoList(todos)
 
         try:
             (subcommand, args) = get_subcommand(args)
@@ -63,6 +70,18 @@ class CLIApplication(CLIApplicationBase):
         else:
             self._post_execute()
 
+    def _post_execute(self):
+        """
+        Also stores the written todo items in the parse cache, such that the
+        next invocation doesn't parse the file that was just written.
+        """
+        dirty = self.todolist.dirty
+        super()._post_execute()
+
+        if dirty and config().parse_cache():
+            from topydo.lib.TodoFileCache import TodoFileCache
+            TodoFileCache(self.todofile.path).store(self.todolist.todos())
+
 
 def main():
     """ Main entry point of the CLI. """
@@ -14,8 +14,6 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from os.path import commonprefix
-
 import urwid
 
 from topydo.ui.columns.CompletionBoxWidget import CompletionBoxWidget
@@ -143,7 +141,8 @@ class CommandLineWidget(urwid.Edit):
         elif single_completion:
             replacement = completions[0]
         else:
-            replacement = commonprefix(completions)
+            replacement = completer.common_prefix(word_before_cursor,
+                                                  start == 0)
             zero_candidate = replacement if replacement else word_before_cursor
 
             if zero_candidate != completions[0]:
@@ -47,13 +47,16 @@ class CompletionBoxWidget(urwid.ListBox):
         p_completions list, and populates them into the items attribute.
         """
         palette = PaletteItem.MARKED
+        widgets = []
         for completion in p_completions:
             width = len(completion)
             if width > self.min_width:
                 self.min_width = width
             w = urwid.Text(completion)
-            self.items.append(urwid.AttrMap(w, None, focus_map=palette))
-            self.items.set_focus(0)
+            widgets.append(urwid.AttrMap(w, None, focus_map=palette))
+
+        self.items.extend(widgets)
+        self.items.set_focus(0)
 
     def clear(self):
         self.items.clear()
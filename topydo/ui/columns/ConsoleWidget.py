@@ -14,6 +14,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from types import GeneratorType
+
 import urwid
 
 from topydo.lib.Color import AbstractColor
@@ -94,7 +96,7 @@ class ConsoleWidget(urwid.LineBox):
         return True
 
     def print_text(self, p_text):
-        if isinstance(p_text, list):
+        if isinstance(p_text, (list, GeneratorType)):
             for text in p_text:
                 self.print_text(text)
 
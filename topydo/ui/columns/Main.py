@@ -16,10 +16,14 @@
 
 import datetime
 import getopt
+import os
+import queue
 import shlex
 import sys
+import threading
 import time
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from string import ascii_uppercase
 
 import urwid
@@ -29,7 +33,9 @@ from topydo.lib import TodoList
 from topydo.lib.Config import ConfigError, config
 from topydo.lib.Filter import (DependencyFilter, HiddenTagFilter,
                                RelevanceFilter, get_filter_list)
+from topydo.lib.SharedEvaluation import SharedEvaluation
 from topydo.lib.Sorter import Sorter
+from topydo.lib.Todo import Todo
 from topydo.lib.TodoFileWatched import TodoFileWatched
 from topydo.lib.Utils import get_terminal_size
 from topydo.lib.View import View
@@ -52,8 +58,9 @@ class UIView(View):
     A subclass of view holding user input data that constructed the view (i.e.
     the sort expression and the filter expression, etc.)
     """
-    def __init__(self, p_sorter, p_filter, p_todolist, p_data):
-        super().__init__(p_sorter, p_filter, p_todolist)
+    def __init__(self, p_sorter, p_filter, p_todolist, p_data,
+                 p_evaluation=None):
+        super().__init__(p_sorter, p_filter, p_todolist, p_evaluation)
         self.data = p_data
 
 _APPEND_COLUMN = 1
@@ -127,15 +134,32 @@ class UIApplication(CLIApplicationBase):
             if opt == "-l":
                 self.alt_layout_path = value
 
+        # views are evaluated and todo files are parsed on a worker thread,
+        # the results are passed to the main loop through a queue. The todo
+        # list is only modified while holding the lock, and rows are only
+        # shown while holding it. Rows evaluated while the todo list changed
+        # are dropped and evaluated again.
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._lock = threading.RLock()
+        self._main_loop_queue = queue.Queue()
+        self._main_loop_pipe = None
+        self._update_future = None
+        self._update_requested = False
+        self._pending_changes = None
+
         def callback():
-            self.todolist.erase()
-            self.todolist.add_list(self.todofile.read())
-            self._update_all_columns()
-            self._redraw()
+            # called on the thread of the file watcher
+            if self._main_loop_pipe is not None:
+                self._in_background(self._parse_todo_file, self._reload)
 
         self.column_width = config().column_width()
         self.todofile = TodoFileWatched(config().todotxt(), callback)
         self.todolist = TodoList.TodoList(self.todofile.read())
+        self.todolist.enable_search_index()
+
+        # columns share the values computed for each todo item
+        self._evaluation = SharedEvaluation(self.todolist)
+        self._create_standard_filters()
 
         self.marked_todos = set()
 
@@ -266,9 +290,54 @@ class UIApplication(CLIApplicationBase):
             pop_ups=True
         )
 
+        self._main_loop_pipe = self.mainloop.watch_pipe(self._process_queue)
+
         self.column_mode = _APPEND_COLUMN
         self._set_alarm_for_next_midnight_update()
 
+    def _post(self, p_function):
+        """
+        Lets the main loop call p_function. May be called from any thread.
+        """
+        self._main_loop_queue.put(p_function)
+        os.write(self._main_loop_pipe, b'\n')
+
+    def _process_queue(self, _):
+        """ Calls the functions posted to the main loop. """
+        while True:
+            try:
+                function = self._main_loop_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            function()
+
+        # keep watching the pipe
+        return True
+
+    def _in_background(self, p_function, p_done):
+        """
+        Calls p_function on the worker thread, then lets the main loop call
+        p_done with its result. Exceptions are raised in the main loop.
+        """
+        future = self._executor.submit(p_function)
+        future.add_done_callback(
+            lambda f: self._post(lambda: p_done(f.result())))
+
+        return future
+
+    def _parse_todo_file(self):
+        """ Parses the todo file on the worker thread. """
+        return [Todo(src) for src in self.todofile.read()]
+
+    def _reload(self, p_todos):
+        """ Replaces the todo items by those parsed from the todo file. """
+        with self._lock:
+            self.todolist.erase()
+            self.todolist.add_list(p_todos)
+
+        self._update_all_columns()
+
     def _move_highlight(self, p_new_focus):
         """
         Removes highlight from currently focused column and applies it on
@@ -281,6 +350,17 @@ class UIApplication(CLIApplicationBase):
     def _set_alarm_for_next_midnight_update(self):
         def callback(p_loop, p_data):
             TodoWidget.wipe_cache()
+
+            with self._lock:
+                self._evaluation.clear()
+
+            self._create_standard_filters()
+
+            # filters resolve relative dates once, so rebuild them for the
+            # new day
+            for column, _ in self.columns.contents:
+                column.view = self._viewdata_to_view(column.view.data)
+
             self._update_all_columns()
             self._set_alarm_for_next_midnight_update()
 
@@ -357,29 +437,109 @@ class UIApplication(CLIApplicationBase):
         label = transaction.label
         self._backup(subcommand, p_label=label)
 
-        try:
-            if transaction.execute():
-                post_archive_action = transaction.execute_post_archive_actions
-                self._post_archive_action = post_archive_action
-                self._post_execute()
+        with self._lock:
+            self.todolist.start_recording()
+
+            try:
+                if transaction.execute():
+                    post_archive_action = \
+                        transaction.execute_post_archive_actions
+                    self._post_archive_action = post_archive_action
+                    self._post_execute()
+                else:
+                    self._rollback()
+            except TypeError:
+                # TODO: show error message
+                pass
+            finally:
+                self.todolist.stop_recording()
+
+    def _update_all_columns(self, p_changes=None):
+        """
+        Updates the columns after the todo list or their views changed. When
+        the changes are known, only the affected todo items are evaluated and
+        drawn again.
+
+        The views are evaluated on the worker thread, the columns keep showing
+        their current rows until the new rows arrive.
+        """
+        if not self._update_requested:
+            self._update_requested = True
+            self._pending_changes = p_changes
+        elif self._pending_changes is not None:
+            if p_changes is None:
+                self._pending_changes = None
             else:
-                self._rollback()
-        except TypeError:
-            # TODO: show error message
-            pass
+                self._pending_changes.merge(p_changes)
 
-    def _update_all_columns(self):
         for column, _ in self.columns.contents:
-            column.update()
             column.keystate = None
 
+        self._start_update()
+
+    def _start_update(self):
+        """
+        Starts evaluating the views of all columns, unless an evaluation is
+        still running. Then it starts once that finished.
+        """
+        if self._update_future is not None or not self._update_requested:
+            return
+
+        changes = self._pending_changes
+        columns = [column for column, _ in self.columns.contents]
+        views = [column.view for column in columns]
+
+        self._update_requested = False
+        self._pending_changes = None
+
+        def evaluate():
+            revision = self.todolist.revision
+
+            try:
+                if changes is not None:
+                    self._evaluation.apply_changes(changes)
+
+                rows = [column.compute_rows() for column in columns]
+            except Exception:
+                # the main thread may modify the todo list while it's being
+                # evaluated, which may break the evaluation halfway
+                if self.todolist.revision == revision:
+                    raise
+
+                return None
+
+            return rows if self.todolist.revision == revision else None
+
+        def done(p_rows):
+            self._update_future = None
+
+            if p_rows is None:
+                # the todo list changed during the evaluation, the changes
+                # applied to the shared evaluation may be incomplete
+                self._update_requested = True
+                self._pending_changes = None
+            else:
+                with self._lock:
+                    # rows of replaced views are dropped, they're evaluated
+                    # again
+                    for column, view, rows in zip(columns, views, p_rows):
+                        if column.view is view:
+                            column.show_rows(rows, changes)
+
+            self._start_update()
+
+        self._update_future = self._in_background(evaluate, done)
+
     def _post_execute(self):
         # store dirty flag because base _post_execute will reset it after flush
         dirty = self.todolist.dirty
         super()._post_execute()
 
+        # also includes items moved to the archive by the base _post_execute
+        changes = self.todolist.stop_recording()
+
         if dirty or self.marked_todos:
-            self._reset_state()
+            self._reset_state(changes)
 
     def _rollback(self):
         try:
@@ -396,11 +556,11 @@ class UIApplication(CLIApplicationBase):
         self._execute_handler(cmd, p_todo_id,
                               self._output if verbosity else lambda _: None)
 
-    def _reset_state(self):
+    def _reset_state(self, p_changes=None):
         for widget in TodoWidget.cache.values():
             widget.unmark()
         self.marked_todos.clear()
-        self._update_all_columns()
+        self._update_all_columns(p_changes)
 
     def _blur_commandline(self):
         self._console_visible = False
@@ -486,6 +646,18 @@ class UIApplication(CLIApplicationBase):
             # the key is unknown, ignore
             pass
 
+    def _create_standard_filters(self):
+        """
+        Creates the filters applied by views that don't show all items. All
+        views use the same instances, such that their matches are computed
+        only once.
+        """
+        self._standard_filters = [
+            DependencyFilter(self.todolist),
+            RelevanceFilter(),
+            HiddenTagFilter(),
+        ]
+
     def _viewdata_to_view(self, p_data):
         """
         Converts a dictionary describing a view to an actual UIView instance.
@@ -494,13 +666,11 @@ class UIApplication(CLIApplicationBase):
         filters = []
 
         if not p_data['show_all']:
-            filters.append(DependencyFilter(self.todolist))
-            filters.append(RelevanceFilter())
-            filters.append(HiddenTagFilter())
+            filters += self._standard_filters
 
         filters += get_filter_list(p_data['filterexpr'].split())
 
-        return UIView(sorter, filters, self.todolist, p_data)
+        return UIView(sorter, filters, self.todolist, p_data, self._evaluation)
 
     def _update_view(self, p_data):
         """ Creates a view from the data entered in the view widget. """
@@ -515,6 +685,7 @@ class UIApplication(CLIApplicationBase):
 
             current_column.title = p_data['title']
             current_column.view = view
+            self._update_all_columns()
 
         self._viewwidget_visible = False
         self._blur_commandline()
@@ -557,6 +728,7 @@ class UIApplication(CLIApplicationBase):
 
         self.columns.focus_position = p_pos
         self._blur_commandline()
+        self._update_all_columns()
 
     def _print_keystate(self, p_keystate):
         self.keystate_widget.set_text(p_keystate)
@@ -0,0 +1,135 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import urwid
+
+
+class TodoListWalker(urwid.ListWalker):
+    """
+    A list walker for a column of todo items. Every row (a todo item or a
+    group label) is followed by a divider, so row i is at position 2i.
+
+    Widgets are only created when the ListBox asks for them, which is for the
+    rows in or near the visible part of the column. Updating or scrolling a
+    column therefore doesn't depend on the number of items in it.
+    """
+
+    def __init__(self):
+        self._rows = []  # todo items, or strings for group labels
+        self._positions = {}  # row => position
+        self._widgets = {}  # row => widget, for rows that were shown
+        self._todo_widget = None
+        self._divider = urwid.Divider('-')
+        self.focus = 0
+
+    def set_rows(self, p_rows, p_todo_widget, p_changed=None):
+        """
+        Replaces the rows of this list. p_todo_widget is called to obtain the
+        widget of a todo item when it's about to be shown.
+
+        When a set of changed rows is given, the widgets of all other rows are
+        kept. Otherwise all widgets are created again.
+        """
+        self._rows = p_rows
+        self._todo_widget = p_todo_widget
+
+        self._positions = {}
+        for i, row in enumerate(p_rows):
+            # the first of equal group labels
+            self._positions.setdefault(row, 2 * i)
+
+        if p_changed is None:
+            self._widgets = {}
+        else:
+            self._widgets = {row: widget for row, widget
+                             in self._widgets.items() if row not in p_changed}
+
+        self.focus = min(self.focus, max(0, len(self) - 1))
+        self._modified()
+
+    def row(self, p_position):
+        """ Returns the todo item or group label at the given position. """
+        return self._rows[p_position // 2]
+
+    def position(self, p_row):
+        """
+        Returns the position of the given todo item or group label, or None
+        when it's not in this list.
+        """
+        return self._positions.get(p_row)
+
+    def shown_todos(self):
+        """
+        Returns (todo, widget) pairs for the todo items that already have a
+        widget.
+        """
+        return [(row, widget) for row, widget in self._widgets.items()
+                if not isinstance(row, str)]
+
+    def todos(self):
+        """ Returns the todo items in this list. """
+        return [row for row in self._rows if not isinstance(row, str)]
+
+    def __len__(self):
+        return 2 * len(self._rows)
+
+    def __getitem__(self, p_position):
+        if p_position < 0:
+            raise IndexError
+
+        if p_position % 2:
+            if p_position >= len(self):
+                raise IndexError
+
+            return self._divider
+
+        row = self._rows[p_position // 2]
+
+        try:
+            return self._widgets[row]
+        except KeyError:
+            if isinstance(row, str):
+                widget = urwid.Text(row)
+            else:
+                widget = self._todo_widget(row)
+
+            self._widgets[row] = widget
+            return widget
+
+    def set_focus(self, p_position):
+        if not 0 <= p_position < len(self):
+            raise IndexError("No widget at position {}".format(p_position))
+
+        self.focus = p_position
+        self._modified()
+
+    def next_position(self, p_position):
+        if p_position >= len(self) - 1:
+            raise IndexError
+
+        return p_position + 1
+
+    def prev_position(self, p_position):
+        if p_position <= 0:
+            raise IndexError
+
+        return p_position - 1
+
+    def positions(self, reverse=False):  # keyword name is part of urwid's API
+        if reverse:
+            return range(len(self) - 1, -1, -1)
+
+        return range(len(self))
@@ -17,7 +17,9 @@
 import urwid
 
 from topydo.lib.HashListValues import max_id_length
+from topydo.lib.TodoListBase import InvalidTodoException
 from topydo.lib.Utils import translate_key_to_config
+from topydo.ui.columns.TodoListWalker import TodoListWalker
 from topydo.ui.columns.TodoWidget import TodoWidget
 from topydo.ui.columns.Utils import PaletteItem
 
@@ -44,7 +46,8 @@ class TodoListWidget(urwid.LineBox):
         self._title = urwid.Text(p_title, align='center')
         self._title_widget = urwid.AttrMap(self._title, PaletteItem.DEFAULT)
 
-        self.todolist = urwid.SimpleFocusListWalker([])
+        self._id_length = 0
+        self.todolist = TodoListWalker()
         self.listbox = urwid.ListBox(self.todolist)
         self.view = p_view
 
@@ -75,8 +78,11 @@ class TodoListWidget(urwid.LineBox):
 
     @view.setter
     def view(self, p_view):
+        """
+        Sets the view of this column. The column keeps showing the todo items
+        of the previous view until it's updated.
+        """
         self._view = p_view
-        self.update()
 
     @property
     def title(self):
@@ -86,29 +92,68 @@ class TodoListWidget(urwid.LineBox):
     def title(self, p_title):
         self._title.set_text(p_title)
 
-    def update(self):
+    def update(self, p_changes=None):
         """
         Updates the todo list according to the todos in the view associated
         with this list.
         """
+        self.show_rows(self.compute_rows(), p_changes)
+
+    def compute_rows(self):
+        """
+        Evaluates the view and returns the rows to show: todo items and group
+        labels. This doesn't touch any widgets, so it may be called from
+        another thread than the main loop.
+        """
+        groups = self.view.groups
+        rows = []
+
+        for group, todos in groups.items():
+            if len(groups) > 1:
+                rows.append(", ".join(group))
+
+            rows.extend(todos)
+
+        return rows
+
+    def show_rows(self, p_rows, p_changes=None):
+        """
+        Shows the rows returned by compute_rows.
+
+        When the changes are given, only the widgets of the affected todo items
+        are created again. The focus stays on the same todo item, if it's
+        still in the list.
+        """
         old_focus_position = self.todolist.focus
+        old_focus_row = self.todolist.row(old_focus_position) \
+            if len(self.todolist) else None
+
         id_length = max_id_length(self.view.todolist.count())
 
-        del self.todolist[:]
+        if p_changes is None or p_changes.reset or \
+                id_length != self._id_length:
+            changed = None
+        else:
+            changed = p_changes.affected()
+
+        self._id_length = id_length
+
+        # widgets are created by the walker once they are about to be shown
+        self.todolist.set_rows(p_rows, self._todo_widget, changed)
 
-        for group, todos in self.view.groups.items():
-            if len(self.view.groups) > 1:
-                grouplabel = ", ".join(group)
-                self.todolist.append(urwid.Text(grouplabel))
-                self.todolist.append(urwid.Divider('-'))
+        if changed is not None and (p_changes.added or p_changes.removed):
+            # numbers of the remaining items may have shifted
+            for todo, widget in self.todolist.shown_todos():
+                widget.number = self._todo_id(todo)
 
-            for todo in todos:
-                todowidget = TodoWidget.create(todo, id_length)
-                todowidget.number = self.view.todolist.number(todo)
-                self.todolist.append(todowidget)
-                self.todolist.append(urwid.Divider('-'))
+        if changed is not None and old_focus_row is not None:
+            focus_position = self.todolist.position(old_focus_row)
 
-        if old_focus_position:
+            if focus_position is not None:
+                self.todolist.set_focus(focus_position)
+                return
+
+        if old_focus_position and len(self.todolist):
             try:
                 self.todolist.set_focus(old_focus_position)
             except IndexError:
@@ -116,6 +161,23 @@ class TodoListWidget(urwid.LineBox):
                 # -2 for the same reason as in self._scroll_to_bottom()
                 self.todolist.set_focus(len(self.todolist) - 2)
 
+    def _todo_id(self, p_todo):
+        """
+        Returns the ID of the given todo item as a string. Returns an empty
+        string when the item was removed from the todo list, which happens
+        when the column still shows the items from before its update.
+        """
+        try:
+            return str(self.view.todolist.number(p_todo))
+        except InvalidTodoException:
+            return ''
+
+    def _todo_widget(self, p_todo):
+        """ Returns the widget to show the given todo item in this list. """
+        todowidget = TodoWidget.create(p_todo, self._id_length)
+        todowidget.number = self._todo_id(p_todo)
+        return todowidget
+
     def _go_down(self, p_size):
         self.listbox.keypress(p_size, 'down')
         self.listbox.set_focus_valign('bottom')
@@ -223,7 +285,11 @@ class TodoListWidget(urwid.LineBox):
     def _toggle_marked_status(self):
         try:
             todo = self.listbox.focus.todo
-            todo_id = str(self.view.todolist.number(todo))
+            todo_id = self._todo_id(todo)
+
+            if not todo_id:
+                return
+
             if urwid.emit_signal(self, 'toggle_mark', todo_id):
                 self.listbox.focus.mark()
             else:
@@ -233,11 +299,17 @@ class TodoListWidget(urwid.LineBox):
             pass
 
     def _mark_all(self):
-        for todo in self.listbox.body:
-            if isinstance(todo, TodoWidget):
-                todo_id = str(self.view.todolist.number(todo.todo))
-                urwid.emit_signal(self, 'toggle_mark', todo_id, 'mark')
-                todo.mark()
+        for todo in self.todolist.todos():
+            todo_id = self._todo_id(todo)
+
+            if not todo_id:
+                continue
+
+            urwid.emit_signal(self, 'toggle_mark', todo_id, 'mark')
+
+            # the widget of the walker is shown, the widget cache may have
+            # evicted it already
+            self.todolist[self.todolist.position(todo)].mark()
 
     def _execute_on_selected(self, p_cmd_str, p_execute_signal):
         """
@@ -251,7 +323,10 @@ class TodoListWidget(urwid.LineBox):
         """
         try:
             todo = self.listbox.focus.todo
-            todo_id = str(self.view.todolist.number(todo))
+            todo_id = self._todo_id(todo)
+
+            if not todo_id:
+                return
 
             urwid.emit_signal(self, p_execute_signal, p_cmd_str, todo_id)
 
@@ -381,7 +456,7 @@ class TodoListWidget(urwid.LineBox):
     def _repeat_cmd(self):
         try:
             todo = self.listbox.focus.todo
-            todo_id = str(self.view.todolist.number(todo))
+            todo_id = self._todo_id(todo) or None
         except AttributeError:
             todo_id = None
 
@@ -15,6 +15,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import re
+from collections import OrderedDict
 
 import urwid
 
@@ -57,6 +58,7 @@ class TodoWidget(urwid.WidgetWrap):
     def __init__(self, p_todo, p_id_width=4):
         # clients use this to associate this widget with the given todo item
         self.todo = p_todo
+        self.marked = False
 
         todo_text = TEXT_FORMATTER.parse(p_todo)
 
@@ -154,17 +156,27 @@ class TodoWidget(urwid.WidgetWrap):
             PaletteItem.METADATA: PaletteItem.MARKED,
         }
         self.widget.set_attr_map(attr_map)
+        self.marked = True
 
     def unmark(self):
         self.widget.set_attr_map(_markup(self.todo, False))
+        self.marked = False
 
-    cache = {}
+    # least recently used widgets first, see create()
+    cache = OrderedDict()
+    cache_hits = 0
+    cache_misses = 0
 
     @classmethod
     def create(p_class, p_todo, p_id_width=4):
         """
         Creates a TodoWidget instance for the given todo. Widgets are
-        cached, the same object is returned for the same todo item.
+        cached, the same object is returned for the same todo item as long as
+        its text and the ID width remain the same.
+
+        The cache holds at most widget_cache_size widgets (marked widgets are
+        kept regardless), the least recently used ones are evicted first. The
+        cache_hits and cache_misses counters help to tune its size.
         """
 
         def parent_progress_may_have_changed(p_todo):
@@ -174,27 +186,45 @@ class TodoWidget(urwid.WidgetWrap):
             """
             return p_todo.has_tag('p') and not p_todo.has_tag('due')
 
-        source = p_todo.source()
+        # the widget refers to the todo item, so its id isn't reused while
+        # the widget is cached
+        key = (id(p_todo), p_todo.source(), p_id_width)
 
-        if source in p_class.cache:
-            widget = p_class.cache[source]
+        try:
+            widget = p_class.cache[key]
+        except KeyError:
+            p_class.cache_misses += 1
 
-            if p_todo is not widget.todo:
-                # same source text but different todo instance (could happen
-                # after an edit where a new Todo instance is created with the
-                # same text as before)
-                # simply fix the reference in the stored widget.
-                widget.todo = p_todo
+            widget = p_class(p_todo, p_id_width)
+            p_class.cache[key] = widget
+            p_class._evict(config().widget_cache_size())
+        else:
+            p_class.cache_hits += 1
+            p_class.cache.move_to_end(key)
 
             if parent_progress_may_have_changed(p_todo):
                 widget.update_progress()
-        else:
-            widget = p_class(p_todo, p_id_width)
-            p_class.cache[source] = widget
 
         return widget
 
+    @classmethod
+    def _evict(p_class, p_size):
+        """
+        Removes the least recently used widgets until the cache holds p_size
+        widgets. Marked widgets are kept.
+        """
+        for _ in range(len(p_class.cache)):
+            if len(p_class.cache) <= p_size:
+                break
+
+            key, widget = next(iter(p_class.cache.items()))
+
+            if widget.marked:
+                p_class.cache.move_to_end(key)
+            else:
+                del p_class.cache[key]
+
     @classmethod
     def wipe_cache(p_class):
         """ Wipes the cache """
-        p_class.cache = {}
+        p_class.cache = OrderedDict()
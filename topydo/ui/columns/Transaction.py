@@ -26,6 +26,8 @@ class Transaction(object):
         self._multi = issubclass(p_subcommand, MultiCommand)
         self._cmd = lambda op: p_subcommand(op, *p_env_args)
         self._todo_ids = p_todo_ids
+        self._todolist = p_env_args[0] if p_env_args else None
+        self._todos = None
         self._operations = []
         self._post_archive_actions = []
         self._cmd_name = p_subcommand.name()
@@ -42,6 +44,10 @@ class Transaction(object):
 
             # Not using MultiCommand abilities would make EditCommand awkward
             if self._multi:
+                # the IDs remain in the arguments for the label, the command
+                # operates on the todo items looked up once for the batch
+                self._todos = [self._todolist.todo(todo_id)
+                               for todo_id in self._todo_ids]
                 p_args[id_position:id_position + 1] = self._todo_ids
                 self._operations.append(p_args)
             else:
@@ -71,6 +77,9 @@ class Transaction(object):
         for i, operation in enumerate(self._operations):
             command = self._cmd(operation)
 
+            if self._todos is not None:
+                command.set_todos(self._todos)
+
             if command.execute() is False:
                 return False
             else:
@@ -0,0 +1,126 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+A thin client for the topydo daemon, which forwards its arguments to the
+daemon and passes on the output.
+
+This module deliberately only imports modules from the standard library, such
+that the client starts quickly. When no daemon is running, the command is
+executed by the regular CLI.
+
+The client and the daemon exchange JSON objects, one per line:
+
+    client: {"argv": [...], "cwd": <working directory>,
+             "tty": [<stdout is a TTY>, <stderr is a TTY>]}
+    daemon: {"stdout": "..."} or {"stderr": "..."} for output,
+            {"input": true} when the command asks for a line of input,
+            {"exit": <exit code>} when the command finished,
+            {"local": true} when the command needs the terminal of the
+            client (e.g. to open an editor), the client executes it.
+    client: {"input": "..."} in reply to an input request.
+"""
+
+import json
+import os
+import socket
+import sys
+import tempfile
+
+
+def socket_path():
+    """
+    Returns the path of the Unix domain socket the daemon listens on. It can
+    be overridden with the TOPYDO_SOCKET environment variable.
+    """
+    if os.environ.get('TOPYDO_SOCKET'):
+        return os.environ['TOPYDO_SOCKET']
+
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(runtime_dir, 'topydo-{}.sock'.format(os.getuid()))
+
+
+def connect(p_path=None):
+    """
+    Returns a socket connected to the daemon, or None when no daemon is
+    listening.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    try:
+        sock.connect(p_path or socket_path())
+    except OSError:
+        sock.close()
+        return None
+
+    return sock
+
+
+def request(p_sock, p_argv, p_stdin=None, p_stdout=None, p_stderr=None,
+            p_cwd=None):
+    """
+    Lets the daemon connected to p_sock execute the command in p_argv (without
+    the program name), as if it was started in the directory p_cwd (the
+    current directory by default). The output is written to p_stdout and
+    p_stderr as soon as it arrives. Returns the exit code of the command, or
+    None when the command should be executed by the client itself.
+    """
+    stdin = p_stdin or sys.stdin
+    stdout = p_stdout or sys.stdout
+    stderr = p_stderr or sys.stderr
+
+    with p_sock, p_sock.makefile('rw', encoding='utf-8') as stream:
+        stream.write(json.dumps({
+            'argv': p_argv,
+            'cwd': p_cwd or os.getcwd(),
+            'tty': [stdout.isatty(), stderr.isatty()],
+        }) + '\n')
+        stream.flush()
+
+        for line in stream:
+            message = json.loads(line)
+
+            if 'stdout' in message:
+                stdout.write(message['stdout'])
+                stdout.flush()
+            elif 'stderr' in message:
+                stderr.write(message['stderr'])
+                stderr.flush()
+            elif 'input' in message:
+                stream.write(json.dumps({'input': stdin.readline()}) + '\n')
+                stream.flush()
+            elif 'exit' in message:
+                return message['exit']
+            elif 'local' in message:
+                return None
+
+    # the daemon went away without finishing the command
+    return 1
+
+
+def main():
+    """ Main entry point of the client. """
+    sock = connect()
+    code = None if sock is None else request(sock, sys.argv[1:])
+
+    if code is None:
+        from topydo.ui.UILoader import main as cli_main
+        cli_main()
+    else:
+        sys.exit(code)
+
+if __name__ == '__main__':
+    main()
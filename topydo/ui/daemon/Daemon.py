@@ -0,0 +1,327 @@
+# Topydo - A todo.txt client written in Python.
+# Copyright (C) 2014 - 2015 Bram Schoenmakers <bram@topydo.org>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Entry file for the topydo daemon, which keeps the todo list in memory and
+executes the commands it receives from topydo-client on a Unix domain socket.
+"""
+
+import getopt
+import json
+import os
+import signal
+import socketserver
+import sys
+
+from topydo.Commands import get_subcommand
+from topydo.lib.Config import ConfigError, config
+from topydo.lib.TodoFileWatched import TodoFileWatched
+from topydo.ui.CLIApplicationBase import (MAIN_LONG_OPTS, MAIN_OPTS,
+                                          CLIApplicationBase, error, usage,
+                                          version)
+from topydo.ui.daemon.Client import connect, socket_path
+
+# First thing is to poke the configuration and check whether it's sane
+# The modules below may already read in configuration upon import, so
+# make sure to bail out if the configuration is invalid.
+try:
+    config()
+except ConfigError as config_error:
+    error(str(config_error))
+    sys.exit(1)
+
+
+class _ClientStream(object):
+    """
+    A file-like object that passes text to the client, or reads a line of
+    input from the client. It replaces the standard streams while a command
+    is executed, such that commands don't need to know about the daemon.
+    """
+
+    def __init__(self, p_stream, p_key, p_tty=False):
+        self._stream = p_stream
+        self._key = p_key
+        self._tty = p_tty
+
+    def write(self, p_text):
+        if p_text:
+            self._stream.write(json.dumps({self._key: p_text}) + '\n')
+
+        return len(p_text)
+
+    def flush(self):
+        self._stream.flush()
+
+    def isatty(self):
+        return self._tty
+
+    def readline(self):
+        self._stream.write(json.dumps({'input': True}) + '\n')
+        self._stream.flush()
+
+        reply = self._stream.readline()
+        return json.loads(reply).get('input', '') if reply else ''
+
+
+class DaemonApplication(CLIApplicationBase):
+    """
+    Keeps the todo list, its dependency graph and search indexes in memory
+    and executes the commands sent by clients, one at a time. The todo file
+    is watched, it is read again after it was modified by another program.
+    """
+
+    def __init__(self, p_socket_path=None):
+        super().__init__()
+
+        self._process_flags()
+        self.socket_path = p_socket_path or socket_path()
+        self.server = None
+        self._stale = True
+        self.todofile = TodoFileWatched(config().todotxt(), self._file_changed)
+        self.todolist.enable_search_index()
+        self._paths = self._configured_paths()
+
+    @staticmethod
+    def _configured_paths():
+        """
+        Returns the absolute paths of the todo.txt and archive files of the
+        current configuration.
+        """
+        return (os.path.abspath(config().todotxt()),
+                os.path.abspath(config().archive()))
+
+    def _file_changed(self):
+        """
+        Called from the file watcher's thread, the file is read again before
+        the next command.
+        """
+        self._stale = True
+
+    def _load_file(self):
+        """
+        Reads the configured todo.txt file and loads it into the todo list
+        instance.
+        """
+        self._stale = False
+        self.todolist.erase()
+        self.todolist.add_list(self.todofile.read())
+        self.todolist.dirty = False
+
+    @staticmethod
+    def _needs_terminal(p_command, p_args):
+        """
+        Returns True when the command opens an editor or reads the standard
+        input directly, which can't be passed on to the client.
+        """
+        from topydo.commands.AddCommand import AddCommand
+        from topydo.commands.EditCommand import EditCommand
+
+        if p_command is EditCommand:
+            return True
+
+        if p_command is AddCommand:
+            try:
+                opts, _ = getopt.getopt(p_args, 'f:')
+            except getopt.GetoptError:
+                return False
+
+            return ('-f', '-') in opts
+
+        return False
+
+    def _run_command(self, p_argv):
+        """
+        Executes the command line in p_argv (without the program name) like
+        the CLI would in the current directory. Returns the exit code, or None
+        when the command should be executed by the client itself.
+
+        The configuration is read like the CLI would, commands for other files
+        than the ones loaded by the daemon are refused.
+        """
+        try:
+            opts, args = getopt.getopt(p_argv, MAIN_OPTS, MAIN_LONG_OPTS)
+        except getopt.GetoptError as e:
+            error(str(e))
+            return 1
+
+        self.do_archive = True
+        alt_config_path = None
+        overrides = {}
+
+        for opt, value in opts:
+            if opt == "-a":
+                self.do_archive = False
+            elif opt == "-c":
+                alt_config_path = value
+            elif opt == "-t":
+                overrides[('topydo', 'filename')] = value
+            elif opt == "-d":
+                overrides[('topydo', 'archive_filename')] = value
+            elif opt in ("-v", "--version"):
+                version()
+            elif opt == "-h":
+                usage()
+                return 0
+            else:
+                error("Option {} should be given when starting the daemon."
+                      .format(opt))
+                return 1
+
+        try:
+            config(alt_config_path, overrides)
+        except ConfigError as config_error:
+            error(str(config_error))
+            return 1
+
+        if self._configured_paths() != self._paths:
+            error("The daemon only serves {} (with archive {}), run topydo "
+                  "without the daemon for other files."
+                  .format(*self._paths))
+            return 1
+
+        if self._stale:
+            self._load_file()
+
+        try:
+            (subcommand, args) = get_subcommand(args)
+        except ConfigError as ce:
+            error('Error: ' + str(ce) + '. Check your aliases configuration')
+            return 1
+
+        if subcommand is None:
+            usage()
+            return 0
+
+        if self._needs_terminal(subcommand, args):
+            return None
+
+        self.backup = None
+
+        if self._execute(subcommand, args) == False:
+            # discard changes of a command that failed halfway
+            self._stale = self._stale or self.todolist.dirty
+            return 1
+
+        self._post_execute()
+        self.todolist.dirty = False
+
+        return 0
+
+    def serve_request(self, p_stream):
+        """
+        Reads a request from the given text stream of a client connection and
+        sends back the output and exit code of the command.
+        """
+        line = p_stream.readline()
+        if not line:
+            return
+
+        request = json.loads(line)
+        stdout_tty, stderr_tty = request.get('tty', (False, False))
+
+        streams = (sys.stdin, sys.stdout, sys.stderr)
+        sys.stdin = _ClientStream(p_stream, 'stdin')
+        sys.stdout = _ClientStream(p_stream, 'stdout', stdout_tty)
+        sys.stderr = _ClientStream(p_stream, 'stderr', stderr_tty)
+
+        # relative paths and configuration files are looked up in the
+        # directory of the client
+        cwd = os.getcwd()
+        daemon_config = config()
+
+        try:
+            os.chdir(request.get('cwd', cwd))
+            code = self._run_command(request.get('argv', []))
+        except SystemExit as exit_:
+            code = exit_.code if isinstance(exit_.code, int) else \
+                int(exit_.code is not None)
+        except Exception as ex:  # keep the daemon running for other clients
+            error('Error: ' + str(ex))
+            code = 1
+            self._stale = True
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = streams
+            os.chdir(cwd)
+            config.instance = daemon_config
+
+        if code is None:
+            p_stream.write(json.dumps({'local': True}) + '\n')
+        else:
+            p_stream.write(json.dumps({'exit': code}) + '\n')
+        p_stream.flush()
+
+    def _bind(self):
+        """
+        Returns a server listening on the socket. A socket left behind by a
+        daemon that was killed is removed.
+        """
+        if os.path.exists(self.socket_path):
+            sock = connect(self.socket_path)
+
+            if sock:
+                sock.close()
+                raise OSError("A daemon is already listening on "
+                              + self.socket_path)
+
+            os.remove(self.socket_path)
+
+        application = self
+
+        class RequestHandler(socketserver.BaseRequestHandler):
+            def handle(self):
+                with self.request.makefile('rw', encoding='utf-8') as stream:
+                    try:
+                        application.serve_request(stream)
+                    except (OSError, ValueError):
+                        pass  # the client went away or sent garbage
+
+        # only the user running the daemon may connect
+        umask = os.umask(0o077)
+        try:
+            return socketserver.UnixStreamServer(self.socket_path,
+                                                 RequestHandler)
+        finally:
+            os.umask(umask)
+
+    def run(self):
+        """ Main entry function. """
+        self._load_file()
+
+        try:
+            self.server = self._bind()
+        except OSError as ex:
+            error(str(ex))
+            sys.exit(1)
+
+        # clean up the socket when terminated
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server.server_close()
+            self.todofile.close()
+            os.remove(self.socket_path)
+
+
+def main():
+    """ Main entry point of the daemon. """
+    DaemonApplication().run()
+
+if __name__ == '__main__':
+    main()
@@ -52,6 +52,7 @@ class PromptApplication(CLIApplicationBase):
         self._process_flags()
         self.completer = None
         self.todofile = TodoFileWatched(config().todotxt(), self._load_file)
+        self.todolist.enable_search_index()
 
     def _load_file(self):
         """